@@ -0,0 +1,33 @@
+"""add benefit_rules_version
+
+Revision ID: d41f7a2c9e10
+Revises: b8c59694c66a
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f7a2c9e10'
+down_revision: Union[str, None] = 'b8c59694c66a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create benefit_rules_version table (single row, bumped on rule reload)
+    op.create_table(
+        'benefit_rules_version',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('benefit_rules_version')
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models import CardBenefit
+from ..services.benefit_calculator import bump_rule_version, get_rule_set
 
 router = APIRouter()
 
@@ -13,6 +14,18 @@ async def sync_benefits(db: Session = Depends(get_db)):
     return {"message": "Benefit sync not implemented yet", "status": "pending"}
 
 
+@router.post("/reload")
+async def reload_benefit_rules(db: Session = Depends(get_db)):
+    """
+    card_benefits 테이블 변경 후 QR 결제용 혜택 규칙 재로드
+
+    규칙 버전을 올리고 이 워커는 즉시 재로드, 다른 워커는 BENEFIT_RULES_CHECK_INTERVAL 안에 재로드
+    """
+    version = bump_rule_version(db)
+    rule_set = get_rule_set(db, force=True)
+    return {"message": "Benefit rules reloaded", "count": len(rule_set), "version": version}
+
+
 @router.get("/cards")
 async def list_card_benefits(card_name: str = None, db: Session = Depends(get_db)):
     """카드 혜택 목록 조회"""
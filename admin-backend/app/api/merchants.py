@@ -6,12 +6,24 @@ import requests
 from ..database import get_db
 from ..models import Merchant
 from ..schemas import MerchantCreate, MerchantResponse
+from ..services.webhook import sync_merchants
 
 router = APIRouter()
 
 GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
 
 
+def _merchant_payload(merchant: Merchant) -> dict:
+    return {
+        "place_id": merchant.place_id,
+        "name": merchant.name,
+        "category": merchant.category,
+        "address": merchant.address,
+        "latitude": float(merchant.latitude) if merchant.latitude is not None else None,
+        "longitude": float(merchant.longitude) if merchant.longitude is not None else None,
+    }
+
+
 @router.get("/search")
 async def search_merchants(
     query: str,
@@ -101,9 +113,27 @@ async def select_merchant(merchant: MerchantCreate, db: Session = Depends(get_db
     db.add(db_merchant)
     db.commit()
     db.refresh(db_merchant)
+
+    # 사용자 백엔드 로컬 가맹점 저장소에도 반영 (실패해도 등록은 유지)
+    try:
+        await sync_merchants([_merchant_payload(db_merchant)])
+    except Exception as e:
+        print(f"[Merchant] 사용자 백엔드 동기화 실패: {str(e)}")
+
     return db_merchant
 
 
+@router.post("/sync")
+async def sync_all_merchants(db: Session = Depends(get_db)):
+    """저장된 가맹점 전체를 사용자 백엔드 로컬 가맹점 저장소로 동기화"""
+    merchants = db.query(Merchant).all()
+    try:
+        result = await sync_merchants([_merchant_payload(m) for m in merchants])
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"User backend sync failed: {str(e)}")
+    return {"total": len(merchants), "synced": result.get("synced", 0)}
+
+
 @router.get("/", response_model=List[MerchantResponse])
 async def list_merchants(db: Session = Depends(get_db)):
     """저장된 가맹점 목록 조회"""
@@ -56,7 +56,8 @@ async def scan_qr(request: QRScanRequest, db: Session = Depends(get_db)):
             merchant_category=merchant.category or "default",
             merchant_name=merchant.name,
             payment_amount=request.payment_amount,
-            db=db
+            db=db,
+            user_id=qr_data["user_id"]
         )
         print(f">>> [QR] benefit_result: {benefit_result}")
 
@@ -170,7 +171,8 @@ async def scan_barcode(request: BarcodeScanRequest, db: Session = Depends(get_db
             merchant_category=merchant.category or "default",
             merchant_name=merchant.name,
             payment_amount=request.payment_amount,
-            db=db
+            db=db,
+            user_id=qr_data["user_id"]
         )
         print(f">>> [Barcode] benefit_result: {benefit_result}")
 
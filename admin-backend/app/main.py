@@ -6,7 +6,8 @@ load_dotenv()
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .api import merchants, qr, payment, benefits
-from .database import engine, Base, auto_migrate_columns
+from .database import engine, Base, SessionLocal, auto_migrate_columns
+from .services.benefit_calculator import get_rule_set
 
 # Create database tables
 Base.metadata.create_all(bind=engine, checkfirst=True)
@@ -42,6 +43,18 @@ app.include_router(payment.router, prefix="/api/payment", tags=["payment"])
 app.include_router(benefits.router, prefix="/api/benefits", tags=["benefits"])
 
 
+@app.on_event("startup")
+def load_benefit_rules():
+    """혜택 규칙을 시작 시 미리 로드 (첫 QR 스캔에서 DB 조회 방지)"""
+    db = SessionLocal()
+    try:
+        get_rule_set(db)
+    except Exception as e:
+        print(f"[Benefit] 혜택 규칙 사전 로드 실패 (첫 결제 시 재시도): {e}")
+    finally:
+        db.close()
+
+
 @app.get("/")
 async def root():
     return {"message": "Cardealo Admin API", "status": "running"}
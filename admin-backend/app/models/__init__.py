@@ -1,5 +1,6 @@
 from .merchant import Merchant
 from .payment_transaction import PaymentTransaction
 from .card_benefit import CardBenefit
+from .benefit_rules_version import BenefitRulesVersion
 
-__all__ = ["Merchant", "PaymentTransaction", "CardBenefit"]
+__all__ = ["Merchant", "PaymentTransaction", "CardBenefit", "BenefitRulesVersion"]
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class BenefitRulesVersion(Base):
+    """혜택 규칙 버전 (단일 행, POST /api/benefits/reload 시 증가 → 모든 워커가 규칙 세트 재로드)"""
+    __tablename__ = "benefit_rules_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<BenefitRulesVersion {self.version}>"
@@ -1,6 +1,110 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
-from ..models import CardBenefit
-import json
+from cardealo_benefits.benefit_rules import BenefitRuleSet, CardUsage
+from ..models import BenefitRulesVersion, CardBenefit, PaymentTransaction
+
+# 규칙 버전 확인 주기 (초) - 워커마다 이 간격으로 한 번만 버전 조회
+RULES_CHECK_INTERVAL = float(os.getenv("BENEFIT_RULES_CHECK_INTERVAL", "5"))
+
+# 모든 CardBenefit을 파싱한 규칙 세트 (워커당 버전별 1회 로드, QR 결제 시 규칙 조회 없음)
+_rule_set = None
+_rule_version = None
+_last_check = 0.0
+_lock = threading.Lock()
+
+
+def _current_version(db: Session) -> tuple:
+    """
+    규칙 버전 = (reload 버전, card_benefits 행 수, 최대 id, 최대 updated_at)
+
+    reload 엔드포인트가 올린 버전과 테이블 변경(시드 재실행, ORM 수정) 중 하나라도 바뀌면 달라짐
+    """
+    bumped = db.query(BenefitRulesVersion.version).filter(BenefitRulesVersion.id == 1).scalar() or 0
+    count, max_id, max_updated = db.query(
+        func.count(CardBenefit.id), func.max(CardBenefit.id), func.max(CardBenefit.updated_at)
+    ).one()
+    return (bumped, count, max_id, str(max_updated))
+
+
+def get_rule_set(db: Session, force: bool = False) -> BenefitRuleSet:
+    """
+    현재 버전의 규칙 세트 반환
+
+    RULES_CHECK_INTERVAL마다 버전을 확인해 다른 워커의 reload나 데이터 변경을 반영한다.
+    버전 조회에 실패하면 기존 규칙 세트를 계속 사용
+    """
+    global _rule_set, _rule_version, _last_check
+    if not force and _rule_set is not None and time.monotonic() - _last_check < RULES_CHECK_INTERVAL:
+        return _rule_set
+
+    with _lock:
+        if not force and _rule_set is not None and time.monotonic() - _last_check < RULES_CHECK_INTERVAL:
+            return _rule_set
+        try:
+            version = _current_version(db)
+        except Exception as e:
+            if _rule_set is None:
+                raise
+            print(f"[Benefit] 혜택 규칙 버전 확인 실패, 기존 규칙 유지: {e}")
+            _last_check = time.monotonic()
+            return _rule_set
+
+        if force or _rule_set is None or version != _rule_version:
+            _rule_set = BenefitRuleSet(db.query(CardBenefit).all())
+            _rule_version = version
+            print(f"[Benefit] 혜택 규칙 로드 완료: {len(_rule_set)}건 (버전 {version[0]})")
+        _last_check = time.monotonic()
+        return _rule_set
+
+
+def bump_rule_version(db: Session) -> int:
+    """
+    혜택 데이터 변경 후 규칙 버전 증가 (모든 워커가 다음 확인 시 재로드)
+
+    Returns:
+        새 버전
+    """
+    row = db.query(BenefitRulesVersion).filter(BenefitRulesVersion.id == 1).with_for_update().first()
+    if row is None:
+        row = BenefitRulesVersion(id=1, version=0)
+        db.add(row)
+    row.version += 1
+    db.commit()
+    return row.version
+
+
+def get_card_usage(db: Session, user_id: str, card_name: str, now: Optional[datetime] = None) -> CardUsage:
+    """
+    완료된 결제 내역으로 카드의 오늘/이번 달 사용 현황 집계 (일/월 횟수 한도, 월 할인 한도 적용용)
+
+    관리자 백엔드는 MyCard 카운터를 모르므로 이 서비스로 처리된 결제만 집계한다.
+    """
+    now = now or datetime.now()
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    month_start = day_start.replace(day=1)
+    monthly_count, daily_count, used_amount, discounted_amount = db.query(
+        func.count(PaymentTransaction.id),
+        func.sum(case((PaymentTransaction.created_at >= day_start, 1), else_=0)),
+        func.sum(PaymentTransaction.payment_amount),
+        func.sum(PaymentTransaction.discount_amount),
+    ).filter(
+        PaymentTransaction.user_id == user_id,
+        PaymentTransaction.card_name == card_name,
+        PaymentTransaction.payment_status == "completed",
+        PaymentTransaction.created_at >= month_start,
+    ).one()
+    return CardUsage(
+        daily_count=daily_count or 0,
+        monthly_count=monthly_count or 0,
+        used_amount=used_amount or 0,
+        discounted_amount=discounted_amount or 0,
+    )
 
 
 async def calculate_benefit(
@@ -8,17 +112,21 @@ async def calculate_benefit(
     merchant_category: str,
     merchant_name: str,
     payment_amount: int,
-    db: Session
+    db: Session,
+    user_id: Optional[str] = None
 ) -> dict:
     """
-    카드 혜택 계산
+    카드 혜택 계산 (전월실적 티어 + 건당/일/월 한도 반영)
+
+    전월실적은 알 수 없으므로 최저 티어를 충족한 것으로 계산한다.
 
     Args:
         card_name: 카드명
         merchant_category: 가맹점 카테고리
         merchant_name: 가맹점명
         payment_amount: 결제 금액
-        db: DB 세션
+        db: DB 세션 (규칙 버전 확인, user_id가 있으면 사용 현황 집계)
+        user_id: 결제 사용자 (있으면 이번 달 완료 결제로 횟수/할인 한도 차감)
 
     Returns:
         {
@@ -28,71 +136,9 @@ async def calculate_benefit(
         }
     """
     try:
-        # 카드 혜택 조회
-        benefits = db.query(CardBenefit).filter(
-            CardBenefit.card_name == card_name,
-            CardBenefit.category == merchant_category
-        ).all()
-
-        if not benefits:
-            # 기본 혜택 없음
-            return {
-                "discount_amount": 0,
-                "discount_type": "none",
-                "benefit_text": "적용 가능한 혜택이 없습니다"
-            }
-
-        # 가맹점명과 매칭되는 혜택 찾기
-        matched_benefit = None
-        for benefit in benefits:
-            if benefit.places:
-                places = json.loads(benefit.places) if isinstance(benefit.places, str) else benefit.places
-                for place in places:
-                    if place.lower() in merchant_name.lower() or merchant_name.lower() in place.lower():
-                        matched_benefit = benefit
-                        break
-                if matched_benefit:
-                    break
-
-        # 매칭되는 혜택이 없으면 첫 번째 혜택 사용 (default)
-        if not matched_benefit and benefits:
-            matched_benefit = benefits[0]
-
-        if not matched_benefit:
-            return {
-                "discount_amount": 0,
-                "discount_type": "none",
-                "benefit_text": "적용 가능한 혜택이 없습니다"
-            }
-
-        # 할인 계산
-        discount_amount = 0
-        discount_type = matched_benefit.discount_type or "percent"
-
-        if discount_type == "percent":
-            # 퍼센트 할인
-            discount_amount = int(payment_amount * (matched_benefit.discount_value / 100))
-        elif discount_type == "amount":
-            # 정액 할인
-            discount_amount = matched_benefit.discount_value
-        elif discount_type == "point":
-            # 포인트 적립 (할인으로 처리하지 않음)
-            discount_amount = 0
-
-        # 최대 할인 금액 적용
-        if matched_benefit.max_discount and discount_amount > matched_benefit.max_discount:
-            discount_amount = matched_benefit.max_discount
-
-        # 혜택 텍스트 생성
-        benefit_text = matched_benefit.discount_display or f"{card_name} 혜택"
-        if matched_benefit.max_discount_display:
-            benefit_text += f" ({matched_benefit.max_discount_display})"
-
-        return {
-            "discount_amount": discount_amount,
-            "discount_type": discount_type,
-            "benefit_text": benefit_text
-        }
+        # (카드, 카테고리, 가맹점명) → 규칙 결정은 규칙 세트의 LRU에 캐시됨
+        usage = get_card_usage(db, user_id, card_name) if user_id else None
+        return get_rule_set(db).calculate(card_name, merchant_category, merchant_name, payment_amount, usage)
 
     except Exception as e:
         print(f"Benefit calculation error: {str(e)}")
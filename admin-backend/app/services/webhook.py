@@ -166,3 +166,32 @@ async def notify_qr_scan_status(status_data: dict) -> dict:
     except Exception as e:
         print(f"QR scan status notification error: {str(e)}")
         raise
+
+
+async def sync_merchants(merchants: list) -> dict:
+    """
+    사용자 백엔드 로컬 가맹점 저장소에 등록 가맹점 반영
+
+    Args:
+        merchants: [{"place_id", "name", "category", "address", "latitude", "longitude"}, ...]
+
+    Returns:
+        사용자 백엔드 응답
+    """
+    url = f"{settings.user_backend_url}/api/admin/merchants/sync"
+    headers = {
+        "Authorization": f"Bearer {settings.admin_secret_key}",
+        "Content-Type": "application/json"
+    }
+
+    try:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.post(url, json={"merchants": merchants}, headers=headers)
+            response.raise_for_status()
+            return response.json()
+    except httpx.HTTPError as e:
+        print(f"Merchant sync HTTP error: {str(e)}")
+        raise
+    except Exception as e:
+        print(f"Merchant sync error: {str(e)}")
+        raise
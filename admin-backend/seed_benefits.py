@@ -55,10 +55,13 @@ def seed_benefits():
                             'required_amount': card_data['pre_month_money']
                         }
 
+                    # 가맹점별 혜택은 가맹점명을 places로 저장 (브랜드 매칭용)
+                    places = [subcategory] if subcategory != 'default' else None
+
                     benefit = CardBenefit(
                         card_name=card_data['card'],
                         category=category,
-                        places=None,  # Will be populated from benefit_text if needed
+                        places=places,
                         discount_type=discount_type,
                         discount_value=discount_value,
                         max_discount=max_discount,
@@ -1,7 +1,6 @@
 import os
 import sys
 import json
-import requests
 import google.generativeai as genai
 from typing import Dict, Any, List, Optional
 from datetime import datetime
@@ -22,6 +21,11 @@ if str(backend_dir) not in sys.path:
 # Import services directly instead of making HTTP requests
 from services.location_service import LocationService
 from services.benefit_lookup_service import BenefitLookupService
+from services.basket_optimizer import BasketOptimizer, purchases_from_stops
+from services import geo, http_client
+from services.directions_service import route_legs
+from services.route_cache import route_cache
+from services.single_flight import coalesce
 
 
 class GeminiCourseRecommender:
@@ -35,7 +39,11 @@ class GeminiCourseRecommender:
     5. 경로 및 시간 보강 (Directions API)
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        location_service: Optional[LocationService] = None,
+        benefit_service: Optional[BenefitLookupService] = None
+    ):
         # Gemini API 설정
         api_key = os.getenv('GEMINI_API_KEY')
         if not api_key:
@@ -54,8 +62,9 @@ class GeminiCourseRecommender:
         self.tmap_api_key = os.getenv('TMAP_API_KEY')
 
         # Initialize services directly (no HTTP requests needed)
-        self.location_service = LocationService()
-        self.benefit_service = BenefitLookupService()
+        # app.py에서 공유 인스턴스를 넘기면 요청마다 혜택 인덱스를 다시 빌드하지 않음
+        self.location_service = location_service or LocationService()
+        self.benefit_service = benefit_service or BenefitLookupService()
 
     def recommend_course_with_benefits(
         self,
@@ -64,7 +73,8 @@ class GeminiCourseRecommender:
         user_cards: List[str],
         max_distance: int = 5000,
         num_people: int = 2,
-        budget: int = 100000
+        budget: int = 100000,
+        card_states: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         혜택 극대화 기반 AI 코스 추천 (메인 함수)
@@ -76,6 +86,7 @@ class GeminiCourseRecommender:
             max_distance: 최대 검색 반경 (미터)
             num_people: 인원 (기본: 2명)
             budget: 예산 (기본: 100,000원)
+            card_states: {card_name: CardState} - 로그인 사용자의 카드 사용 현황 (없으면 미사용 상태로 가정)
 
         Returns:
             {
@@ -86,7 +97,8 @@ class GeminiCourseRecommender:
                     'stops': [...],
                     'total_distance': int,
                     'total_duration': int,
-                    'total_benefit_score': float
+                    'total_benefit_score': float,
+                    'card_plan': {...}  # 장소별 결제 카드 배정 (BasketOptimizer)
                 }
             }
         """
@@ -145,6 +157,10 @@ class GeminiCourseRecommender:
                     else:
                         print(f"[Photo] {stop['name']}: No photo")
 
+        # Step 4.6: 한도 간섭을 고려한 장소별 결제 카드 배정
+        if course and course.get('stops') and user_cards:
+            course['card_plan'] = self._plan_course_cards(course['stops'], user_cards, budget, card_states)
+
         # Step 5: 경로 및 시간 보강 (Directions API)
         if course and course.get('stops'):
             course = self._enrich_with_route_info(course, user_location)
@@ -234,8 +250,9 @@ class GeminiCourseRecommender:
         위치 쿼리를 좌표로 변환 (Google Geocoding API)
         """
         try:
-            response = requests.get(
+            response = http_client.get(
                 'https://maps.googleapis.com/maps/api/geocode/json',
+                upstream='google_geocode',
                 params={
                     'address': location_query,
                     'key': self.google_api_key,
@@ -320,18 +337,20 @@ class GeminiCourseRecommender:
 
         places_with_benefits = []
 
-        for place in places:
-            # BenefitLookupService를 직접 사용하여 혜택 조회
-            try:
-                recommendations = self.benefit_service.get_recommendations(
-                    merchant_name=place['name'],
-                    category=place['category'],
-                    user_cards=user_cards
-                )
+        # BenefitLookupService 배치 조회로 모든 장소의 최고 혜택 카드를 한 번에 계산
+        try:
+            top_benefits = self.benefit_service.get_top_cards_batch(
+                [(place['name'], place['category']) for place in places],
+                user_cards
+            )
+        except Exception as e:
+            print(f"[Warning] 혜택 일괄 조회 실패: {e}")
+            top_benefits = [None] * len(places)
 
+        for place, best_benefit in zip(places, top_benefits):
+            try:
                 # 최고 혜택 카드 선택
-                if recommendations:
-                    best_benefit = recommendations[0]
+                if best_benefit:
                     # Format benefit summary
                     summary = self._format_benefit(best_benefit)
                     place['benefit'] = {
@@ -368,6 +387,27 @@ class GeminiCourseRecommender:
             parts.append(f"월 {benefit['monthly_limit']:,}원 한도")
         return ', '.join(parts) if parts else '혜택 정보'
 
+    def _plan_course_cards(
+        self,
+        stops: List[Dict[str, Any]],
+        user_cards: List[str],
+        budget: int,
+        card_states: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        코스 전체 카드 배정 (일/월 횟수 및 할인 한도 간섭 반영)
+        """
+        try:
+            states = {card: (card_states or {}).get(card) for card in user_cards}
+            plan = BasketOptimizer(self.benefit_service.engine).optimize(
+                purchases_from_stops(stops, budget), states
+            )
+            print(f"[Card Plan] 총 예상 할인 {plan['total_discount']:,}원 ({plan['method']})")
+            return plan
+        except Exception as e:
+            print(f"[Warning] 코스 카드 배정 실패: {e}")
+            return None
+
     def _plan_course_with_gemini(
         self,
         places_with_benefits: List[Dict[str, Any]],
@@ -545,7 +585,7 @@ class GeminiCourseRecommender:
                     })
                 body['viaPoints'] = via_points
 
-            response = requests.post(url, headers=headers, json=body, timeout=10)
+            response = http_client.post(url, upstream='tmap_driving', headers=headers, json=body, timeout=10)
 
             if response.status_code != 200:
                 print(f"[TMAP] API 오류: {response.status_code} - {response.text[:200]}")
@@ -642,7 +682,7 @@ class GeminiCourseRecommender:
                 waypoint_strs = [f"{wp['latitude']},{wp['longitude']}" for wp in waypoints]
                 params['waypoints'] = '|'.join(waypoint_strs)
 
-            response = requests.get(url, params=params, timeout=10)
+            response = http_client.get(url, upstream='google_directions', params=params, timeout=10)
 
             if response.status_code != 200:
                 print(f"[Google Directions] API 오류: {response.status_code}")
@@ -717,6 +757,22 @@ class GeminiCourseRecommender:
 
         return ''.join(encoded)
 
+    @coalesce('course_driving')
+    def _get_leg_driving_directions(
+        self,
+        start: Dict[str, float],
+        goal: Dict[str, float]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        코스 한 구간 자동차 경로 (경로 캐시 경유)
+
+        duration이 분 단위라 DirectionsService의 'driving'(초 단위)과 캐시 모드를 분리
+        """
+        return route_cache.get_route(
+            start, goal, 'course_driving',
+            lambda: self._get_driving_directions(start, goal)
+        )
+
     def _enrich_with_route_info(
         self,
         course: Dict[str, Any],
@@ -737,29 +793,28 @@ class GeminiCourseRecommender:
         legs_summary = []
 
         # 시작점 → 첫 번째 장소 → ... → 마지막 장소
-        prev_point = start_location
-
-        for idx, stop in enumerate(stops):
-            current_point = {
-                'latitude': stop['latitude'],
-                'longitude': stop['longitude']
-            }
-
-            # Google Directions API로 경로 조회
-            route_result = self._get_driving_directions(prev_point, current_point)
+        # 폴백용 Haversine 구간 거리 (전체 구간 한 번에 계산)
+        points = [start_location] + stops
+        fallback_distances = geo.leg_distances(
+            [point['latitude'] for point in points],
+            [point['longitude'] for point in points]
+        ).tolist()
+
+        # 구간별 경로를 동시에 조회 (결과는 구간 순서대로)
+        coords = [{'latitude': point['latitude'], 'longitude': point['longitude']} for point in points]
+        route_results = route_legs(
+            lambda i: self._get_leg_driving_directions(coords[i], coords[i + 1]),
+            len(stops)
+        )
 
+        for idx, (stop, route_result) in enumerate(zip(stops, route_results)):
             if route_result:
                 distance = route_result['distance']
                 duration = route_result['duration']  # 이미 분 단위
                 polyline = route_result['polyline']
             else:
-                # 폴백: Haversine 거리 계산
-                distance = self._calculate_distance(
-                    prev_point['latitude'],
-                    prev_point['longitude'],
-                    current_point['latitude'],
-                    current_point['longitude']
-                )
+                # 폴백: Haversine 거리
+                distance = fallback_distances[idx]
                 duration = int(distance / 1000 * 2)  # 자동차 시속 30km 기준
                 polyline = ""
 
@@ -803,8 +858,6 @@ class GeminiCourseRecommender:
             total_distance += distance
             total_duration += duration
 
-            prev_point = current_point
-
         course['routes'] = routes
         course['legs_summary'] = legs_summary
         course['total_distance'] = int(total_distance)
@@ -826,28 +879,3 @@ class GeminiCourseRecommender:
         print(f"[Route] 총 거리: {total_distance}m, 총 시간: {total_duration}분 (자동차)")
 
         return course
-
-    def _calculate_distance(
-        self,
-        lat1: float,
-        lng1: float,
-        lat2: float,
-        lng2: float
-    ) -> float:
-        """Haversine 공식으로 두 지점 간 거리 계산 (미터)"""
-        import math
-
-        R = 6371000  # 지구 반지름 (미터)
-
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lng = math.radians(lng2 - lng1)
-
-        a = (math.sin(delta_lat / 2) ** 2 +
-             math.cos(lat1_rad) * math.cos(lat2_rad) *
-             math.sin(delta_lng / 2) ** 2)
-
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-        return R * c
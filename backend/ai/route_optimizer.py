@@ -1,7 +1,17 @@
 import os
+import sys
 import requests
+from pathlib import Path
 from typing import Dict, Any, List, Optional
-import math
+
+import numpy as np
+
+# Add parent directory to path for importing services
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from services import geo
 
 
 class RouteOptimizer:
@@ -53,10 +63,10 @@ class RouteOptimizer:
                 total_duration += route.get('duration', 0)
             else:
                 # Fallback: 직선 거리 기반 추정
-                distance = self._calculate_haversine_distance(
+                distance = int(geo.haversine(
                     start['latitude'], start['longitude'],
                     end['latitude'], end['longitude']
-                )
+                ))
                 routes.append({
                     'type': 'FALLBACK',
                     'distance': distance,
@@ -205,31 +215,6 @@ class RouteOptimizer:
         path = route_data.get('path', [])
         return [[coord[1], coord[0]] for coord in path]
 
-    def _calculate_haversine_distance(
-        self,
-        lat1: float,
-        lon1: float,
-        lat2: float,
-        lon2: float
-    ) -> int:
-        """
-        Haversine 공식으로 두 지점 간 거리 계산 (미터)
-        """
-        R = 6371000  # 지구 반지름 (미터)
-
-        phi1 = math.radians(lat1)
-        phi2 = math.radians(lat2)
-        delta_phi = math.radians(lat2 - lat1)
-        delta_lambda = math.radians(lon2 - lon1)
-
-        a = math.sin(delta_phi / 2) ** 2 + \
-            math.cos(phi1) * math.cos(phi2) * \
-            math.sin(delta_lambda / 2) ** 2
-
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-        return int(R * c)
-
     def _estimate_duration(self, distance: int, mode: str) -> int:
         """
         거리를 바탕으로 소요 시간 추정 (분)
@@ -270,24 +255,22 @@ class RouteOptimizer:
         if len(places) <= 2:
             return places
 
+        # 시작 위치 + 장소들의 거리 행렬을 한 번에 계산 (0번: 시작 위치)
+        points = [start_location] + places
+        distances = geo.distance_matrix(
+            [p['latitude'] for p in points],
+            [p['longitude'] for p in points]
+        )
+        distances[:, 0] = np.inf
+
         optimized = []
-        remaining = places.copy()
-        current = start_location
+        current = 0
 
-        while remaining:
+        while len(optimized) < len(places):
             # 현재 위치에서 가장 가까운 장소 선택
-            nearest = min(
-                remaining,
-                key=lambda p: self._calculate_haversine_distance(
-                    current['latitude'],
-                    current['longitude'],
-                    p['latitude'],
-                    p['longitude']
-                )
-            )
-
-            optimized.append(nearest)
-            remaining.remove(nearest)
+            nearest = int(distances[current].argmin())
+            optimized.append(places[nearest - 1])
+            distances[:, nearest] = np.inf
             current = nearest
 
         return optimized
@@ -1,5 +1,5 @@
 import os
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from functools import wraps
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, join_room, leave_room
@@ -7,9 +7,18 @@ from flask_migrate import Migrate
 from dotenv import load_dotenv
 from sqlalchemy import select, cast, String
 from services.geocoding_service import GeocodingService
-from services.benefit_lookup_service import BenefitLookupService
+from services.benefit_lookup_service import BenefitLookupService, format_benefit
+from services.benefit_snapshot import build_snapshot
+from services.basket_optimizer import BasketOptimizer, purchases_from_stops
+from services.benefit_engine import CardState
+from services.card_state_cache import CardStateCache
 from services.location_service import LocationService
+from services.geo import stores_within
+from services import http_client
+from services.single_flight import single_flight
+from services.rate_limiter import rate_limiter
 from services.directions_service import DirectionsService
+from services.route_cache import RouteCacheService
 from services.tmap_service import tmap_service
 from services.ocr_service import NaverOCRService
 from services.database import init_db, get_db, Base, DATABASE_URL
@@ -55,8 +64,16 @@ migrate = Migrate(app, Base, render_as_batch=True)
 
 geocoding_service = GeocodingService()
 benefit_service = BenefitLookupService()
+# 혜택 스냅샷 교체 감시 (0이면 요청 시점 확인으로 대체)
+benefit_reload_interval = float(os.getenv('BENEFIT_RELOAD_INTERVAL', '5'))
+if benefit_reload_interval > 0:
+    benefit_service.start_watcher(benefit_reload_interval)
+card_state_cache = CardStateCache(ttl_seconds=int(os.getenv('CARD_STATE_CACHE_TTL', '60')))
 location_service = LocationService()
 directions_service = DirectionsService()
+# 경로 캐시 적중 횟수 일괄 반영 + 만료 캐시 정리
+# (ROUTE_CACHE_HIT_FLUSH_INTERVAL / ROUTE_CACHE_SWEEP_INTERVAL 중 0인 작업만 비활성화)
+RouteCacheService.start_maintenance()
 ocr_service = NaverOCRService()
 jwt_service = JwtService()
 # 데이터베이스 초기화 (마이그레이션 후 초기 데이터 시딩)
@@ -84,6 +101,46 @@ def login_required(f):
     return decorated_function
 
 
+def get_optional_user_id():
+    """Authorization 헤더가 있으면 user_id 반환 (없거나 유효하지 않으면 None)"""
+    auth_header = request.headers.get('Authorization', '')
+    parts = auth_header.split(' ')
+    if len(parts) != 2:
+        return None
+    result = jwt_service.verify_token(parts[1])
+    if not result or result.get('error'):
+        return None
+    return result.get('user_id')
+
+
+def load_card_states(user_id):
+    """MyCard → {card_name: CardState} (DB 조회)"""
+    db = get_db()
+    try:
+        mycards = db.scalars(select(MyCard).where(MyCard.user_id == user_id)).all()
+        today = date.today()
+        return {card.mycard_name: CardState.from_mycard(card, today) for card in mycards}
+    finally:
+        db.close()
+
+
+def get_card_context_for_request():
+    """
+    로그인 사용자의 (카드 상태, 카테고리별 한도 소진 카드) (비로그인/조회 실패 시 (None, None))
+
+    카드 상태가 있으면 추천은 예상 할인액(원) 순, 없으면 정적 score 순
+    """
+    user_id = get_optional_user_id()
+    if not user_id:
+        return None, None
+    try:
+        card_states = card_state_cache.get(user_id, load_card_states)
+    except Exception as e:
+        print(f"[CardState] 카드 상태 조회 실패: {e}")
+        return None, None
+    return card_states, benefit_service.engine.unavailable_cards(card_states)
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     return jsonify({
@@ -660,6 +717,7 @@ def card_add():
         mycard = MyCard(user_id=user_id, mycard_name=card_name, mycard_detail=check_card.card_benefit, mycard_pre_month_money=check_card.card_pre_month_money)
         db.add(mycard)
         db.commit()
+        card_state_cache.invalidate(user_id)
         return jsonify({'success':True, 'msg': 'card added'}), 200
     except Exception as e:
         return jsonify({'success':False, 'error': str(e)}), 500
@@ -689,6 +747,7 @@ def card_edit():
         mycard.mycard_detail = check_card.card_benefit
         mycard.mycard_pre_month_money = check_card.card_pre_month_money
         db.commit()
+        card_state_cache.invalidate(user_id)
         return jsonify({'success':True, 'msg': 'card edited'}), 200
     except Exception as e:
         db.rollback()
@@ -709,6 +768,7 @@ def card_delete():
             return jsonify({'success':False, 'error': 'Card not found'}), 404
         db.delete(card)
         db.commit()
+        card_state_cache.invalidate(user_id)
         return jsonify({'success':True, 'msg': 'card deleted'}), 200
     except Exception as e:
         return jsonify({'success':False, 'error': str(e)}), 500
@@ -799,12 +859,41 @@ def geocode_batch():
     }), 200
 
 
+def _format_top_card(top_card):
+    """top_card 응답 (카드 상태로 순위를 매긴 경우 expected_discount 포함)"""
+    if not top_card:
+        return None
+    formatted = {
+        'card': top_card['card'],
+        'score': top_card['score'],
+        'benefit': format_benefit(top_card)
+    }
+    if top_card.expected_discount is not None:
+        formatted['expected_discount'] = top_card.expected_discount
+    return formatted
+
+
+def _attach_top_cards(stores, cards, card_context):
+    """가맹점마다 최고 혜택 카드(top_card)를 붙임 (한 번에 배치 조회)"""
+    card_states, unavailable_cards = card_context
+    top_cards = benefit_service.get_top_cards_batch(
+        [(store['name'], store['category']) for store in stores],
+        cards,
+        unavailable_cards,
+        card_states
+    )
+    for store, top_card in zip(stores, top_cards):
+        store['top_card'] = _format_top_card(top_card)
+    return stores
+
+
 @app.route('/api/nearby-recommendations', methods=['GET'])
 def nearby_recommendations():
     """
     Get nearby stores with card recommendations
     Query params:
-        - pagetoken: Optional pagination token from previous request
+        - pagetoken: Optional pagination token from previous request (같은 lat/lng/radius/category로 호출)
+        - page_size: 페이지당 가맹점 수 (기본/최대 100)
     """
     try:
         lat = float(request.args.get('lat'))
@@ -818,6 +907,7 @@ def nearby_recommendations():
         staying_duration = request.args.get('staying_duration', type=int)
         category = request.args.get('category')
         pagetoken = request.args.get('pagetoken')
+        page_size = request.args.get('page_size', type=int)
         print(f"\n[API] nearby-recommendations 요청")
         print(f"[API] 검색 위치: {lat}, {lng}, radius={radius}m")
         print(f"[API] 사용자 위치: {user_lat}, {user_lng}")
@@ -829,82 +919,32 @@ def nearby_recommendations():
     except (TypeError, ValueError):
         return jsonify({'error': 'Invalid parameters'}), 400
 
-    next_page_token = None
-
-    # Detect indoor/outdoor
-    location_info = location_service.detect_indoor(lat, lng, gps_accuracy, staying_duration)
-    print(f"[API] 위치 정보: indoor={location_info['indoor']}, building={location_info['building_name']}")
-
-    # Search nearby stores
-    if location_info['indoor'] and location_info['building_name']:
-        print(f"[API] 건물 내부 검색: {location_info['building_name']}")
-        stores = location_service.search_building_stores(
-            location_info['building_name'],
-            user_lat,
-            user_lng
-        )
-
-        # Fallback to nearby search if no stores found
-        if len(stores) == 0:
-            print(f"[API] 건물 검색 실패, 주변 검색으로 전환...")
-            result = location_service.search_nearby_stores(lat, lng, radius, category, pagetoken)
-
-            # Check for errors
-            if 'error' in result:
-                return jsonify({
-                    'error': result['error'],
-                    'message': result['message']
-                }), 500
-
-            stores = result['stores']
-            next_page_token = result['next_page_token']
-        else:
-            # Limit to 6 stores when inside building
-            stores = stores[:6]
-            print(f"[API] 건물 내부 - 최대 6개 가맹점으로 제한")
-    else:
-        print(f"[API] 주변 가맹점 검색 시작...")
-        result = location_service.search_nearby_stores(lat, lng, radius, category, pagetoken)
+    # Detect indoor/outdoor and search stores (nearby search runs speculatively alongside detection)
+    result = location_service.find_stores(
+        lat, lng, user_lat, user_lng, radius, category, pagetoken,
+        gps_accuracy=gps_accuracy,
+        staying_duration=staying_duration,
+        page_size=page_size
+    )
+    location_info = result['location_info']
 
-        # Check for errors
-        if 'error' in result:
-            return jsonify({
-                'error': result['error'],
-                'message': result['message']
-            }), 500
+    # Check for errors
+    if 'error' in result:
+        return jsonify({
+            'error': result['error'],
+            'message': result['message']
+        }), 500
 
-        stores = result['stores']
-        next_page_token = result['next_page_token']
+    stores = result['stores']
+    next_page_token = result['next_page_token']
 
     print(f"[API] 검색 완료: {len(stores)}개 가맹점 발견")
 
-    # Recalculate distance from user's actual location
-    for store in stores:
-        actual_distance = location_service.calculate_distance(
-            user_lat, user_lng,
-            store['latitude'], store['longitude']
-        )
-        store['distance'] = int(actual_distance)
+    # Recalculate distance from user's actual location and sort (one array operation)
+    stores = stores_within(user_lat, user_lng, stores)
 
-    # Sort by distance from user
-    stores.sort(key=lambda x: x['distance'])
-
-    # Add top card recommendation for each store
-    for store in stores:
-        top_card = benefit_service.get_top_card_for_merchant(
-            store['name'],
-            store['category'],
-            cards
-        )
-
-        if top_card:
-            store['top_card'] = {
-                'card': top_card['card'],
-                'score': top_card['score'],
-                'benefit': format_benefit(top_card)
-            }
-        else:
-            store['top_card'] = None
+    # Add top card recommendation for each store (한 번에 배치 조회, 한도 소진 카드 제외, 로그인 시 예상 할인액 순)
+    _attach_top_cards(stores, cards, get_card_context_for_request())
 
     response_data = {
         'indoor': location_info['indoor'],
@@ -920,6 +960,101 @@ def nearby_recommendations():
     return jsonify(response_data), 200
 
 
+@app.route('/api/nearby-recommendations/stream', methods=['GET'])
+def nearby_recommendations_stream():
+    """
+    주변 가맹점 + 카드 추천을 NDJSON(한 줄에 JSON 하나)으로 스트리밍
+
+    전체 카테고리 검색은 카테고리별 검색이 끝나는 대로 top_card까지 붙여 바로 내보내므로
+    가장 느린 카테고리를 기다리지 않고 첫 핀을 그릴 수 있다. 쿼리 파라미터는 /api/nearby-recommendations와 같다.
+
+    이벤트 (type 필드로 구분):
+        - location: {indoor, building_name, address}
+        - stores: {category, stores} - 이전 이벤트와 중복된 가맹점은 제외, 각 이벤트 안에서 사용자 거리순
+        - error: {error, message}
+        - done: {total}
+    """
+    try:
+        lat = float(request.args.get('lat'))
+        lng = float(request.args.get('lng'))
+        user_lat = float(request.args.get('user_lat', lat))
+        user_lng = float(request.args.get('user_lng', lng))
+        radius = int(request.args.get('radius'))
+        cards = request.args.get('cards', '').split(',')
+        gps_accuracy = request.args.get('gps_accuracy', type=float)
+        staying_duration = request.args.get('staying_duration', type=int)
+        category = request.args.get('category')
+        print(f"\n[API] nearby-recommendations/stream 요청: {lat}, {lng}, radius={radius}m, 카테고리: {category}")
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid parameters'}), 400
+
+    card_context = get_card_context_for_request()
+
+    # 전체 카테고리 검색은 실내 감지 전에 시작 (find_stores의 투기적 실행과 같은 이유)
+    batches = location_service.iter_nearby_stores(lat, lng, radius) if category is None else None
+
+    def event(payload):
+        return json.dumps(payload, ensure_ascii=False) + '\n'
+
+    def generate():
+        try:
+            yield from stream_events()
+        finally:
+            # 실내 조기 반환/클라이언트 연결 끊김: 아직 시작하지 않은 카테고리 호출 취소
+            if batches is not None:
+                batches.close()
+
+    def stream_events():
+        location_info = location_service.detect_indoor(lat, lng, gps_accuracy, staying_duration)
+        yield event({
+            'type': 'location',
+            'indoor': location_info['indoor'],
+            'building_name': location_info['building_name'],
+            'address': location_info['address']
+        })
+
+        if location_info['indoor'] and location_info['building_name']:
+            building_stores = location_service.search_building_stores(location_info['building_name'], user_lat, user_lng)
+            if building_stores:
+                stores = _attach_top_cards(stores_within(user_lat, user_lng, building_stores[:6]), cards, card_context)
+                yield event({'type': 'stores', 'category': 'building', 'stores': stores})
+                yield event({'type': 'done', 'total': len(stores)})
+                return
+
+        if batches is None:
+            result = location_service.search_nearby_stores(lat, lng, radius, category)
+            if 'error' in result:
+                yield event({'type': 'error', 'error': result['error'], 'message': result['message']})
+                return
+            category_batches = [(category, result['stores'])]
+        else:
+            category_batches = batches
+
+        seen = set()
+        total = 0
+        for batch_category, batch in category_batches:
+            new_stores = []
+            for store in batch:
+                place_id = store.get('place_id')
+                if place_id and place_id not in seen:
+                    seen.add(place_id)
+                    new_stores.append(store)
+            if not new_stores:
+                continue
+            stores = _attach_top_cards(stores_within(user_lat, user_lng, new_stores), cards, card_context)
+            total += len(stores)
+            yield event({'type': 'stores', 'category': batch_category, 'stores': stores})
+
+        print(f"[API] 스트리밍 완료: {total}개 가맹점")
+        yield event({'type': 'done', 'total': total})
+
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    if batches is not None:
+        # 스트림이 한 번도 반복되지 않고 닫혀도(연결 즉시 끊김) 취소되도록
+        response.call_on_close(batches.close)
+    return response
+
+
 @app.route('/api/merchant-recommendations', methods=['POST'])
 def merchant_recommendations():
     """
@@ -937,16 +1072,19 @@ def merchant_recommendations():
     if not category or not user_cards:
         return jsonify({'error': 'category and user_cards are required'}), 400
 
+    card_states, unavailable_cards = get_card_context_for_request()
     recommendations = benefit_service.get_recommendations(
         merchant_name,
         category,
-        user_cards
+        user_cards,
+        unavailable_cards,
+        card_states
     )
 
     # Format recommendations
     formatted_recs = []
     for rec in recommendations:
-        formatted_recs.append({
+        formatted = {
             'rank': rec['rank'],
             'card': rec['card'],
             'score': rec['score'],
@@ -956,7 +1094,10 @@ def merchant_recommendations():
             'point_rate': rec['point_rate'],
             'pre_month_money': rec['pre_month_money'],
             'benefit_summary': format_benefit(rec)
-        })
+        }
+        if rec.expected_discount is not None:
+            formatted['expected_discount'] = rec.expected_discount
+        formatted_recs.append(formatted)
 
     return jsonify({
         'merchant_name': merchant_name,
@@ -965,6 +1106,106 @@ def merchant_recommendations():
     }), 200
 
 
+@app.route('/api/merchant-recommendations/batch', methods=['POST'])
+def merchant_recommendations_batch():
+    """
+    Get the top card for many merchants in one round trip
+
+    Request body:
+    {
+        'merchants': [{'merchant_name': str, 'category': str}, ...],
+        'user_cards': List[str]
+    }
+    """
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'error': 'Request body is required'}), 400
+
+    merchants = data.get('merchants')
+    user_cards = data.get('user_cards', [])
+
+    if not isinstance(merchants, list) or not user_cards:
+        return jsonify({'error': 'merchants array and user_cards are required'}), 400
+
+    pairs = []
+    for merchant in merchants:
+        if not isinstance(merchant, dict) or not merchant.get('category'):
+            return jsonify({'error': 'each merchant requires a category'}), 400
+        pairs.append((merchant.get('merchant_name'), merchant['category']))
+
+    card_states, unavailable_cards = get_card_context_for_request()
+    top_cards = benefit_service.get_top_cards_batch(pairs, user_cards, unavailable_cards, card_states)
+
+    results = []
+    for (merchant_name, category), top_card in zip(pairs, top_cards):
+        results.append({
+            'merchant_name': merchant_name,
+            'category': category,
+            'top_card': _format_top_card(top_card)
+        })
+
+    return jsonify({'results': results}), 200
+
+
+@app.route('/api/benefits/evaluate', methods=['POST'])
+@login_required
+def evaluate_benefits():
+    """
+    보유 카드별 실제 예상 할인액(원) 순위
+
+    전월실적 티어와 일/월 사용 한도를 MyCard 상태로 평가한다.
+
+    Request:
+    {
+        "merchant_name": "GS25 고대점",
+        "category": "convenience",
+        "payment_amount": 8000
+    }
+
+    Response:
+    {
+        "recommendations": [
+            {
+                "rank": 1,
+                "card": "신한카드 Mr.Life",
+                "expected_discount": 800,
+                "discount_type": "percent",
+                "discount_display": "10% 할인",
+                "limit_display": "일 1회 월 5회 1회 1만원까지",
+                "max_discount_display": "1회 최대 1천원"
+            }
+        ]
+    }
+    """
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'error': 'Request body is required'}), 400
+
+    merchant_name = data.get('merchant_name')
+    category = data.get('category')
+    try:
+        payment_amount = int(data.get('payment_amount'))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'payment_amount must be a valid integer'}), 400
+
+    if not category:
+        return jsonify({'error': 'category is required'}), 400
+
+    user_id = jwt_service.verify_token(request.headers['Authorization'].split(' ')[1]).get('user_id')
+    card_states = card_state_cache.get(user_id, load_card_states)
+
+    recommendations = benefit_service.engine.rank(merchant_name, category, payment_amount, card_states)
+
+    return jsonify({
+        'merchant_name': merchant_name,
+        'category': category,
+        'payment_amount': payment_amount,
+        'recommendations': recommendations
+    }), 200
+
+
 @app.route('/api/search-place', methods=['GET'])
 def search_place():
     """
@@ -980,8 +1221,6 @@ def search_place():
         return jsonify({'error': 'Query parameter is required'}), 400
 
     try:
-        import requests as req
-
         # Use Nearby Search if location is provided (강제 위치 기반)
         if latitude is not None and longitude is not None:
             print(f"[Search] Nearby Search: '{query}' at {latitude}, {longitude}")
@@ -994,7 +1233,7 @@ def search_place():
                 'language': 'ko',
             }
 
-            response = req.get('https://maps.googleapis.com/maps/api/place/nearbysearch/json', params=params)
+            response = http_client.get('https://maps.googleapis.com/maps/api/place/nearbysearch/json', upstream='google_places_legacy', params=params)
         else:
             # Use Text Search for global search (위치 정보 없을 때)
             print(f"[Search] Text Search: '{query}'")
@@ -1005,7 +1244,7 @@ def search_place():
                 'language': 'ko',
             }
 
-            response = req.get('https://maps.googleapis.com/maps/api/place/textsearch/json', params=params)
+            response = http_client.get('https://maps.googleapis.com/maps/api/place/textsearch/json', upstream='google_places_legacy', params=params)
 
         response.raise_for_status()
         data = response.json()
@@ -1032,23 +1271,39 @@ def search_place():
         return jsonify({'error': 'Search failed'}), 500
 
 
+def _autocomplete_result(place_id, location, prediction=None):
+    """자동완성 결과 항목 (장소 정보에 이름/주소가 없으면 후보 텍스트 사용)"""
+    prediction = prediction or {}
+    return {
+        'place_id': place_id,
+        'name': location.get('name') or prediction.get('structured_formatting', {}).get('main_text', ''),
+        'address': location.get('address') or prediction.get('description', ''),
+        'latitude': location['latitude'],
+        'longitude': location['longitude'],
+        'types': location.get('types', []),
+    }
+
+
 @app.route('/api/search-autocomplete', methods=['GET'])
 def search_autocomplete():
     """
     Search autocomplete using Google Places API
     Returns multiple results for user selection
+
+    Query params:
+        - lazy: true면 후보 좌표를 조회하지 않고 바로 반환 (latitude/longitude는 null)
+          사용자가 고른 후보만 /api/search-autocomplete/resolve로 좌표 조회
     """
     query = request.args.get('query')
     latitude = request.args.get('latitude', type=float)
     longitude = request.args.get('longitude', type=float)
     limit = request.args.get('limit', 10, type=int)
+    lazy = request.args.get('lazy', 'false').lower() == 'true'
 
     if not query or len(query) < 2:
         return jsonify({'results': []}), 200
 
     try:
-        import requests as req
-
         # Use Google Places Autocomplete API
         params = {
             'input': query,
@@ -1062,36 +1317,34 @@ def search_autocomplete():
             params['location'] = f'{latitude},{longitude}'
             params['radius'] = 50000  # 50km bias
 
-        response = req.get('https://maps.googleapis.com/maps/api/place/autocomplete/json', params=params)
+        response = http_client.get('https://maps.googleapis.com/maps/api/place/autocomplete/json', upstream='google_places_autocomplete', params=params)
         response.raise_for_status()
         data = response.json()
         predictions = data.get('predictions', [])[:limit]
 
-        results = []
-        for pred in predictions:
-            # Get place details for coordinates
-            place_id = pred.get('place_id')
-            if place_id:
-                detail_params = {
-                    'place_id': place_id,
-                    'fields': 'geometry,name,formatted_address,types',
-                    'key': os.getenv('GOOGLE_MAPS_API_KEY'),
-                    'language': 'ko',
+        predictions = [pred for pred in predictions if pred.get('place_id')]
+
+        if lazy:
+            results = [
+                {
+                    'place_id': pred['place_id'],
+                    'name': pred.get('structured_formatting', {}).get('main_text', ''),
+                    'address': pred.get('description', ''),
+                    'latitude': None,
+                    'longitude': None,
+                    'types': pred.get('types', []),
                 }
-                detail_response = req.get('https://maps.googleapis.com/maps/api/place/details/json', params=detail_params)
-                detail_data = detail_response.json()
-                place = detail_data.get('result', {})
-
-                if place.get('geometry'):
-                    location = place['geometry']['location']
-                    results.append({
-                        'place_id': place_id,
-                        'name': place.get('name', pred.get('structured_formatting', {}).get('main_text', '')),
-                        'address': place.get('formatted_address', pred.get('description', '')),
-                        'latitude': location['lat'],
-                        'longitude': location['lng'],
-                        'types': place.get('types', []),
-                    })
+                for pred in predictions
+            ]
+            return jsonify({'results': results, 'lazy': True}), 200
+
+        # Get place details for coordinates (병렬 + place_id 캐시)
+        locations = location_service.get_place_locations([pred['place_id'] for pred in predictions])
+
+        results = []
+        for pred, location in zip(predictions, locations):
+            if location:
+                results.append(_autocomplete_result(pred['place_id'], location, pred))
 
         return jsonify({'results': results}), 200
 
@@ -1100,6 +1353,25 @@ def search_autocomplete():
         return jsonify({'error': 'Autocomplete failed', 'results': []}), 500
 
 
+@app.route('/api/search-autocomplete/resolve', methods=['GET'])
+def resolve_autocomplete():
+    """
+    자동완성 후보 하나의 좌표 조회 (lazy 모드에서 사용자가 후보를 골랐을 때)
+
+    Query params:
+        place_id: Google Place ID
+    """
+    place_id = request.args.get('place_id')
+    if not place_id:
+        return jsonify({'error': 'place_id is required'}), 400
+
+    location = location_service.get_place_location(place_id)
+    if not location:
+        return jsonify({'error': 'Place not found', 'result': None}), 404
+
+    return jsonify({'result': _autocomplete_result(place_id, location)}), 200
+
+
 @app.route('/api/stores', methods=['GET'])
 def get_stores():
     """
@@ -1176,25 +1448,6 @@ def get_place_details():
     return jsonify(details), 200
 
 
-def format_benefit(benefit: dict) -> str:
-    """Format benefit info into human-readable string"""
-    parts = []
-
-    if benefit.get('discount_rate'):
-        parts.append(f"{benefit['discount_rate']}% 할인")
-
-    if benefit.get('discount_amount'):
-        parts.append(f"최대 {benefit['discount_amount']:,}원 할인")
-
-    if benefit.get('point_rate'):
-        parts.append(f"{benefit['point_rate']}% 적립")
-
-    if benefit.get('pre_month_money'):
-        parts.append(f"전월 {benefit['pre_month_money']//10000}만원 이상")
-
-    return ' • '.join(parts) if parts else '혜택 없음'
-
-
 @app.route('/api/ai/course-recommend', methods=['POST'])
 def ai_course_recommend():
     """
@@ -1252,15 +1505,28 @@ def ai_course_recommend():
                 'error': 'user_input and user_location are required'
             }), 400
 
+        # 로그인 사용자는 카드 사용 현황(일/월 횟수, 한도)을 코스 카드 배정에 반영
+        card_states = None
+        user_id = get_optional_user_id()
+        if user_id:
+            try:
+                card_states = card_state_cache.get(user_id, load_card_states)
+            except Exception as e:
+                print(f"[CardState] 카드 상태 조회 실패: {e}")
+
         # Gemini 기반 코스 추천
-        recommender = GeminiCourseRecommender()
+        recommender = GeminiCourseRecommender(
+            location_service=location_service,
+            benefit_service=benefit_service
+        )
         result = recommender.recommend_course_with_benefits(
             user_input=user_input,
             user_location=user_location,
             user_cards=user_cards,
             max_distance=max_distance,
             num_people=num_people,
-            budget=budget
+            budget=budget,
+            card_states=card_states
         )
 
         return jsonify(result), 200
@@ -1275,6 +1541,80 @@ def ai_course_recommend():
         }), 500
 
 
+@app.route('/api/course/card-plan', methods=['POST'])
+@login_required
+def course_card_plan():
+    """
+    코스 전체 결제 카드 배정 API
+
+    장소별 최고 카드를 독립적으로 고르지 않고, 일/월 횟수 및 할인 한도 간섭을 반영해
+    코스 전체 예상 할인액이 최대가 되도록 보유 카드를 배정합니다.
+
+    Request:
+    {
+        "course_id": 1,                   // 저장된 코스 (stops 대신 사용 가능)
+        "stops": [{"name": "스타벅스 잠실점", "category": "cafe", "estimated_amount": 12000}, ...],
+        "budget": 100000                  // estimated_amount가 없는 장소는 예산 균등 분배
+    }
+
+    Response:
+    {
+        "success": true,
+        "card_plan": {
+            "assignments": [{"index": 0, "card": "...", "expected_discount": 1200, ...}],
+            "total_discount": 5400,
+            "upper_bound": 6000,
+            "method": "exact"
+        }
+    }
+    """
+    user_id = jwt_service.verify_token(request.headers['Authorization'].split(' ')[1]).get('user_id')
+    data = request.get_json() or {}
+    stops = data.get('stops')
+    budget = data.get('budget')
+
+    db = get_db()
+    try:
+        if data.get('course_id') is not None and not stops:
+            course = db.scalar(select(SavedCourse).where(SavedCourse.id == data.get('course_id')))
+            if not course:
+                return jsonify({'success': False, 'error': '코스를 찾을 수 없습니다'}), 404
+            has_access = course.user_id == user_id or db.scalar(
+                select(SavedCourseUser)
+                .where(SavedCourseUser.course_id == course.id)
+                .where(SavedCourseUser.user_id == user_id)
+            ) is not None or db.scalar(
+                select(SharedCourse)
+                .where(SharedCourse.course_id == course.id)
+                .where(SharedCourse.shared_to == user_id)
+            ) is not None
+            if not has_access:
+                return jsonify({'success': False, 'error': '이 코스에 접근할 권한이 없습니다'}), 403
+            stops = json.loads(course.stops) if course.stops else []
+            if budget is None:
+                budget = course.budget
+    finally:
+        db.close()
+
+    if not stops:
+        return jsonify({'success': False, 'error': 'stops or course_id is required'}), 400
+    try:
+        budget = int(budget if budget is not None else 100000)
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'budget must be a valid integer'}), 400
+
+    card_states = card_state_cache.get(user_id, load_card_states)
+    if not card_states:
+        return jsonify({'success': False, 'error': '등록된 카드가 없습니다'}), 400
+
+    plan = BasketOptimizer(benefit_service.engine).optimize(purchases_from_stops(stops, budget), card_states)
+
+    return jsonify({
+        'success': True,
+        'card_plan': plan
+    }), 200
+
+
 @app.route('/api/course/save', methods=['POST'])
 @login_required
 def save_course():
@@ -2361,6 +2701,113 @@ def require_admin_auth(f):
     return decorated_function
 
 
+@app.route('/api/admin/benefits/reload', methods=['POST'])
+@require_admin_auth
+def reload_benefit_snapshot():
+    """
+    혜택 데이터 즉시 리로드 (관리자)
+
+    Request Body (선택):
+        rebuild: true면 원본 JSON/CSV로 스냅샷 파일을 다시 생성한 뒤 리로드
+
+    요청을 받은 워커는 즉시 교체되고, 다른 워커는 감시 스레드가 스냅샷 파일 교체를 감지해 따라온다.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        if data.get('rebuild'):
+            build_snapshot(benefit_service.snapshot_path)
+        reloaded = benefit_service.reload(force=True)
+    except Exception as e:
+        print(f"[Error] 혜택 데이터 리로드 실패: {e}")
+        return jsonify({'success': False, 'error': str(e), 'version': benefit_service.version}), 500
+
+    return jsonify({
+        'success': True,
+        'reloaded': reloaded,
+        'version': benefit_service.version
+    }), 200
+
+
+def _admin_merchant_store(merchant):
+    """관리자 가맹점 항목 → 가맹점 저장소 dict (place_id, 유효한 위도/경도가 없으면 None)"""
+    if not isinstance(merchant, dict):
+        return None
+    place_id = merchant.get('place_id')
+    category = merchant.get('category')
+    if not place_id or not isinstance(place_id, str) or not isinstance(category, (str, type(None))):
+        return None
+    try:
+        latitude = float(merchant.get('latitude'))
+        longitude = float(merchant.get('longitude'))
+    except (TypeError, ValueError):
+        return None
+    if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+        return None
+    return {
+        'name': str(merchant.get('name') or ''),
+        'category': location_service._google_types_to_category([category] if category else []),
+        'address': str(merchant.get('address') or ''),
+        'latitude': latitude,
+        'longitude': longitude,
+        'place_id': place_id,
+        'photo_name': None
+    }
+
+
+@app.route('/api/admin/merchants/sync', methods=['POST'])
+@require_admin_auth
+def sync_admin_merchants():
+    """
+    관리자 백엔드에 등록된 가맹점을 로컬 가맹점 저장소에 반영 (관리자)
+
+    Request Body:
+        merchants: [{'place_id', 'name', 'category', 'address', 'latitude', 'longitude'}, ...]
+            category는 Google 장소 타입 (예: 'cafe', 'convenience_store')
+    """
+    data = request.get_json(silent=True) or {}
+    merchants = data.get('merchants')
+    if not isinstance(merchants, list):
+        return jsonify({'error': 'merchants array is required'}), 400
+
+    stores = []
+    invalid = []
+    for i, merchant in enumerate(merchants):
+        store = _admin_merchant_store(merchant)
+        if store is None:
+            invalid.append(i)
+        else:
+            stores.append(store)
+    if invalid:
+        # 일부만 반영하지 않도록 잘못된 항목이 하나라도 있으면 전체 거부
+        return jsonify({
+            'error': 'each merchant requires place_id, latitude (-90..90), longitude (-180..180)',
+            'invalid_indexes': invalid[:100]
+        }), 400
+
+    location_service.record_known_merchants(stores, source='admin')
+    print(f"[API] 관리자 가맹점 동기화: {len(stores)}/{len(merchants)}개")
+    return jsonify({'success': True, 'synced': len(stores)}), 200
+
+
+@app.route('/api/admin/http-stats', methods=['GET'])
+@require_admin_auth
+def get_http_stats():
+    """
+    외부 API 업스트림별 호출 통계 (관리자)
+
+    호출 수/오류 수/평균·최대 지연/지연 시간 히스토그램/동시 호출 제한 대기,
+    속도 제한 토큰 버킷 상태(대기·거절·429 횟수, backlog_ms > 0이면 포화),
+    single-flight 병합 통계(실제 실행 수/병합된 호출 수) (이 워커 기준)
+    """
+    return jsonify({
+        'success': True,
+        'pid': os.getpid(),
+        'upstreams': http_client.stats(),
+        'rate_limits': rate_limiter.stats(),
+        'single_flight': single_flight.stats()
+    }), 200
+
+
 @app.route('/api/balance/check-for-admin', methods=['POST'])
 @require_admin_auth
 def check_balance_for_admin():
@@ -2952,6 +3399,7 @@ def payment_webhook():
             )
             db.add(payment)
         db.commit()
+        card_state_cache.invalidate(user_id)
 
         # 결제 알림 생성
         if corp_card:
@@ -3224,6 +3672,7 @@ def process_payment():
             db.add(notification)
             db.commit()
             db.refresh(notification)
+            card_state_cache.invalidate(qr_status.user_id)
 
             # 실시간 알림 전송
             notification_broadcast = {
@@ -0,0 +1,271 @@
+"""
+혜택 추천 핫패스 벤치마크 공통 fixture (합성 데이터)
+
+- 가맹점 10,000개 (10개 카테고리 × 1,000개 브랜드) + 카테고리별 default
+- 카드 500종, 카드당 혜택 규칙 4건 (card_benefits.csv 형식)
+- 사용자 보유 카드 1~20장, 지도 뷰포트 100개 매장
+
+p99 예산(BENCHMARK_P99_BUDGET_US, 마이크로초)을 넘으면 실패한다.
+느린 장비에서는 BENCHMARK_BUDGET_SCALE=2 처럼 예산을 늘려 실행한다.
+"""
+import csv
+import importlib.util
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+ADMIN_APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'admin-backend', 'app')
+
+from services.benefit_lookup_service import BenefitLookupService
+
+SEED = 42
+NUM_CATEGORIES = 10
+MERCHANTS_PER_CATEGORY = 1000
+NUM_CARDS = 500
+BENEFITS_PER_MERCHANT = 20
+RULES_PER_CARD = 4
+VIEWPORT_SIZE = 100
+USER_CARD_COUNTS = (1, 5, 20)
+
+CATEGORIES = [f"category{i}" for i in range(NUM_CATEGORIES)]
+CARDS = [f"테스트카드 {i:03d}" for i in range(NUM_CARDS)]
+
+# 테스트별 p99 예산 (마이크로초, 1회 호출 기준)
+BENCHMARK_P99_BUDGET_US = {
+    'get_recommendations': 100,
+    'get_top_card_for_merchant': 30,
+    'viewport_top_card_loop': 8000,
+    'viewport_top_cards_batch': 8000,
+    'format_benefit_viewport': 1500,
+    'admin_calculate_benefit_cached': 30,
+    'admin_calculate_benefit_uncached': 4000,
+    'engine_rank': 4000,
+}
+BUDGET_SCALE = float(os.getenv('BENCHMARK_BUDGET_SCALE', '1'))
+
+
+def merchant_name(category_idx: int, merchant_idx: int) -> str:
+    return f"브랜드{category_idx:02d}{merchant_idx:04d}"
+
+
+def build_benefits_db(rng: random.Random) -> dict:
+    """benefits_db.json 형식 합성 데이터"""
+    db = {}
+    for c, category in enumerate(CATEGORIES):
+        merchants = {}
+        for m in range(MERCHANTS_PER_CATEGORY):
+            merchants[merchant_name(c, m)] = [
+                {
+                    'card': card,
+                    'score': rng.randint(1, 100),
+                    'discount_rate': rng.choice([0, 5, 10, 20]),
+                    'discount_amount': rng.choice([0, 1000, 3000, 5000]),
+                    'point_rate': rng.choice([0, 1, 2]),
+                    'monthly_limit': rng.choice([0, 10000, 30000]),
+                    'pre_month_money': rng.choice([0, 300000, 500000]),
+                    'benefit_text': f"{card} {category} 혜택",
+                }
+                for card in rng.sample(CARDS, BENEFITS_PER_MERCHANT)
+            ]
+        merchants['default'] = [
+            {'card': card, 'score': rng.randint(1, 50), 'discount_rate': 1, 'benefit_text': '기본 혜택'}
+            for card in rng.sample(CARDS, BENEFITS_PER_MERCHANT)
+        ]
+        db[category] = merchants
+    return db
+
+
+def build_card_benefit_rows(rng: random.Random) -> list:
+    """card_benefits.csv 형식 합성 규칙"""
+    rows = []
+    for card in CARDS:
+        for _ in range(RULES_PER_CARD):
+            c = rng.randrange(NUM_CATEGORIES)
+            places = [merchant_name(c, rng.randrange(MERCHANTS_PER_CATEGORY)) for _ in range(rng.randint(0, 3))]
+            discount_type = rng.choice(['percent', 'amount', 'point'])
+            tiers = [
+                {'threshold': 300000, 'discount_value': 5, 'max_discount': 10000},
+                {'threshold': 700000, 'discount_value': 10, 'max_discount': 20000},
+            ] if rng.random() < 0.3 else []
+            rows.append({
+                'card_name': card,
+                'category': CATEGORIES[c],
+                'places': json.dumps(places, ensure_ascii=False) if places else 'null',
+                'discount_type': discount_type,
+                'discount_value': str(rng.choice([1, 5, 10, 1000, 3000]) if discount_type == 'amount' else rng.choice([1, 5, 10])),
+                'max_discount': str(rng.choice([1000, 5000, 10000])) if rng.random() < 0.5 else 'null',
+                'pre_month_config': json.dumps({'required': bool(tiers), 'tiers': tiers}) if tiers else 'null',
+                'limit_config': json.dumps({'daily_limit': 1, 'monthly_limit': rng.choice([5, 10, 30000])}),
+                'places_display': ', '.join(places) or '전 가맹점',
+                'discount_display': f"{discount_type} 혜택",
+                'limit_display': '월 한도',
+                'max_discount_display': '최대 할인',
+            })
+    return rows
+
+
+@pytest.fixture(scope='session')
+def rng():
+    return random.Random(SEED)
+
+
+@pytest.fixture(scope='session')
+def card_benefit_rows(rng):
+    return build_card_benefit_rows(rng)
+
+
+@pytest.fixture(scope='session')
+def benefit_service(tmp_path_factory, rng, card_benefit_rows):
+    """합성 JSON/CSV로 만든 BenefitLookupService (스냅샷 미사용)"""
+    data_dir = tmp_path_factory.mktemp('benefit_data')
+    db_path = data_dir / 'benefits_db.json'
+    csv_path = data_dir / 'card_benefits.csv'
+    with open(db_path, 'w', encoding='utf-8') as f:
+        json.dump(build_benefits_db(rng), f, ensure_ascii=False)
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(card_benefit_rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(card_benefit_rows)
+
+    return BenefitLookupService(
+        db_path=str(db_path),
+        snapshot_path=str(data_dir / 'missing.msgpack'),
+        card_benefits_path=str(csv_path)
+    )
+
+
+class _StubQuery:
+    """get_rule_set이 실행하는 쿼리 결과만 돌려주는 쿼리 (버전 고정)"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def filter(self, *criteria):
+        return self
+
+    def scalar(self):
+        return 1
+
+    def one(self):
+        return len(self.rows), len(self.rows), None
+
+    def all(self):
+        return self.rows
+
+
+class _StubSession:
+    """관리자 calculate_benefit에 넘기는 DB 세션 대역 (card_benefits 행 = 합성 규칙)"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def query(self, *entities):
+        return _StubQuery(self.rows)
+
+
+def _load_admin_package():
+    """admin-backend/app 패키지를 admin_app 이름으로 로드 (사용자 백엔드 app.py와 이름 충돌 방지)"""
+    if 'admin_app' not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            'admin_app', os.path.join(ADMIN_APP_DIR, '__init__.py'), submodule_search_locations=[ADMIN_APP_DIR]
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['admin_app'] = module
+        spec.loader.exec_module(module)
+    return importlib.import_module('admin_app.services.benefit_calculator')
+
+
+@pytest.fixture(scope='session')
+def admin_calculator(card_benefit_rows):
+    """
+    관리자 백엔드 QR 할인 계산 진입점 (calculate_benefit → get_rule_set 버전 확인 → 규칙 세트)
+
+    DB 대신 합성 규칙을 돌려주는 세션을 사용한다. 관리자 백엔드 의존성(pydantic-settings)이 없으면 건너뜀.
+    Returns:
+        (calculate(card, category, merchant, amount) → 결과 dict, 규칙 세트 조회 함수)
+    """
+    pytest.importorskip('pydantic_settings')
+    calculator = _load_admin_package()
+    session = _StubSession(card_benefit_rows)
+    calculator._rule_set = None
+    calculator.get_rule_set(session, force=True)
+
+    def calculate(card_name, category, merchant_name, payment_amount):
+        # calculate_benefit은 await 없이 끝나는 코루틴이므로 이벤트 루프 없이 한 번 진행시켜 결과를 받음
+        coro = calculator.calculate_benefit(card_name, category, merchant_name, payment_amount, session)
+        try:
+            coro.send(None)
+        except StopIteration as stop:
+            return stop.value
+        raise RuntimeError('calculate_benefit suspended unexpectedly')
+
+    return calculate, lambda: calculator.get_rule_set(session)
+
+
+@pytest.fixture(params=USER_CARD_COUNTS)
+def card_count(request):
+    """사용자 보유 카드 수 (USER_CARD_COUNTS별로 테스트 반복)"""
+    return request.param
+
+
+@pytest.fixture(scope='session')
+def synthetic_merchant():
+    """(카테고리 번호, 가맹점 번호) → 합성 데이터의 (가맹점명, 카테고리)"""
+    def lookup(category_idx: int, merchant_idx: int):
+        return merchant_name(category_idx, merchant_idx), CATEGORIES[category_idx]
+    return lookup
+
+
+@pytest.fixture(scope='session')
+def user_cards_by_count(rng):
+    return {count: frozenset(rng.sample(CARDS, count)) for count in USER_CARD_COUNTS}
+
+
+@pytest.fixture(scope='session')
+def viewport(rng):
+    """지도 뷰포트 매장 100개: (지점명이 붙은 가맹점명, 카테고리) - 일부는 default로 폴백"""
+    stores = []
+    for i in range(VIEWPORT_SIZE):
+        c = rng.randrange(NUM_CATEGORIES)
+        if i % 10 == 0:
+            name = f"동네가게 {i}"
+        else:
+            name = f"{merchant_name(c, rng.randrange(MERCHANTS_PER_CATEGORY))} 안암{i}호점"
+        stores.append((name, CATEGORIES[c]))
+    return stores
+
+
+def _p99(benchmark) -> float:
+    data = sorted(benchmark.stats.stats.data)
+    return data[min(len(data) - 1, int(len(data) * 0.99))]
+
+
+@pytest.fixture
+def check_budget():
+    """
+    처리량/p99를 extra_info에 기록하고 p99 예산 초과 시 실패
+
+    Args:
+        benchmark: pytest-benchmark fixture (측정 완료 후)
+        name: BENCHMARK_P99_BUDGET_US 키
+        ops: 1회 호출당 처리 건수 (뷰포트 100개 등)
+    """
+    def check(benchmark, name: str, ops: int = 1):
+        if benchmark.stats is None:
+            # --benchmark-disable 로 실행된 경우 (정상 동작 확인만)
+            return
+        p99 = _p99(benchmark)
+        mean = benchmark.stats.stats.mean
+        benchmark.extra_info['p99_us'] = round(p99 * 1e6, 2)
+        benchmark.extra_info['throughput_ops_per_sec'] = round(ops / mean) if mean else None
+
+        budget_us = BENCHMARK_P99_BUDGET_US[name] * BUDGET_SCALE
+        assert p99 * 1e6 <= budget_us, (
+            f"{name}: p99 {p99 * 1e6:.1f}us > budget {budget_us:.0f}us"
+        )
+    return check
@@ -0,0 +1,89 @@
+"""
+혜택 추천 핫패스 마이크로 벤치마크
+
+실행 (backend 디렉토리에서):
+    pytest benchmarks/ --benchmark-autosave
+    pytest benchmarks/ --benchmark-compare --benchmark-compare-fail=mean:15%
+"""
+import pytest
+
+from services.benefit_engine import CardState
+from services.benefit_lookup_service import format_benefit
+
+
+def test_get_recommendations(benchmark, check_budget, benefit_service, user_cards_by_count, card_count, synthetic_merchant):
+    user_cards = list(user_cards_by_count[card_count])
+    name, category = synthetic_merchant(3, 17)
+    result = benchmark(benefit_service.get_recommendations, f"{name} 고대점", category, user_cards)
+    assert all(rec['card'] in user_cards for rec in result)
+    check_budget(benchmark, 'get_recommendations')
+
+
+def test_get_top_card_for_merchant(benchmark, check_budget, benefit_service, user_cards_by_count, card_count, synthetic_merchant):
+    user_cards = user_cards_by_count[card_count]
+    name, category = synthetic_merchant(5, 400)
+    benchmark(benefit_service.get_top_card_for_merchant, name, category, user_cards)
+    check_budget(benchmark, 'get_top_card_for_merchant')
+
+
+def test_viewport_top_card_loop(benchmark, check_budget, benefit_service, user_cards_by_count, viewport, card_count):
+    """nearby_recommendations 이전 방식: 매장마다 get_top_card_for_merchant"""
+    user_cards = user_cards_by_count[card_count]
+
+    def run():
+        return [benefit_service.get_top_card_for_merchant(name, category, user_cards) for name, category in viewport]
+
+    result = benchmark(run)
+    assert len(result) == len(viewport)
+    check_budget(benchmark, 'viewport_top_card_loop', ops=len(viewport))
+
+
+def test_viewport_top_cards_batch(benchmark, check_budget, benefit_service, user_cards_by_count, viewport, card_count):
+    user_cards = user_cards_by_count[card_count]
+    result = benchmark(benefit_service.get_top_cards_batch, viewport, user_cards)
+    assert result == [benefit_service.get_top_card_for_merchant(n, c, user_cards) for n, c in viewport]
+    check_budget(benchmark, 'viewport_top_cards_batch', ops=len(viewport))
+
+
+def test_format_benefit_viewport(benchmark, check_budget, benefit_service, user_cards_by_count, viewport):
+    top_cards = [top for top in benefit_service.get_top_cards_batch(viewport, user_cards_by_count[20]) if top]
+
+    def run():
+        return [format_benefit(top) for top in top_cards]
+
+    benchmark(run)
+    check_budget(benchmark, 'format_benefit_viewport', ops=len(top_cards))
+
+
+def test_admin_calculate_benefit_cached(benchmark, check_budget, admin_calculator, card_benefit_rows):
+    """QR 스캔: 같은 (카드, 카테고리, 가맹점) 반복 → 버전 확인 주기 안, LRU 적중"""
+    calculate, _ = admin_calculator
+    row = card_benefit_rows[0]
+    result = benchmark(calculate, row['card_name'], row['category'], '브랜드0000001 고대점', 15000)
+    assert result['discount_type'] != 'error'
+    check_budget(benchmark, 'admin_calculate_benefit_cached')
+
+
+def test_admin_calculate_benefit_uncached(benchmark, check_budget, admin_calculator, card_benefit_rows, viewport):
+    """LRU 미적중 경로: 가맹점 브랜드 매칭 + 규칙 결정"""
+    calculate, get_rule_set = admin_calculator
+    scans = [
+        (row['card_name'], category, name)
+        for row, (name, category) in zip(card_benefit_rows, viewport)
+    ]
+
+    def run():
+        get_rule_set().resolve.cache_clear()
+        return [calculate(card, category, name, 15000) for card, category, name in scans]
+
+    results = benchmark(run)
+    assert all(result['discount_type'] != 'error' for result in results)
+    check_budget(benchmark, 'admin_calculate_benefit_uncached', ops=len(scans))
+
+
+def test_engine_rank(benchmark, check_budget, benefit_service, user_cards_by_count, card_count, synthetic_merchant):
+    """POST /api/benefits/evaluate: 전월실적 티어 + 한도 반영 순위"""
+    states = {card: CardState(previous_month_performance=500000, daily_count=0) for card in user_cards_by_count[card_count]}
+    name, category = synthetic_merchant(2, 10)
+    benchmark(benefit_service.engine.rank, f"{name} 본점", category, 20000, states)
+    check_budget(benchmark, 'engine_rank')
@@ -0,0 +1,33 @@
+"""
+혜택 스냅샷 생성
+
+benefits_db.json + ai/card_benefits.csv + ai/cards.json → benefits_snapshot.msgpack
+
+실행 중인 서버는 감시 스레드가 파일 교체를 감지해 재시작 없이 새 데이터로 전환한다.
+
+사용법:
+    python scripts/build_benefit_snapshot.py [--out PATH]
+"""
+import argparse
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..'))
+
+from services.benefit_snapshot import (
+    build_snapshot, snapshot_path_from_env,
+    DEFAULT_BENEFITS_DB_PATH, DEFAULT_CARD_BENEFITS_PATH, DEFAULT_CARDS_PATH
+)
+
+parser = argparse.ArgumentParser(description='혜택 스냅샷 생성')
+parser.add_argument('--out', default=snapshot_path_from_env())
+parser.add_argument('--benefits-db', default=DEFAULT_BENEFITS_DB_PATH)
+parser.add_argument('--card-benefits', default=DEFAULT_CARD_BENEFITS_PATH)
+parser.add_argument('--cards', default=DEFAULT_CARDS_PATH)
+args = parser.parse_args()
+
+result = build_snapshot(args.out, args.benefits_db, args.card_benefits, args.cards)
+size_kb = os.path.getsize(result['path']) / 1024
+print(f"[Snapshot] 생성 완료: {result['path']} ({size_kb:.1f} KB)")
+print(f"[Snapshot] 버전: {result['version']} ({result['created_at']})")
@@ -0,0 +1,34 @@
+"""
+경로 캐시(route_cache) 유지보수
+
+서버의 유지보수 스레드와 같은 작업을 수동으로 실행한다 (대량 정리, 배포 후 점검 등).
+
+사용법:
+    python scripts/route_cache_maintenance.py stats
+    python scripts/route_cache_maintenance.py clear-expired [--batch-size N]
+"""
+import argparse
+import json
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..'))
+
+from services.route_cache import RouteCacheService
+
+parser = argparse.ArgumentParser(description='경로 캐시 유지보수')
+subparsers = parser.add_subparsers(dest='command', required=True)
+subparsers.add_parser('stats', help='모드별 건수/적중 횟수')
+clear_parser = subparsers.add_parser('clear-expired', help=f'{RouteCacheService.CACHE_EXPIRY_DAYS}일 지난 캐시 일괄 삭제')
+clear_parser.add_argument('--batch-size', type=int, default=RouteCacheService.EXPIRY_DELETE_BATCH)
+args = parser.parse_args()
+
+if args.command == 'stats':
+    stats = RouteCacheService.get_cache_stats()
+    stats.pop('memory', None)  # 이 프로세스의 메모리 캐시는 의미 없음
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+    sys.exit(1 if 'error' in stats else 0)
+
+deleted = RouteCacheService.clear_expired_cache(batch_size=args.batch_size)
+print(f"[RouteCache] 만료 캐시 {deleted}건 삭제")
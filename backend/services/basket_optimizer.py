@@ -0,0 +1,214 @@
+"""
+코스 전체 카드 배정 최적화 (바스켓 옵티마이저)
+
+카페 → 식당 → 영화처럼 여러 곳에서 결제할 때, 장소마다 최고 혜택 카드를 독립적으로 고르면
+일 1회 / 월 N회 / 월 할인 한도가 서로 간섭한다 (1번 장소에서 쓴 편의점 1일 1회 할인은 3번 장소에서 사라짐).
+BenefitEngine으로 결제 순서대로 카드 상태를 갱신하며 총 할인액이 최대가 되는 배정을 찾는다.
+
+- 작은 입력: 분기 한정(branch and bound)으로 정확한 최적해
+- 큰 입력: 할인액이 큰 결제부터 탐욕 배정 + 상한(upper_bound) 함께 반환
+
+카드를 쓸수록 횟수/한도가 줄어들 뿐 할인이 늘지는 않으므로(전월실적 티어는 코스 중 고정),
+현재 상태에서 각 결제를 독립적으로 계산한 최고 할인의 합이 남은 결제의 상한이 된다.
+"""
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .benefit_engine import BenefitEngine, CardState
+
+# 정확 탐색을 시도할 최대 탐색 공간 (결제별 후보 카드 수의 곱)
+EXACT_SEARCH_LIMIT = 20000
+
+
+class PlannedPurchase(NamedTuple):
+    """코스 중 예정된 결제 1건"""
+    merchant_name: Optional[str]
+    category: str
+    amount: int
+
+
+class _Option(NamedTuple):
+    discount: int
+    card: Optional[str]
+    rule: Optional[int]
+
+
+class BasketOptimizer:
+    """
+    사용법:
+        optimizer = BasketOptimizer(benefit_service.engine)
+        plan = optimizer.optimize(
+            [PlannedPurchase('스타벅스 잠실점', 'cafe', 12000), PlannedPurchase('CU 잠실점', 'convenience', 5000)],
+            {'신한카드 Mr.Life': CardState(), ...}
+        )
+    """
+
+    def __init__(self, engine: BenefitEngine, exact_search_limit: int = EXACT_SEARCH_LIMIT):
+        self.engine = engine
+        self.exact_search_limit = exact_search_limit
+
+    def optimize(
+        self,
+        purchases: Sequence[PlannedPurchase],
+        card_states: Mapping[str, CardState]
+    ) -> Dict[str, Any]:
+        """
+        총 예상 할인액이 최대가 되는 결제별 카드 배정
+
+        Args:
+            purchases: 결제 순서대로의 예정 결제 목록
+            card_states: {card_name: CardState} - 사용자가 보유한 카드
+
+        Returns:
+            {
+                'assignments': [{'index', 'merchant_name', 'category', 'amount', 'card', 'expected_discount', ...}],
+                'total_discount': 배정 결과 총 할인액,
+                'upper_bound': 장소별 독립 선택 시 할인액 합 (배정 결과의 상한),
+                'method': 'exact' | 'greedy'
+            }
+        """
+        purchases = [PlannedPurchase(*p) for p in purchases]
+        states = {card: state or CardState() for card, state in card_states.items()}
+        candidates = [self.engine.candidate_rules(p.merchant_name, p.category) for p in purchases]
+        consumed = np.zeros(len(self.engine.rules))
+
+        initial_options = [self._options(p, cands, states, consumed) for p, cands in zip(purchases, candidates)]
+        best_alone = [options[0].discount for options in initial_options]
+
+        search_space = 1
+        for options in initial_options:
+            search_space *= len(options)
+
+        if search_space <= self.exact_search_limit:
+            choices = self._branch_and_bound(purchases, candidates, states, consumed, best_alone)
+            method = 'exact'
+        else:
+            choices = self._greedy(purchases, candidates, states, consumed, best_alone)
+            method = 'greedy'
+
+        assignments = []
+        for index, (purchase, option) in enumerate(zip(purchases, choices)):
+            rule = self.engine.rules[option.rule] if option.rule is not None else {}
+            assignments.append({
+                'index': index,
+                'merchant_name': purchase.merchant_name,
+                'category': purchase.category,
+                'amount': purchase.amount,
+                'card': option.card,
+                'expected_discount': option.discount,
+                'discount_display': rule.get('discount_display'),
+                'limit_display': rule.get('limit_display'),
+            })
+
+        return {
+            'assignments': assignments,
+            'total_discount': sum(option.discount for option in choices),
+            'upper_bound': sum(best_alone),
+            'method': method,
+        }
+
+    def _options(
+        self,
+        purchase: PlannedPurchase,
+        candidates: np.ndarray,
+        states: Mapping[str, CardState],
+        consumed: np.ndarray
+    ) -> List[_Option]:
+        """
+        현재 상태에서 이 결제에 쓸 수 있는 선택지 (할인액 내림차순)
+
+        할인이 0인 카드는 상태만 소모하므로 '혜택 카드 없음'(card=None) 하나로 대표한다.
+        """
+        options = []
+        if len(candidates):
+            discounts = self.engine.evaluate(purchase.amount, states, consumed)[candidates]
+            best = {}
+            for rule_idx, discount in zip(candidates.tolist(), discounts.tolist()):
+                card = self.engine.rules[rule_idx]['card']
+                if discount > 0 and card in states and discount > best.get(card, (0, None))[0]:
+                    best[card] = (discount, rule_idx)
+            options = [_Option(int(discount), card, rule_idx) for card, (discount, rule_idx) in best.items()]
+            options.sort(key=lambda option: -option.discount)
+        options.append(_Option(0, None, None))
+        return options
+
+    @staticmethod
+    def _apply(
+        purchase: PlannedPurchase,
+        option: _Option,
+        states: Dict[str, CardState],
+        consumed: np.ndarray
+    ):
+        """선택한 카드로 결제했을 때의 다음 상태 (원본은 수정하지 않음)"""
+        if option.card is None:
+            return states, consumed
+        state = states[option.card]
+        next_states = dict(states)
+        next_states[option.card] = state._replace(
+            daily_count=state.daily_count + 1,
+            monthly_count=state.monthly_count + 1,
+            used_amount=state.used_amount + purchase.amount - option.discount,
+        )
+        next_consumed = consumed.copy()
+        next_consumed[option.rule] += option.discount
+        return next_states, next_consumed
+
+    def _branch_and_bound(self, purchases, candidates, states, consumed, best_alone) -> List[_Option]:
+        n = len(purchases)
+        # remaining_bound[i]: i번째 이후 결제에서 받을 수 있는 할인액 상한
+        remaining_bound = [0] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            remaining_bound[i] = remaining_bound[i + 1] + best_alone[i]
+
+        best_total = -1
+        best_choices: List[_Option] = []
+        path: List[_Option] = []
+
+        def search(i: int, total: int, cur_states, cur_consumed):
+            nonlocal best_total, best_choices
+            if i == n:
+                if total > best_total:
+                    best_total, best_choices = total, list(path)
+                return
+            if total + remaining_bound[i] <= best_total:
+                return
+            for option in self._options(purchases[i], candidates[i], cur_states, cur_consumed):
+                if total + option.discount + remaining_bound[i + 1] <= best_total:
+                    # 선택지는 할인액 내림차순이므로 이후 선택지도 가지치기 대상
+                    break
+                next_states, next_consumed = self._apply(purchases[i], option, cur_states, cur_consumed)
+                path.append(option)
+                search(i + 1, total + option.discount, next_states, next_consumed)
+                path.pop()
+
+        search(0, 0, states, consumed)
+        return best_choices
+
+    def _greedy(self, purchases, candidates, states, consumed, best_alone) -> List[_Option]:
+        """할인 여지가 큰 결제부터 현재 상태의 최고 카드 배정"""
+        choices: List[Optional[_Option]] = [None] * len(purchases)
+        for i in sorted(range(len(purchases)), key=lambda i: -best_alone[i]):
+            option = self._options(purchases[i], candidates[i], states, consumed)[0]
+            states, consumed = self._apply(purchases[i], option, states, consumed)
+            choices[i] = option
+        return choices
+
+
+def purchases_from_stops(stops: Sequence[Mapping[str, Any]], budget: int) -> List[PlannedPurchase]:
+    """
+    코스 장소 목록 → 예정 결제 목록
+
+    장소에 estimated_amount가 없으면 예산을 장소 수로 균등 분배한다.
+    """
+    if not stops:
+        return []
+    default_amount = int(budget or 0) // len(stops)
+    return [
+        PlannedPurchase(
+            stop.get('name'),
+            stop.get('category') or 'default',
+            int(stop.get('estimated_amount') or default_amount)
+        )
+        for stop in stops
+    ]
@@ -0,0 +1,396 @@
+"""
+카드 혜택 평가 엔진 (전월실적 티어 + 사용 한도 반영)
+
+CardBenefit 규칙(card_benefits.csv / card_benefit 테이블)을 BenefitRuleSet으로 한 번만 파싱하고
+pre_month_config, limit_config를 NumPy 배열로 만들어 두고,
+사용자 카드 상태(전월실적, MyCard.daily_count, monthly_count, used_amount)와
+결제 예상 금액으로 모든 (카드, 혜택) 쌍의 실제 예상 할인액(원)을 한 번에 계산한다.
+
+전월실적을 모르면(None) 최저 티어를 충족한 것으로 보고 계산한다. 카드를 추천에서 제외하는 것은
+횟수/이용금액 한도를 실제로 다 쓴 경우뿐이다 (available, unavailable_cards).
+"""
+from collections.abc import Mapping
+from datetime import date
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+from cardealo_benefits.benefit_rules import COUNT_LIMIT_THRESHOLD, BenefitRuleSet, to_number
+
+# per_unit(리터당 할인) 환산용 기준 유가 (원/L)
+FUEL_PRICE_PER_LITER = 1700
+
+# 포인트/마일리지 1점의 원화 가치
+POINT_VALUE = 1.0
+
+# 결제 금액을 모르는 화면(지도 핀, 가맹점 추천)에서 할인액을 계산할 카테고리별 1회 결제 기준 금액 (원)
+TYPICAL_PAYMENT_AMOUNTS = {
+    'convenience': 8000,
+    'cafe': 6000,
+    'restaurant': 15000,
+    'mart': 50000,
+    'gas_station': 60000,
+    'cinema': 15000,
+    'theme_park': 50000,
+    'hospital': 20000,
+    'health_beauty': 20000,
+    'department_store': 100000,
+    'outlet': 80000,
+    'laundry': 10000,
+    'beauty': 30000,
+    'auto_service': 50000,
+    'parking': 5000,
+}
+DEFAULT_PAYMENT_AMOUNT = 10000
+
+DISCOUNT_PERCENT, DISCOUNT_AMOUNT, DISCOUNT_POINT, DISCOUNT_PER_UNIT = range(4)
+DISCOUNT_TYPE_CODES = {
+    'percent': DISCOUNT_PERCENT,
+    'amount': DISCOUNT_AMOUNT,
+    'point': DISCOUNT_POINT,
+    'per_unit': DISCOUNT_PER_UNIT,
+}
+
+
+def typical_amount(category: str) -> int:
+    """카테고리의 1회 결제 기준 금액"""
+    return TYPICAL_PAYMENT_AMOUNTS.get(category, DEFAULT_PAYMENT_AMOUNT)
+
+
+class CardState(NamedTuple):
+    """MyCard의 혜택 계산용 상태 (previous_month_performance=None: 전월실적 모름)"""
+    previous_month_performance: Optional[int] = None
+    daily_count: int = 0
+    monthly_count: int = 0
+    used_amount: int = 0
+
+    @classmethod
+    def from_mycard(cls, card, today: Optional[date] = None) -> 'CardState':
+        """
+        MyCard → CardState
+
+        카운터는 결제 시점에만 리셋되므로, 날짜/월이 바뀐 뒤 아직 결제가 없으면 0으로 간주.
+        MyCard.monthly_performance는 이번 달 앱 결제 합계일 뿐 전월실적이 아니므로 전월실적은 모름(None)
+        """
+        today = today or date.today()
+        daily_count = card.daily_count or 0
+        if card.last_used_date != today:
+            daily_count = 0
+
+        reset_date = card.reset_date
+        if reset_date is None or (reset_date.year, reset_date.month) != (today.year, today.month):
+            return cls(daily_count=daily_count)
+
+        return cls(
+            daily_count=daily_count,
+            monthly_count=card.monthly_count or 0,
+            used_amount=card.used_amount or 0,
+        )
+
+
+class BenefitEngine:
+    """
+    혜택 규칙 배열 + 벡터화 평가
+
+    사용법:
+        engine = BenefitEngine.from_csv(card_benefits_path)
+        ranked = engine.rank('GS25 고대점', 'convenience', 8000, {'신한카드 Mr.Life': CardState(...)})
+    """
+
+    def __init__(self, rules: Iterable[Any]):
+        self.rule_set = rules if isinstance(rules, BenefitRuleSet) else BenefitRuleSet(rules)
+        parsed = self.rule_set.rules
+        n = len(parsed)
+        self.rules: List[Dict[str, Any]] = []
+
+        self.cards: List[str] = []
+        self.card_index: Dict[str, int] = {}
+        rule_card = np.zeros(n, dtype=np.int64)
+
+        self.type_code = np.zeros(n, dtype=np.int8)
+        self.value = np.zeros(n)
+        self.per_tx_cap = np.full(n, np.inf)
+        self.required = np.zeros(n, dtype=bool)
+
+        tier_lists = []
+
+        self.daily_count_limit = np.full(n, np.inf)
+        self.monthly_count_limit = np.full(n, np.inf)
+        self.monthly_cap = np.full(n, np.inf)
+        self.per_tx_amount_limit = np.full(n, np.inf)
+        self.daily_amount_limit = np.full(n, np.inf)
+        self.monthly_spend_limit = np.full(n, np.inf)
+        self.min_amount = np.zeros(n)
+
+        category_rules: Dict[str, List[int]] = {}
+        self.rule_places: List[frozenset] = []
+
+        for i, rule in enumerate(parsed):
+            if rule.card not in self.card_index:
+                self.card_index[rule.card] = len(self.cards)
+                self.cards.append(rule.card)
+            rule_card[i] = self.card_index[rule.card]
+            category_rules.setdefault(rule.category, []).append(i)
+            self.rule_places.append(rule.brands)
+
+            self.type_code[i] = DISCOUNT_TYPE_CODES.get(rule.discount_type, -1)
+            self.value[i] = rule.discount_value
+            self.per_tx_cap[i] = rule.max_discount if rule.max_discount else np.inf
+
+            pre_month = rule.pre_month_config
+            self.required[i] = bool(pre_month.get('required'))
+            tier_lists.append(sorted(
+                (
+                    (to_number(t.get('threshold'), 0), to_number(t.get('discount_value'), self.value[i]),
+                     to_number(t.get('max_discount'), np.inf))
+                    for t in pre_month.get('tiers') or []
+                ),
+                key=lambda t: t[0]
+            ))
+
+            limits = rule.limit_config
+            self.daily_count_limit[i] = to_number(limits.get('daily_limit'), np.inf)
+            monthly_limit = to_number(limits.get('monthly_limit'), np.inf)
+            if monthly_limit < COUNT_LIMIT_THRESHOLD:
+                self.monthly_count_limit[i] = monthly_limit
+            else:
+                self.monthly_cap[i] = monthly_limit
+            self.per_tx_amount_limit[i] = to_number(limits.get('per_transaction_limit'), np.inf)
+            self.daily_amount_limit[i] = to_number(limits.get('daily_limit_amount'), np.inf)
+            self.monthly_spend_limit[i] = to_number(limits.get('monthly_transaction_limit'), np.inf)
+            self.min_amount[i] = to_number(limits.get('min_amount'), 0)
+
+            self.rules.append({
+                'card': rule.card,
+                'category': rule.category,
+                'discount_type': rule.discount_type,
+                'discount_value': rule.discount_value,
+                'places_display': rule.places_display,
+                'discount_display': rule.discount_display,
+                'limit_display': rule.limit_display,
+                'max_discount_display': rule.max_discount_display,
+            })
+
+        self.rule_card = rule_card
+
+        # 티어는 (규칙 수 × 최대 티어 수) 배열로 패딩 (없는 칸은 threshold=inf로 절대 충족 불가)
+        max_tiers = max((len(tiers) for tiers in tier_lists), default=0)
+        self.tier_threshold = np.full((n, max_tiers), np.inf)
+        self.tier_value = np.zeros((n, max_tiers))
+        self.tier_cap = np.full((n, max_tiers), np.inf)
+        for i, tiers in enumerate(tier_lists):
+            for j, (threshold, value, cap) in enumerate(tiers):
+                self.tier_threshold[i, j] = threshold
+                self.tier_value[i, j] = value
+                self.tier_cap[i, j] = cap
+        self.has_tiers = np.array([bool(tiers) for tiers in tier_lists], dtype=bool)
+
+        self.category_rules = {
+            category: np.array(indices, dtype=np.int64)
+            for category, indices in category_rules.items()
+        }
+        self.matchers = self.rule_set.matchers
+
+    @classmethod
+    def from_csv(cls, path: str) -> 'BenefitEngine':
+        return cls(BenefitRuleSet.from_csv(path))
+
+    def _state_arrays(self, card_states: Mapping):
+        """카드별 상태 → 규칙 순서로 정렬된 배열 (보유하지 않은 카드는 owned=False)"""
+        c = len(self.cards)
+        owned = np.zeros(c, dtype=bool)
+        perf = np.full(c, np.nan)
+        daily = np.zeros(c)
+        monthly = np.zeros(c)
+        used = np.zeros(c)
+        for card_name, state in card_states.items():
+            idx = self.card_index.get(card_name)
+            if idx is None:
+                continue
+            state = state or CardState()
+            owned[idx] = True
+            if state.previous_month_performance is not None:
+                perf[idx] = state.previous_month_performance
+            daily[idx] = state.daily_count
+            monthly[idx] = state.monthly_count
+            used[idx] = state.used_amount
+        rc = self.rule_card
+        perf = perf[rc]
+        # 전월실적을 모르면 최저 티어 충족으로 간주 (티어가 없는 규칙은 값과 무관)
+        unknown = np.isnan(perf)
+        if unknown.any():
+            lowest = self.tier_threshold[:, 0] if self.tier_threshold.shape[1] else np.zeros(len(rc))
+            perf = np.where(unknown, np.where(self.has_tiers, lowest, 0), perf)
+        return owned[rc], perf, daily[rc], monthly[rc], used[rc]
+
+    def evaluate(
+        self,
+        amount: float,
+        card_states: Mapping,
+        consumed: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        모든 규칙의 예상 할인액(원) 계산
+
+        Args:
+            amount: 결제 예상 금액
+            card_states: {card_name: CardState} - 사용자가 보유한 카드만
+            consumed: 규칙별로 이미 받은 할인액 (월 할인 한도에서 차감, 코스 카드 배정용)
+
+        Returns:
+            규칙 순서의 할인액 배열 (미보유 카드/조건 미충족은 0)
+        """
+        n = len(self.rules)
+        if n == 0:
+            return np.zeros(0)
+        owned, perf, daily, monthly, used = self._state_arrays(card_states)
+
+        # 전월실적 티어: 충족한 가장 높은 티어 선택
+        value = self.value
+        monthly_cap = self.monthly_cap
+        tier_ok = np.ones(n, dtype=bool)
+        if self.tier_threshold.shape[1]:
+            tier_pos = (self.tier_threshold <= perf[:, None]).sum(axis=1) - 1
+            tier_ok = ~self.has_tiers | (tier_pos >= 0)
+            pick = np.clip(tier_pos, 0, None)
+            rows = np.arange(n)
+            use_tier = self.has_tiers & (tier_pos >= 0)
+            value = np.where(use_tier, self.tier_value[rows, pick], value)
+            monthly_cap = np.where(use_tier, np.minimum(self.tier_cap[rows, pick], monthly_cap), monthly_cap)
+        eligible = ~self.required | tier_ok
+
+        # 할인 대상 금액 (건당/일/월 이용금액 한도, 최소 결제금액)
+        base = np.minimum.reduce([
+            np.full(n, float(amount)),
+            self.per_tx_amount_limit,
+            self.daily_amount_limit,
+            np.maximum(self.monthly_spend_limit - used, 0),
+        ])
+        base = np.where(amount >= self.min_amount, base, 0)
+
+        code = self.type_code
+        raw = np.select(
+            [code == DISCOUNT_PERCENT, code == DISCOUNT_AMOUNT, code == DISCOUNT_POINT, code == DISCOUNT_PER_UNIT],
+            [base * value / 100, np.where(base > 0, value, 0), base * value / 100 * POINT_VALUE,
+             base / FUEL_PRICE_PER_LITER * value],
+            default=0,
+        )
+        if consumed is not None:
+            monthly_cap = np.maximum(monthly_cap - consumed, 0)
+        raw = np.minimum.reduce([raw, self.per_tx_cap, monthly_cap])
+
+        # 횟수 한도 소진 여부
+        count_ok = (daily < self.daily_count_limit) & (monthly < self.monthly_count_limit)
+
+        return np.floor(np.where(owned & eligible & count_ok, raw, 0))
+
+    def available(self, card_states: Mapping) -> np.ndarray:
+        """
+        결제 금액과 무관하게 현재 사용 가능한 규칙 여부 (보유 + 일/월 횟수, 월 이용금액 한도 남음)
+
+        전월실적은 보지 않음 - 앱은 전월실적을 알지 못하므로 실적 미달로 카드를 제외하지 않는다
+        """
+        n = len(self.rules)
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+        owned, _, daily, monthly, used = self._state_arrays(card_states)
+        count_ok = (daily < self.daily_count_limit) & (monthly < self.monthly_count_limit)
+        spend_ok = used < self.monthly_spend_limit
+        return owned & count_ok & spend_ok
+
+    def unavailable_cards(self, card_states: Mapping) -> Dict[str, frozenset]:
+        """
+        카테고리별로 혜택을 받을 수 없는 보유 카드
+
+        카테고리에 규칙이 있는 보유 카드 중 모든 규칙의 횟수/이용금액 한도를 다 쓴 카드
+        """
+        if not card_states:
+            return {}
+        available = self.available(card_states)
+        result = {}
+        for category, indices in self.category_rules.items():
+            owned_cards = {self.rules[i]['card'] for i in indices.tolist() if self.rules[i]['card'] in card_states}
+            if not owned_cards:
+                continue
+            usable = {self.rules[i]['card'] for i in indices[available[indices]].tolist()}
+            blocked = owned_cards - usable
+            if blocked:
+                result[category] = frozenset(blocked)
+        return result
+
+    def candidate_rules(
+        self,
+        merchant_name: Optional[str],
+        category: str,
+        brands: Optional[frozenset] = None
+    ) -> np.ndarray:
+        """가맹점에 적용 가능한 규칙 인덱스 (places 제한 없는 규칙 + 브랜드 일치 규칙)"""
+        indices = self.category_rules.get(category)
+        if indices is None:
+            return np.zeros(0, dtype=np.int64)
+        if brands is None:
+            brands = self.rule_set.merchant_brands(merchant_name, category)
+        mask = np.fromiter(
+            (not self.rule_places[i] or bool(self.rule_places[i] & brands) for i in indices),
+            dtype=bool, count=len(indices)
+        )
+        return indices[mask]
+
+    def card_savings(
+        self,
+        merchant_name: Optional[str],
+        category: str,
+        discounts: np.ndarray,
+        brands: Optional[frozenset] = None
+    ) -> Dict[str, int]:
+        """
+        evaluate() 결과에서 가맹점에 적용되는 규칙만 골라 카드별 최고 할인액
+
+        같은 금액의 evaluate() 결과를 여러 가맹점이 함께 쓸 수 있도록 평가와 분리되어 있다.
+        brands: merchant_brands()로 미리 구한 브랜드 (배치 조회에서 중복 매칭 방지)
+        """
+        savings: Dict[str, int] = {}
+        candidates = self.candidate_rules(merchant_name, category, brands)
+        for rule_idx, value in zip(candidates.tolist(), discounts[candidates].tolist()):
+            card = self.rules[rule_idx]['card']
+            if value > savings.get(card, -1):
+                savings[card] = int(value)
+        return savings
+
+    def rank(
+        self,
+        merchant_name: Optional[str],
+        category: str,
+        amount: float,
+        card_states: Mapping
+    ) -> List[Dict[str, Any]]:
+        """
+        가맹점에서 보유 카드별 최고 예상 할인액 순위
+
+        Returns:
+            [{'rank', 'card', 'expected_discount', 'discount_display', ...}] (할인액 내림차순)
+        """
+        candidates = self.candidate_rules(merchant_name, category)
+        if len(candidates) == 0:
+            return []
+        discounts = self.evaluate(amount, card_states)[candidates]
+
+        # 할인액 내림차순, 카드별 최고 규칙 1개만
+        order = candidates[np.argsort(-discounts, kind='stable')]
+        discount_by_rule = dict(zip(candidates.tolist(), discounts.tolist()))
+        ranked = []
+        seen = set()
+        for rule_idx in order.tolist():
+            rule = self.rules[rule_idx]
+            if rule['card'] in seen or rule['card'] not in card_states:
+                continue
+            seen.add(rule['card'])
+            ranked.append({
+                'rank': len(ranked) + 1,
+                'card': rule['card'],
+                'expected_discount': int(discount_by_rule[rule_idx]),
+                'discount_type': rule['discount_type'],
+                'discount_display': rule['discount_display'],
+                'limit_display': rule['limit_display'],
+                'max_discount_display': rule['max_discount_display'],
+            })
+        return ranked
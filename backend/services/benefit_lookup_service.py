@@ -1,24 +1,395 @@
 import json
 import os
-from typing import List, Dict, Optional
+import threading
+import time
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, List, Dict, Optional, Iterable, Tuple
+
+from cardealo_benefits.merchant_matcher import MerchantMatcher
+
+from .benefit_engine import BenefitEngine, CardState, typical_amount
+from .benefit_snapshot import load_snapshot, snapshot_path_from_env
+
+
+class BenefitRecord(Mapping):
+    """
+    benefits_db.json 혜택 항목 1건 (불변)
+
+    로드 시 한 번만 생성되고 모든 요청이 같은 객체를 공유한다.
+    dict처럼 benefit['card'], benefit.get('point_rate')로 읽을 수 있지만 수정은 불가.
+    """
+
+    FIELDS = (
+        'card', 'score', 'discount_rate', 'discount_amount',
+        'point_rate', 'monthly_limit', 'pre_month_money',
+    )
+
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, data: Dict[str, Any]):
+        for field in self.FIELDS:
+            object.__setattr__(self, field, data.get(field, 0))
+        object.__setattr__(self, 'extra', MappingProxyType({
+            key: value for key, value in data.items() if key not in self.FIELDS
+        }))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"BenefitRecord is immutable (tried to set '{name}')")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"BenefitRecord is immutable (tried to delete '{name}')")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.FIELDS:
+            return getattr(self, key)
+        return self.extra[key]
+
+    def __iter__(self):
+        yield from self.FIELDS
+        yield from self.extra
+
+    def __len__(self) -> int:
+        return len(self.FIELDS) + len(self.extra)
+
+    def __repr__(self) -> str:
+        return f"<BenefitRecord {self.card} score={self.score}>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self)
+
+
+class RankedBenefit(Mapping):
+    """
+    추천 결과 뷰: 공유 BenefitRecord 참조 + 순위 (+ 카드 상태로 계산한 예상 할인액)
+
+    레코드를 복사하거나 수정하지 않으므로 동시 요청 간 경합이 없다.
+    expected_discount는 카드 상태를 넘긴 조회에서만 채워지며, 없으면 키도 노출하지 않는다.
+    """
+
+    __slots__ = ('record', 'rank', 'expected_discount')
+
+    def __init__(self, record: BenefitRecord, rank: int, expected_discount: Optional[int] = None):
+        object.__setattr__(self, 'record', record)
+        object.__setattr__(self, 'rank', rank)
+        object.__setattr__(self, 'expected_discount', expected_discount)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"RankedBenefit is immutable (tried to set '{name}')")
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'rank':
+            return self.rank
+        if key == 'expected_discount' and self.expected_discount is not None:
+            return self.expected_discount
+        return self.record[key]
+
+    def __iter__(self):
+        yield 'rank'
+        if self.expected_discount is not None:
+            yield 'expected_discount'
+        yield from self.record
+
+    def __len__(self) -> int:
+        return len(self.record) + (1 if self.expected_discount is None else 2)
+
+    def __repr__(self) -> str:
+        return f"<RankedBenefit #{self.rank} {self.record.card} score={self.record.score}>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self)
+
+
+class _BenefitIndex:
+    """
+    benefits_db.json을 한 번만 컴파일한 조회용 인덱스 (불변 스냅샷)
+
+    merchants: category → merchant → score 내림차순으로 정렬된 BenefitRecord 튜플
+    best_pos:  category → merchant → card → merchants 목록에서 해당 카드의 첫 위치
+    top_views: category → merchant → merchants 목록과 같은 순서의 1위 뷰 (조회 시 할당 없음)
+    matchers:  category → 가맹점 키 Aho-Corasick 매처 ("GS25 고대점" → "GS25")
+    engine:    같은 버전의 card_benefits 규칙으로 만든 BenefitEngine (인덱스와 함께 교체)
+    source:    로드한 원본 파일들의 mtime (변경 감지용)
+    """
+
+    __slots__ = (
+        'raw', 'merchants', 'best_pos', 'top_views', 'matchers',
+        'engine', 'version', 'source',
+    )
+
+    def __init__(
+        self,
+        raw: Dict,
+        engine: Optional[BenefitEngine] = None,
+        version: str = '',
+        source: Tuple = ()
+    ):
+        self.raw = raw
+        self.engine = engine
+        self.version = version
+        self.source = source
+        self.merchants = {}
+        self.best_pos = {}
+        self.top_views = {}
+        self.matchers = {}
+
+        for category, category_data in raw.items():
+            merchant_lists = {}
+            merchant_pos = {}
+            merchant_tops = {}
+            for merchant, benefits in category_data.items():
+                ranked = tuple(sorted(
+                    (BenefitRecord(benefit) for benefit in benefits),
+                    key=lambda x: x.score,
+                    reverse=True
+                ))
+                positions = {}
+                for pos, record in enumerate(ranked):
+                    positions.setdefault(record.card, pos)
+                merchant_lists[merchant] = ranked
+                merchant_pos[merchant] = positions
+                merchant_tops[merchant] = tuple(RankedBenefit(record, 1) for record in ranked)
+            self.merchants[category] = merchant_lists
+            self.best_pos[category] = merchant_pos
+            self.top_views[category] = merchant_tops
+            self.matchers[category] = MerchantMatcher(
+                merchant for merchant in category_data if merchant != 'default'
+            )
+
+    def resolve_merchant(self, merchant_name: Optional[str], category: str) -> Optional[str]:
+        """
+        가맹점 키 결정
+
+        1. 정확히 일치하는 키
+        2. 지점명이 포함된 이름에서 브랜드 추출 ("홈플러스 안암점" → "홈플러스")
+        3. 카테고리 default로 폴백
+        """
+        category_merchants = self.merchants.get(category)
+        if not category_merchants:
+            return None
+        if merchant_name:
+            if merchant_name in category_merchants:
+                return merchant_name
+            brand = self.matchers[category].match(merchant_name)
+            if brand is not None:
+                return brand
+        return 'default' if 'default' in category_merchants else None
+
+
+def format_benefit(benefit: Mapping) -> str:
+    """Format benefit info into human-readable string"""
+    parts = []
+
+    if benefit.get('discount_rate'):
+        parts.append(f"{benefit['discount_rate']}% 할인")
+
+    if benefit.get('discount_amount'):
+        parts.append(f"최대 {benefit['discount_amount']:,}원 할인")
+
+    if benefit.get('point_rate'):
+        parts.append(f"{benefit['point_rate']}% 적립")
+
+    if benefit.get('pre_month_money'):
+        parts.append(f"전월 {benefit['pre_month_money']//10000}만원 이상")
+
+    return ' • '.join(parts) if parts else '혜택 없음'
 
 
 class BenefitLookupService:
-    def __init__(self, db_path: str = None):
+    """
+    혜택 조회 서비스
+
+    데이터 소스 (우선순위):
+    1. 혜택 스냅샷 (benefits_snapshot.msgpack, scripts/build_benefit_snapshot.py로 생성)
+    2. benefits_db.json + ai/card_benefits.csv
+
+    리로드는 새 인덱스를 완전히 빌드한 뒤 참조 하나만 교체하므로,
+    처리 중인 요청은 이전 스냅샷을 끝까지 사용하고 이후 요청부터 새 스냅샷을 본다.
+    """
+
+    # 파일 변경 여부 확인 주기 (초) - 매 요청마다 stat 호출하지 않도록 제한
+    RELOAD_CHECK_INTERVAL = 5.0
+
+    def __init__(
+        self,
+        db_path: str = None,
+        snapshot_path: str = None,
+        card_benefits_path: str = None
+    ):
+        current_dir = os.path.dirname(os.path.abspath(__file__))
         if db_path is None:
             # Default path
-            current_dir = os.path.dirname(os.path.abspath(__file__))
             db_path = os.path.join(current_dir, '../benefits_db.json')
+        if card_benefits_path is None:
+            card_benefits_path = os.path.join(current_dir, '../ai/card_benefits.csv')
+
+        self.db_path = db_path
+        self.snapshot_path = snapshot_path or snapshot_path_from_env()
+        self.card_benefits_path = card_benefits_path
+        self._reload_lock = threading.Lock()
+        self._last_check = time.monotonic()
+        self._watcher = None
+        self._index = self._build_index()
 
-        with open(db_path, 'r', encoding='utf-8') as f:
-            self.benefits_db = json.load(f)
+    def _source_signature(self) -> Tuple:
+        """현재 데이터 소스와 mtime (스냅샷이 있으면 스냅샷만 감시)"""
+        if os.path.exists(self.snapshot_path):
+            return ('snapshot', os.path.getmtime(self.snapshot_path))
+        csv_mtime = os.path.getmtime(self.card_benefits_path) if os.path.exists(self.card_benefits_path) else None
+        return ('json', os.path.getmtime(self.db_path), csv_mtime)
+
+    def _build_index(self) -> _BenefitIndex:
+        source = self._source_signature()
+        if source[0] == 'snapshot':
+            snapshot = load_snapshot(self.snapshot_path)
+            return _BenefitIndex(
+                snapshot['benefits_db'],
+                BenefitEngine(snapshot['card_benefits']),
+                snapshot['version'],
+                source
+            )
+
+        with open(self.db_path, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+        engine = BenefitEngine.from_csv(self.card_benefits_path) if source[2] is not None else BenefitEngine([])
+        return _BenefitIndex(raw, engine, f"json-{int(source[1])}", source)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        데이터 파일이 바뀌었으면 (또는 force) 인덱스 재빌드 후 교체
+
+        Returns:
+            교체 여부. 빌드 실패 시 기존 인덱스를 유지하고 예외를 그대로 전달
+        """
+        with self._reload_lock:
+            return self._reload_locked(force)
+
+    def _reload_locked(self, force: bool) -> bool:
+        self._last_check = time.monotonic()
+        if not force and self._source_signature() == self._index.source:
+            return False
+        index = self._build_index()
+        previous = self._index.version
+        self._index = index
+        print(f"[BenefitLookup] 혜택 데이터 교체: {previous} → {index.version}")
+        return True
+
+    def start_watcher(self, interval: float = None) -> None:
+        """
+        데몬 스레드에서 주기적으로 파일 변경 확인 (요청 경로에서 stat/빌드 제거)
+
+        gunicorn 워커마다 한 번씩 호출되며, 스냅샷 파일이 교체되면 각 워커가 독립적으로 리로드한다.
+        """
+        if self._watcher is not None:
+            return
+        interval = interval or self.RELOAD_CHECK_INTERVAL
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.reload()
+                except Exception as e:
+                    print(f"[BenefitLookup] 혜택 데이터 리로드 실패, 기존 인덱스 유지: {e}")
+
+        self._watcher = threading.Thread(target=watch, name='benefit-snapshot-watcher', daemon=True)
+        self._watcher.start()
+
+    def _current_index(self) -> _BenefitIndex:
+        """
+        현재 인덱스 반환. 감시 스레드가 없으면 주기적으로 백그라운드 스레드에서 변경을 확인한다.
+
+        확인/재빌드는 요청 스레드에서 하지 않으며, 교체 전까지는 기존 인덱스를 그대로 반환한다.
+        """
+        index = self._index
+        if self._watcher is not None:
+            return index
+        now = time.monotonic()
+        if now - self._last_check < self.RELOAD_CHECK_INTERVAL:
+            return index
+
+        if not self._reload_lock.acquire(blocking=False):
+            return index
+        self._last_check = now
+        threading.Thread(target=self._background_reload, name='benefit-index-reload', daemon=True).start()
+        return index
+
+    def _background_reload(self) -> None:
+        """_current_index가 잡은 _reload_lock을 넘겨받아 재빌드 후 해제"""
+        try:
+            self._reload_locked(force=False)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[BenefitLookup] 혜택 데이터 리로드 실패, 기존 인덱스 유지: {e}")
+        finally:
+            self._reload_lock.release()
+
+    @property
+    def version(self) -> str:
+        """현재 스냅샷 버전"""
+        return self._index.version
+
+    @property
+    def engine(self) -> BenefitEngine:
+        """현재 스냅샷의 혜택 평가 엔진"""
+        return self._current_index().engine
+
+    @property
+    def benefits_db(self) -> Dict:
+        """원본 JSON 데이터 (현재 스냅샷)"""
+        return self._current_index().raw
+
+    @staticmethod
+    def _card_set(user_cards: Iterable[str]) -> frozenset:
+        if isinstance(user_cards, (set, frozenset)):
+            return user_cards
+        return frozenset(user_cards)
+
+    @classmethod
+    def _usable_cards(
+        cls,
+        user_cards: Iterable[str],
+        category: str,
+        excluded_cards: Optional[Dict[str, frozenset]]
+    ) -> frozenset:
+        """보유 카드 중 해당 카테고리에서 제외되지 않은 카드"""
+        card_set = cls._card_set(user_cards)
+        if excluded_cards and category in excluded_cards:
+            return card_set - excluded_cards[category]
+        return card_set
+
+    @staticmethod
+    def _savings(
+        index: _BenefitIndex,
+        merchant_name: Optional[str],
+        category: str,
+        card_set: frozenset,
+        card_states: Mapping,
+        evaluated: Dict[str, Any],
+        brands: Optional[frozenset] = None
+    ) -> Dict[str, int]:
+        """
+        카드별 예상 할인액 (카테고리 기준 결제 금액으로 엔진 평가)
+
+        evaluated: category → evaluate() 결과 (같은 배치의 같은 카테고리는 한 번만 평가)
+        card_states에 없는 보유 카드는 상태를 모르는 카드(CardState())로 평가한다.
+        """
+        engine = index.engine
+        discounts = evaluated.get(category)
+        if discounts is None:
+            states = {card: card_states.get(card) or CardState() for card in card_set}
+            discounts = evaluated[category] = engine.evaluate(typical_amount(category), states)
+        if len(discounts) == 0:
+            return {}
+        return engine.card_savings(merchant_name, category, discounts, brands)
 
     def get_recommendations(
         self,
         merchant_name: Optional[str],
         category: str,
-        user_cards: List[str]
-    ) -> List[Dict]:
+        user_cards: List[str],
+        excluded_cards: Optional[Dict[str, frozenset]] = None,
+        card_states: Optional[Mapping] = None
+    ) -> List[RankedBenefit]:
         """
         Get card recommendations for a merchant
 
@@ -26,54 +397,140 @@ class BenefitLookupService:
             merchant_name: Specific merchant name (e.g., "홈플러스")
             category: Merchant category (e.g., "mart", "cafe")
             user_cards: List of card names user owns
+            excluded_cards: category → cards to skip (e.g. exhausted limits), same as get_top_cards_batch
+            card_states: {card_name: CardState} - 있으면 예상 할인액(원) 순, 같으면 score 순
 
         Returns:
-            List of recommendations sorted by score
-        """
-        # Get category benefits
-        category_benefits = self.benefits_db.get(category, {})
-
-        # Try to find specific merchant benefits first
-        if merchant_name and merchant_name in category_benefits:
-            merchant_benefits = category_benefits[merchant_name]
-        else:
-            # Fall back to default benefits for this category
-            merchant_benefits = category_benefits.get('default', [])
-
-        # Filter by user cards
-        user_benefits = [
-            benefit for benefit in merchant_benefits
-            if benefit['card'] in user_cards
-        ]
+            List of recommendations sorted by expected discount (card_states) or score
+        """
+        index = self._current_index()
+        merchant_key = index.resolve_merchant(merchant_name, category)
+        if merchant_key is None:
+            return []
 
-        # Sort by score
-        sorted_benefits = sorted(
-            user_benefits,
-            key=lambda x: x['score'],
-            reverse=True
-        )
+        # 사전 정렬된 목록을 set으로 필터링 (재정렬 불필요)
+        card_set = self._usable_cards(user_cards, category, excluded_cards)
+        user_records = [
+            record for record in index.merchants[category][merchant_key]
+            if record.card in card_set
+        ]
 
-        # Add rank
-        for i, benefit in enumerate(sorted_benefits):
-            benefit['rank'] = i + 1
+        if card_states is None:
+            # 공유 레코드는 수정하지 않고 순위 뷰로 감싸서 반환
+            return [RankedBenefit(record, i + 1) for i, record in enumerate(user_records)]
 
-        return sorted_benefits
+        # 안정 정렬이므로 할인액이 같으면 score 순서 유지
+        savings = self._savings(index, merchant_name, category, card_set, card_states, {})
+        user_records.sort(key=lambda record: -savings.get(record.card, 0))
+        return [
+            RankedBenefit(record, i + 1, savings.get(record.card, 0))
+            for i, record in enumerate(user_records)
+        ]
 
     def get_top_card_for_merchant(
         self,
         merchant_name: Optional[str],
         category: str,
-        user_cards: List[str]
-    ) -> Optional[Dict]:
-        """Get the best card for a merchant"""
-        recommendations = self.get_recommendations(merchant_name, category, user_cards)
-        return recommendations[0] if recommendations else None
+        user_cards: List[str],
+        excluded_cards: Optional[Dict[str, frozenset]] = None,
+        card_states: Optional[Mapping] = None
+    ) -> Optional[RankedBenefit]:
+        """Get the best card for a merchant (by expected discount when card_states is given)"""
+        index = self._current_index()
+        merchant_key = index.resolve_merchant(merchant_name, category)
+        if merchant_key is None:
+            return None
+
+        card_set = self._usable_cards(user_cards, category, excluded_cards)
+        savings = None
+        if card_states is not None:
+            savings = self._savings(index, merchant_name, category, card_set, card_states, {})
+        return self._top_benefit(index, category, merchant_key, card_set, savings)
+
+    @staticmethod
+    def _top_benefit(
+        index: _BenefitIndex,
+        category: str,
+        merchant_key: str,
+        card_set: frozenset,
+        savings: Optional[Dict[str, int]] = None
+    ) -> Optional[RankedBenefit]:
+        """
+        보유 카드별 최고 혜택 위치만 비교 (가맹점 혜택 전체 스캔 없음)
+
+        savings가 있으면 예상 할인액이 가장 큰 카드, 같으면 score 위치가 앞선 카드
+        """
+        positions = index.best_pos[category][merchant_key]
+        best = None
+        best_key = None
+        for card in card_set:
+            pos = positions.get(card)
+            if pos is None:
+                continue
+            key = (-savings.get(card, 0), pos) if savings is not None else (0, pos)
+            if best_key is None or key < best_key:
+                best, best_key = pos, key
+
+        if best is None:
+            return None
+
+        if savings is None:
+            return index.top_views[category][merchant_key][best]
+        return RankedBenefit(index.merchants[category][merchant_key][best], 1, -best_key[0])
+
+    def get_top_cards_batch(
+        self,
+        merchants: List[Tuple[Optional[str], str]],
+        user_cards: Iterable[str],
+        excluded_cards: Optional[Dict[str, frozenset]] = None,
+        card_states: Optional[Mapping] = None
+    ) -> List[Optional[RankedBenefit]]:
+        """
+        Get the best card for many merchants in one pass
+
+        Args:
+            merchants: List of (merchant_name, category) pairs
+            user_cards: Card names user owns
+            excluded_cards: category → cards to skip (e.g. exhausted limits)
+            card_states: {card_name: CardState} - 있으면 예상 할인액(원)이 가장 큰 카드
+
+        Returns:
+            Top benefit (or None) for each pair, in input order
+        """
+        index = self._current_index()
+        card_set = self._card_set(user_cards)
+        rule_set = index.engine.rule_set if card_states is not None else None
+
+        # 카테고리별로 묶고, 같은 혜택 목록(+ 같은 혜택 규칙 브랜드)으로 해석되는 가맹점은 한 번만 계산
+        keys_by_category = {}
+        pair_keys = []
+        for merchant_name, category in merchants:
+            merchant_key = index.resolve_merchant(merchant_name, category)
+            brands = rule_set.merchant_brands(merchant_name, category) if rule_set is not None else None
+            key = (category, merchant_key, brands)
+            pair_keys.append(key)
+            if merchant_key is not None:
+                keys_by_category.setdefault(category, {}).setdefault(key, merchant_name)
+
+        resolved = {}
+        evaluated = {}
+        for category, keys in keys_by_category.items():
+            category_cards = self._usable_cards(card_set, category, excluded_cards)
+            for key, merchant_name in keys.items():
+                savings = None
+                if card_states is not None:
+                    savings = self._savings(
+                        index, merchant_name, category, category_cards, card_states, evaluated, key[2]
+                    )
+                resolved[key] = self._top_benefit(index, category, key[1], category_cards, savings)
+
+        return [resolved.get(key) for key in pair_keys]
 
     def get_all_categories(self) -> List[str]:
         """Get list of all available categories"""
-        return list(self.benefits_db.keys())
+        return list(self._current_index().merchants.keys())
 
     def get_merchants_for_category(self, category: str) -> List[str]:
         """Get list of merchants for a category"""
-        category_data = self.benefits_db.get(category, {})
+        category_data = self._current_index().merchants.get(category, {})
         return [m for m in category_data.keys() if m != 'default']
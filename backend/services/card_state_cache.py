@@ -0,0 +1,77 @@
+"""
+사용자별 카드 상태 캐시
+
+MyCard의 used_amount, daily_count, monthly_count, last_used_date, reset_date(→ CardState)를
+user_id 단위로 TTL 동안 메모리에 보관한다.
+추천 API가 요청마다 DB를 조회하지 않고 한도 소진 여부를 반영할 수 있으며,
+결제 반영(payment_webhook, process_payment)이나 카드 변경 시 invalidate로 즉시 무효화한다.
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from .benefit_engine import CardState
+
+
+class CardStateCache:
+    """user_id → {card_name: CardState} TTL 캐시 (스레드 안전)"""
+
+    def __init__(self, ttl_seconds: float = 60.0, max_users: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._lock = threading.Lock()
+        # user_id → (만료 시각, 카드 상태)
+        self._entries: Dict[str, tuple] = {}
+        # 무효화 세대: 조회 중에 invalidate 되면 오래된 결과를 저장하지 않기 위함
+        self._generations: Dict[str, int] = {}
+
+    def get(
+        self,
+        user_id: str,
+        loader: Callable[[str], Dict[str, CardState]]
+    ) -> Dict[str, CardState]:
+        """
+        캐시된 카드 상태 반환 (없거나 만료되면 loader(user_id)로 DB 조회 후 저장)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] > now:
+                return entry[1]
+            generation = self._generations.get(user_id, 0)
+
+        states = loader(user_id)
+
+        with self._lock:
+            if self._generations.get(user_id, 0) == generation:
+                if len(self._entries) >= self.max_users and user_id not in self._entries:
+                    self._evict_expired(now)
+                if len(self._entries) < self.max_users or user_id in self._entries:
+                    self._entries[user_id] = (now + self.ttl_seconds, states)
+        return states
+
+    def peek(self, user_id: str) -> Optional[Dict[str, CardState]]:
+        """DB 조회 없이 캐시에 있는 값만 반환"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+        return None
+
+    def invalidate(self, user_id: str) -> None:
+        """결제/카드 변경 후 호출 - 다음 조회 시 DB에서 다시 읽음"""
+        if not user_id:
+            return
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def _evict_expired(self, now: float) -> None:
+        expired = [user_id for user_id, entry in self._entries.items() if entry[0] <= now]
+        for user_id in expired:
+            del self._entries[user_id]
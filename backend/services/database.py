@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import create_engine, Column, String, Integer, Boolean, ForeignKey, select, delete, DateTime, Text, Date
+from sqlalchemy import create_engine, Column, String, Integer, Boolean, ForeignKey, Index, select, delete, DateTime, Text, Date, Float
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship, Session
 from sqlalchemy_utils import PasswordType
 from datetime import datetime, date, timedelta, timezone
@@ -14,6 +14,8 @@ def get_kst_now():
 import json
 import csv
 
+from .benefit_snapshot import load_snapshot_if_exists
+
 
 # 데이터베이스 경로 설정
 LOCAL_DATABASE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cardealo.db')
@@ -374,6 +376,46 @@ class RouteCache(Base):
     hit_count = Column(Integer, default=0)  # 캐시 적중 횟수
     last_hit_at = Column(DateTime)  # 마지막 캐시 적중 시간
 
+    # 모드별 통계(GROUP BY mode)와 만료 정리(mode + created_at 범위 삭제)용
+    __table_args__ = (
+        Index('ix_route_cache_mode_created_at', 'mode', 'created_at'),
+    )
+
+
+class KnownMerchant(Base):
+    """Places 응답 / 관리자 등록으로 알게 된 가맹점 (로컬 공간 인덱스 원본)"""
+    __tablename__ = 'known_merchant'
+
+    place_id = Column(String, primary_key=True)
+    name = Column(String, nullable=False)
+    category = Column(String)
+    address = Column(String)
+    latitude = Column(Float, nullable=False, index=True)
+    longitude = Column(Float, nullable=False)
+    photo_name = Column(Text)  # Places photo 리소스 이름 (URL은 API 키가 붙으므로 조회 시 생성)
+    search_types = Column(Text)  # 이 장소를 반환한 Google includedTypes (쉼표 구분)
+    source = Column(String, default='places')  # places, admin
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class MerchantCellRefresh(Base):
+    """셀 × Google 장소 타입별 마지막 전체 검색 시각 (이 시각 이후 TTL 동안 로컬 인덱스로 응답)"""
+    __tablename__ = 'merchant_cell_refresh'
+
+    cell = Column(String, primary_key=True)  # geohash (정밀도 5~7, 상위 셀이 신선하면 하위 셀도 신선)
+    place_type = Column(String, primary_key=True)
+    refreshed_at = Column(DateTime, nullable=False)
+
+
+class PlaceCacheEntry(Base):
+    """장소 상세/사진 캐시 (PlaceCache의 공유 2차 저장소, 워커/재시작 간 공유)"""
+    __tablename__ = 'place_cache'
+
+    place_id = Column(String, primary_key=True)
+    kind = Column(String, primary_key=True)  # details, photo
+    data = Column(Text, nullable=False)  # JSON
+    cached_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
 
 def get_db() -> Session:
     """
@@ -502,7 +544,10 @@ def init_db():
 
     inspector = inspect(engine)
     existing_tables = inspector.get_table_names()
-    required_tables = ['card', 'card_benefit', 'user', 'mycard', 'corporate_card']
+    required_tables = [
+        'card', 'card_benefit', 'user', 'mycard', 'corporate_card',
+        'known_merchant', 'merchant_cell_refresh', 'place_cache'
+    ]
 
     missing_tables = [t for t in required_tables if t not in existing_tables]
     if missing_tables:
@@ -578,15 +623,36 @@ def init_db():
     except Exception as e:
         print(f'[DB] Auto-migration check (payment_history columns): {e}')
 
-    with open(cards_path, 'r', encoding='utf-8') as f:
-        cards_data = json.load(f)
-    card_benefits_data = csv.reader(open(card_benefits_path, 'r', encoding='utf-8'))
+    # Auto-migration: Add (mode, created_at) index to route_cache
+    try:
+        if 'route_cache' in inspector.get_table_names():
+            index_names = [idx['name'] for idx in inspector.get_indexes('route_cache')]
+            if 'ix_route_cache_mode_created_at' not in index_names:
+                from sqlalchemy import text
+                with engine.connect() as conn:
+                    conn.execute(text('CREATE INDEX IF NOT EXISTS ix_route_cache_mode_created_at ON route_cache (mode, created_at)'))
+                    conn.commit()
+                print('[DB] Added (mode, created_at) index to route_cache table')
+    except Exception as e:
+        print(f'[DB] Auto-migration check (route_cache index): {e}')
+
+    # 혜택 스냅샷(benefits_snapshot.msgpack)이 있으면 원본 JSON/CSV 대신 사용
+    snapshot = load_snapshot_if_exists()
+    if snapshot is not None:
+        cards_data = snapshot['cards']
+        card_benefit_rows = snapshot['card_benefits']
+    else:
+        with open(cards_path, 'r', encoding='utf-8') as f:
+            cards_data = json.load(f)
+        with open(card_benefits_path, 'r', encoding='utf-8') as f:
+            card_benefit_rows = list(csv.DictReader(f))
 
     db = get_db()
     try:
+        # 이미 시딩된 카드/혜택은 한 번의 조회로 확인 (카드별 SELECT 반복 없음)
+        existing_cards = set(db.scalars(select(Card.card_name)).all())
         for card_name in cards_data:
-            existing_card = db.scalars(select(Card).where(Card.card_name == card_name)).first()
-            if existing_card:
+            if card_name in existing_cards:
                 continue
 
             card = cards_data[card_name]
@@ -607,25 +673,28 @@ def init_db():
             except (ValueError, TypeError):
                 return None
 
-        for row in card_benefits_data:
-            card_name, category, places, discount_type, discount_value, max_discount, pre_month_config, limit_config, places_display, discount_display, limit_display, max_discount_display = row
+        def parse_text(val):
+            return val if val and val.lower() != 'null' else None
+
+        seeded_benefit_cards = set(db.scalars(select(CardBenefit.card_name).distinct()).all())
+        for row in card_benefit_rows:
+            card_name = row['card_name']
             if card_name in cards_data:
-                existing_card = db.scalars(select(CardBenefit).where(CardBenefit.card_name == card_name)).first()
-                if existing_card:
+                if card_name in seeded_benefit_cards:
                     continue
                 new_card_benefit = CardBenefit(
                     card_name=card_name,
-                    category=category,
-                    places=places if places and places.lower() != 'null' else None,
-                    discount_type=discount_type,
-                    discount_value=parse_int(discount_value),
-                    max_discount=parse_int(max_discount),
-                    pre_month_config=pre_month_config if pre_month_config and pre_month_config.lower() != 'null' else None,
-                    limit_config=limit_config if limit_config and limit_config.lower() != 'null' else None,
-                    places_display=places_display,
-                    discount_display=discount_display,
-                    limit_display=limit_display,
-                    max_discount_display=max_discount_display
+                    category=row['category'],
+                    places=parse_text(row['places']),
+                    discount_type=row['discount_type'],
+                    discount_value=parse_int(row['discount_value']),
+                    max_discount=parse_int(row['max_discount']),
+                    pre_month_config=parse_text(row['pre_month_config']),
+                    limit_config=parse_text(row['limit_config']),
+                    places_display=row['places_display'],
+                    discount_display=row['discount_display'],
+                    limit_display=row['limit_display'],
+                    max_discount_display=row['max_discount_display']
                 )
                 db.add(new_card_benefit)
         db.commit()
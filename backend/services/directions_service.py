@@ -1,8 +1,30 @@
 import os
-import requests
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, TypeVar
 import requests.exceptions as req_exc
-import math
+
+from . import geo, http_client
+from .route_cache import route_cache
+from .single_flight import coalesce
+
+# 코스 구간 경로 병렬 계산 워커 수 (프로세스 공용 풀 - 여러 코스가 동시에 와도 구간 호출 동시 실행 수 상한 유지)
+LEG_ROUTING_WORKERS = int(os.getenv("LEG_ROUTING_WORKERS", "8"))
+
+_leg_executor = ThreadPoolExecutor(max_workers=LEG_ROUTING_WORKERS, thread_name_prefix="leg-routing")
+
+T = TypeVar('T')
+
+
+def route_legs(route_leg: Callable[[int], T], num_legs: int) -> List[T]:
+    """
+    코스 구간 0..num_legs-1마다 route_leg(i)를 공용 풀에서 동시에 실행해 구간 순서대로 결과 반환
+
+    구간 호출은 경로 캐시/single-flight를 거치므로 같은 구간이 여러 코스에 있어도 업스트림 호출은 한 번.
+    route_leg 안에서 다시 route_legs를 호출하면 안 됨 (풀 고갈 시 교착).
+    """
+    if num_legs <= 1:
+        return [route_leg(i) for i in range(num_legs)]
+    return list(_leg_executor.map(route_leg, range(num_legs)))
 
 
 class DirectionsService:
@@ -44,6 +66,7 @@ class DirectionsService:
         if not self.google_api_key:
             raise ValueError("GOOGLE_MAPS_API_KEY must be set")
 
+    @coalesce('google_directions')
     def get_directions(
         self,
         origin: Dict[str, float],
@@ -57,6 +80,8 @@ class DirectionsService:
         """
         경로 안내 정보 조회
 
+        경유지/대체 경로/회피 옵션이 없으면 route_cache(메모리 LRU → route_cache 테이블)로 읽기 통과 캐시
+
         Args:
             origin: 출발지 {"latitude": 37.xxx, "longitude": 127.xxx}
             destination: 목적지 {"latitude": 37.xxx, "longitude": 127.xxx}
@@ -104,6 +129,28 @@ class DirectionsService:
             }
         """
 
+        # 경유지/대체 경로/회피 옵션이 없는 단일 구간만 캐시 (route_cache 키는 출발지/목적지/모드)
+        if waypoints or alternatives or avoid or language != "ko":
+            return self._fetch_directions(origin, destination, waypoints, mode, alternatives, avoid, language)
+
+        return route_cache.get_route(
+            origin, destination, f"google_{mode}",
+            lambda: self._fetch_directions(origin, destination, mode=mode),
+            cacheable=lambda result: result.get('status') == 'OK'
+        )
+
+    def _fetch_directions(
+        self,
+        origin: Dict[str, float],
+        destination: Dict[str, float],
+        waypoints: Optional[List[Dict[str, float]]] = None,
+        mode: str = "walking",
+        alternatives: bool = False,
+        avoid: Optional[List[str]] = None,
+        language: str = "ko"
+    ) -> Dict[str, Any]:
+        """Google Directions API 호출 (캐시 없음, 인자/반환값은 get_directions와 같음)"""
+
         print(f"[Directions API] 경로 검색 시작...")
         print(f"[Mode] {mode}")
         print(f"[Waypoints] {len(waypoints) if waypoints else 0}개")
@@ -138,8 +185,9 @@ class DirectionsService:
             params['avoid'] = '|'.join(avoid)
 
         try:
-            response = requests.get(
+            response = http_client.get(
                 self.GOOGLE_BASE_URL,
+                upstream='google_directions',
                 params=params,
                 timeout=10
             )
@@ -319,119 +367,77 @@ class DirectionsService:
         if not leg_modes:
             # 자동 판단: 거리 기반
             leg_modes = []
-            for i in range(num_legs):
-                distance = self._calculate_haversine_distance(
-                    points[i]['latitude'],
-                    points[i]['longitude'],
-                    points[i + 1]['latitude'],
-                    points[i + 1]['longitude']
-                )
+            distances = geo.leg_distances(
+                [point['latitude'] for point in points],
+                [point['longitude'] for point in points]
+            ).tolist()
+            for distance in distances:
                 # 800m 이하: 도보, 그 이상: 대중교통
                 if distance <= 800:
                     leg_modes.append('walking')
                 else:
                     leg_modes.append('transit')
 
-        # 각 구간별로 경로 계산
-        legs_summary = []
-        total_distance = 0
-        total_duration = 0
-        total_fare = 0
-
-        for i in range(num_legs):
+        # 각 구간별로 경로 계산 (구간끼리 동시에, 결과는 구간 순서대로)
+        def route_leg(i: int) -> Optional[Dict[str, Any]]:
             origin = {'latitude': points[i]['latitude'], 'longitude': points[i]['longitude']}
             destination = {'latitude': points[i + 1]['latitude'], 'longitude': points[i + 1]['longitude']}
             mode = leg_modes[i] if i < len(leg_modes) else 'walking'
-
             print(f"[Leg {i + 1}] {points[i].get('name', 'N/A')} → {points[i + 1].get('name', 'N/A')} ({mode})")
+            return self._route_mixed_leg(origin, destination, mode, i)
 
-            leg_distance = 0
-            leg_duration = 0
-            leg_fare = 0
-            leg_polyline = ''
-            leg_success = False
-
-            # TMAP 우선 사용 (한국 최적화)
-            if mode in ['walking', 'driving']:
-                tmap_result = self._get_tmap_directions(origin, destination, mode)
-                if tmap_result:
-                    leg_distance = tmap_result['distance']
-                    leg_duration = tmap_result['duration']
-                    leg_polyline = tmap_result['polyline']
-                    leg_success = True
-                    print(f"[TMAP] Leg {i + 1} 성공")
-
-            leg_transit_legs = None  # 대중교통 구간 상세
-
-            if mode == 'transit':
-                # 대중교통은 TMAP Transit API 사용
-                tmap_result = self._get_tmap_transit_directions(origin, destination)
-                if tmap_result:
-                    leg_distance = tmap_result['distance']
-                    leg_duration = tmap_result['duration']
-                    leg_fare = tmap_result.get('fare', 0)
-                    leg_polyline = tmap_result['polyline']
-                    leg_transit_legs = tmap_result.get('transit_legs', [])
-                    leg_success = True
-                    print(f"[TMAP Transit] Leg {i + 1} 성공")
-
-            # TMAP 실패 시 Google API fallback
-            if not leg_success:
-                leg_result = self.get_directions(
-                    origin=origin,
-                    destination=destination,
-                    mode=mode
-                )
+        leg_results = route_legs(route_leg, num_legs)
 
-                if leg_result['status'] == 'OK':
-                    leg_distance = leg_result.get('total_distance', 0)
-                    leg_duration = leg_result.get('total_duration', 0)
-                    leg_fare = leg_result.get('fare', {}).get('value', 0)
+        legs_summary = []
+        total_distance = 0
+        total_duration = 0
+        total_fare = 0
 
-                    routes = leg_result.get('routes', [])
-                    if routes and len(routes) > 0:
-                        leg_polyline = routes[0].get('overview_polyline', {}).get('points', '')
-                    leg_success = True
-                else:
-                    print(f"[Warning] Leg {i + 1} 경로 계산 실패: {leg_result.get('status')}")
+        for i, leg_result in enumerate(leg_results):
+            if leg_result is None:
+                continue
 
-            if leg_success:
-                # 거리/시간 텍스트 포맷
-                if leg_distance >= 1000:
-                    distance_text = f"{leg_distance / 1000:.1f} km"
-                else:
-                    distance_text = f"{leg_distance} m"
+            mode = leg_modes[i] if i < len(leg_modes) else 'walking'
+            leg_distance = leg_result['distance']
+            leg_duration = leg_result['duration']
+            leg_fare = leg_result['fare']
 
-                if leg_duration >= 3600:
-                    hours = leg_duration // 3600
-                    mins = (leg_duration % 3600) // 60
-                    duration_text = f"{hours}시간 {mins}분"
-                else:
-                    mins = leg_duration // 60
-                    duration_text = f"{mins}분"
+            # 거리/시간 텍스트 포맷
+            if leg_distance >= 1000:
+                distance_text = f"{leg_distance / 1000:.1f} km"
+            else:
+                distance_text = f"{leg_distance} m"
 
-                leg_summary = {
-                    'from': points[i].get('name', f'지점 {i}'),
-                    'to': points[i + 1].get('name', f'지점 {i + 1}'),
-                    'mode': mode,
-                    'distance': leg_distance,
-                    'duration': leg_duration,
-                    'fare': leg_fare if leg_fare else None,
-                    'distance_text': distance_text,
-                    'duration_text': duration_text,
-                    'fare_text': f"{leg_fare:,}원" if leg_fare else None,
-                    'polyline': leg_polyline
-                }
+            if leg_duration >= 3600:
+                hours = leg_duration // 3600
+                mins = (leg_duration % 3600) // 60
+                duration_text = f"{hours}시간 {mins}분"
+            else:
+                mins = leg_duration // 60
+                duration_text = f"{mins}분"
+
+            leg_summary = {
+                'from': points[i].get('name', f'지점 {i}'),
+                'to': points[i + 1].get('name', f'지점 {i + 1}'),
+                'mode': mode,
+                'distance': leg_distance,
+                'duration': leg_duration,
+                'fare': leg_fare if leg_fare else None,
+                'distance_text': distance_text,
+                'duration_text': duration_text,
+                'fare_text': f"{leg_fare:,}원" if leg_fare else None,
+                'polyline': leg_result['polyline']
+            }
 
-                # 대중교통인 경우 상세 구간 정보 추가
-                if leg_transit_legs:
-                    leg_summary['transit_legs'] = leg_transit_legs
+            # 대중교통인 경우 상세 구간 정보 추가
+            if leg_result['transit_legs']:
+                leg_summary['transit_legs'] = leg_result['transit_legs']
 
-                legs_summary.append(leg_summary)
+            legs_summary.append(leg_summary)
 
-                total_distance += leg_distance
-                total_duration += leg_duration
-                total_fare += leg_fare if leg_fare else 0
+            total_distance += leg_distance
+            total_duration += leg_duration
+            total_fare += leg_fare if leg_fare else 0
 
         # 전체 거리/시간 포맷
         if total_distance >= 1000:
@@ -463,6 +469,69 @@ class DirectionsService:
             'total_fare_text': total_fare_text
         }
 
+    def _route_mixed_leg(
+        self,
+        origin: Dict[str, float],
+        destination: Dict[str, float],
+        mode: str,
+        leg_index: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        한 구간 경로 계산 (TMAP 우선, 실패 시 Google 폴백)
+
+        Returns:
+            {'distance', 'duration', 'fare', 'polyline', 'transit_legs'}, 실패 시 None
+        """
+        # TMAP 우선 사용 (한국 최적화)
+        if mode in ['walking', 'driving']:
+            tmap_result = self._get_tmap_directions(origin, destination, mode)
+            if tmap_result:
+                print(f"[TMAP] Leg {leg_index + 1} 성공")
+                return {
+                    'distance': tmap_result['distance'],
+                    'duration': tmap_result['duration'],
+                    'fare': 0,
+                    'polyline': tmap_result['polyline'],
+                    'transit_legs': None
+                }
+
+        if mode == 'transit':
+            # 대중교통은 TMAP Transit API 사용
+            tmap_result = self._get_tmap_transit_directions(origin, destination)
+            if tmap_result:
+                print(f"[TMAP Transit] Leg {leg_index + 1} 성공")
+                return {
+                    'distance': tmap_result['distance'],
+                    'duration': tmap_result['duration'],
+                    'fare': tmap_result.get('fare', 0),
+                    'polyline': tmap_result['polyline'],
+                    'transit_legs': tmap_result.get('transit_legs', [])
+                }
+
+        # TMAP 실패 시 Google API fallback
+        leg_result = self.get_directions(
+            origin=origin,
+            destination=destination,
+            mode=mode
+        )
+
+        if leg_result['status'] != 'OK':
+            print(f"[Warning] Leg {leg_index + 1} 경로 계산 실패: {leg_result.get('status')}")
+            return None
+
+        leg_polyline = ''
+        routes = leg_result.get('routes', [])
+        if routes and len(routes) > 0:
+            leg_polyline = routes[0].get('overview_polyline', {}).get('points', '')
+
+        return {
+            'distance': leg_result.get('total_distance', 0),
+            'duration': leg_result.get('total_duration', 0),
+            'fare': leg_result.get('fare', {}).get('value', 0),
+            'polyline': leg_polyline,
+            'transit_legs': None
+        }
+
     def get_course_directions(
         self,
         course_stops: List[Dict[str, Any]],
@@ -701,48 +770,20 @@ class DirectionsService:
             print(f"[Fare Calculation Error] {e}")
             return None
 
-    def _calculate_haversine_distance(
+    @coalesce('tmap_directions')
+    def _get_tmap_directions(
         self,
-        lat1: float,
-        lon1: float,
-        lat2: float,
-        lon2: float
-    ) -> float:
-        """
-        Haversine 공식을 사용한 두 지점 간 직선 거리 계산
-
-        Args:
-            lat1: 출발지 위도
-            lon1: 출발지 경도
-            lat2: 도착지 위도
-            lon2: 도착지 경도
-
-        Returns:
-            거리 (미터)
-        """
-        # 지구 반지름 (미터)
-        R = 6371000
-
-        # 라디안 변환
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
-
-        # Haversine 공식
-        a = (
-            math.sin(delta_lat / 2) ** 2 +
-            math.cos(lat1_rad) * math.cos(lat2_rad) *
-            math.sin(delta_lon / 2) ** 2
+        origin: Dict[str, float],
+        destination: Dict[str, float],
+        mode: str = "driving"
+    ) -> Optional[Dict[str, Any]]:
+        """TMAP 경로 조회 (route_cache 읽기 통과, 반환값은 _fetch_tmap_directions와 같음)"""
+        return route_cache.get_route(
+            origin, destination, mode,
+            lambda: self._fetch_tmap_directions(origin, destination, mode)
         )
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-        # 거리 계산 (미터)
-        distance = R * c
-
-        return distance
 
-    def _get_tmap_directions(
+    def _fetch_tmap_directions(
         self,
         origin: Dict[str, float],
         destination: Dict[str, float],
@@ -793,7 +834,13 @@ class DirectionsService:
                 body['startName'] = '출발지'
                 body['endName'] = '도착지'
 
-            response = requests.post(url, headers=headers, json=body, timeout=10)
+            response = http_client.post(
+                url,
+                upstream='tmap_pedestrian' if mode == "walking" else 'tmap_driving',
+                headers=headers,
+                json=body,
+                timeout=10
+            )
 
             if response.status_code != 200:
                 print(f"[TMAP] API 오류: {response.status_code}")
@@ -878,10 +925,22 @@ class DirectionsService:
 
         return ''.join(encoded)
 
+    @coalesce('tmap_transit')
     def _get_tmap_transit_directions(
         self,
         origin: Dict[str, float],
         destination: Dict[str, float]
+    ) -> Optional[Dict[str, Any]]:
+        """TMAP 대중교통 경로 조회 (route_cache 읽기 통과, 반환값은 _fetch_tmap_transit_directions와 같음)"""
+        return route_cache.get_route(
+            origin, destination, "transit",
+            lambda: self._fetch_tmap_transit_directions(origin, destination)
+        )
+
+    def _fetch_tmap_transit_directions(
+        self,
+        origin: Dict[str, float],
+        destination: Dict[str, float]
     ) -> Optional[Dict[str, Any]]:
         """
         TMAP 대중교통 API로 경로 조회
@@ -917,8 +976,9 @@ class DirectionsService:
                 'count': 1
             }
 
-            response = requests.post(
+            response = http_client.post(
                 self.TMAP_TRANSIT_URL,
+                upstream='tmap_transit',
                 headers=headers,
                 json=body,
                 timeout=15
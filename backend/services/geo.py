@@ -0,0 +1,94 @@
+"""
+거리 계산 공통 모듈 (Haversine)
+
+가맹점 목록 거리 계산/정렬, 코스 거리 행렬, 캐시 원 판정 등에서 쓰는 Haversine 공식을 한 곳에 모은다.
+여러 지점은 NumPy 배열 연산 한 번으로 계산한다.
+
+- haversine: 두 지점 (스칼라, 단건 호출은 math가 NumPy보다 빠름)
+- distances_from: 한 지점 → N개 지점
+- distance_matrix: N개 지점 × M개 지점
+- leg_distances: 경로의 연속 구간 거리
+- stores_within: 가맹점 dict 목록에 distance를 붙여 거리순 정렬 (반경 필터 선택)
+"""
+import math
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+
+
+def haversine(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """두 지점 간 거리 (미터)"""
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng / 2) ** 2
+    return EARTH_RADIUS_M * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def _haversine_array(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """브로드캐스팅되는 도 단위 배열 → 거리 배열 (미터)"""
+    lat1 = np.radians(lat1)
+    lat2 = np.radians(lat2)
+    dlat = lat2 - lat1
+    dlng = np.radians(lng2) - np.radians(lng1)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return EARTH_RADIUS_M * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def distances_from(lat: float, lng: float, lats: Sequence[float], lngs: Sequence[float]) -> np.ndarray:
+    """한 지점에서 N개 지점까지의 거리 (미터, shape (N,))"""
+    return _haversine_array(lat, lng, np.asarray(lats, dtype=float), np.asarray(lngs, dtype=float))
+
+
+def distance_matrix(
+    lats1: Sequence[float],
+    lngs1: Sequence[float],
+    lats2: Optional[Sequence[float]] = None,
+    lngs2: Optional[Sequence[float]] = None
+) -> np.ndarray:
+    """
+    N개 지점 × M개 지점 거리 행렬 (미터, shape (N, M))
+
+    lats2/lngs2를 생략하면 첫 번째 지점 집합끼리의 N × N 행렬
+    """
+    lats1 = np.asarray(lats1, dtype=float)
+    lngs1 = np.asarray(lngs1, dtype=float)
+    if lats2 is None:
+        lats2, lngs2 = lats1, lngs1
+    else:
+        lats2 = np.asarray(lats2, dtype=float)
+        lngs2 = np.asarray(lngs2, dtype=float)
+    return _haversine_array(lats1[:, None], lngs1[:, None], lats2[None, :], lngs2[None, :])
+
+
+def leg_distances(lats: Sequence[float], lngs: Sequence[float]) -> np.ndarray:
+    """경로 지점 i → i+1 구간 거리 (미터, shape (N-1,))"""
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+    return _haversine_array(lats[:-1], lngs[:-1], lats[1:], lngs[1:])
+
+
+def point_distances(lat: float, lng: float, points: Sequence[Mapping], lat_key: str = 'latitude', lng_key: str = 'longitude') -> np.ndarray:
+    """한 지점에서 dict 목록(latitude/longitude 키) 각각까지의 거리 (미터)"""
+    if not points:
+        return np.zeros(0)
+    return distances_from(lat, lng, [p[lat_key] for p in points], [p[lng_key] for p in points])
+
+
+def stores_within(lat: float, lng: float, stores: Sequence[Dict], radius: Optional[float] = None) -> List[Dict]:
+    """
+    가맹점 목록에 (lat, lng) 기준 distance(정수 미터)를 붙인 복사본을 거리순으로 반환
+
+    radius를 주면 반경 밖 가맹점은 제외한다. 같은 거리는 입력 순서를 유지한다.
+    """
+    if not stores:
+        return []
+    distances = point_distances(lat, lng, stores)
+    int_distances = distances.astype(np.int64)
+    if radius is None:
+        order = np.argsort(int_distances, kind='stable')
+    else:
+        inside = np.flatnonzero(distances <= radius)
+        order = inside[np.argsort(int_distances[inside], kind='stable')]
+    return [{**stores[i], 'distance': int(int_distances[i])} for i in order.tolist()]
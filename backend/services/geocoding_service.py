@@ -2,6 +2,9 @@ import os
 import requests
 from typing import Dict, Optional
 
+from . import http_client
+from .single_flight import coalesce
+
 
 class GeocodingService:
     BASE_URL = "https://maps.apigw.ntruss.com/map-geocode/v2/geocode"
@@ -13,6 +16,7 @@ class GeocodingService:
         if not self.client_id or not self.client_secret:
             raise ValueError("NCP_CLIENT_ID and NCP_CLIENT_SECRET must be set")
 
+    @coalesce('geocode')
     def get_coordinates(self, address: str) -> Optional[Dict]:
         """
         Convert address to coordinates using Naver Geocoding API
@@ -33,8 +37,9 @@ class GeocodingService:
         }
 
         try:
-            response = requests.get(
+            response = http_client.get(
                 self.BASE_URL,
+                upstream='ncp_geocode',
                 headers=headers,
                 params=params,
                 timeout=10
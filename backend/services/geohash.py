@@ -0,0 +1,98 @@
+"""
+Geohash 인코딩 (표준 라이브러리만 사용)
+
+위경도를 base32 문자열 격자 셀로 변환한다. 같은 접두어를 공유하는 셀은 공간적으로 가깝다.
+
+정밀도별 셀 크기 (위도 37.5° 기준, 가로 × 세로):
+    4: 약 31km × 20km
+    5: 약 3.9km × 4.9km
+    6: 약 970m × 610m
+    7: 약 120m × 150m
+"""
+import math
+from typing import List, Tuple
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+_DECODE = {ch: i for i, ch in enumerate(BASE32)}
+
+
+def encode(lat: float, lng: float, precision: int = 7) -> str:
+    lng_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 - lng_bits
+    # 각 축을 정수 격자로 양자화한 뒤 비트를 교차 배치 (짝수 비트: 경도, 홀수 비트: 위도)
+    lat_idx = min(int((lat + 90.0) / 180.0 * (1 << lat_bits)), (1 << lat_bits) - 1)
+    lng_idx = min(int((lng + 180.0) / 360.0 * (1 << lng_bits)), (1 << lng_bits) - 1)
+
+    bits = 0
+    for i in range(precision * 5):
+        if i % 2 == 0:
+            lng_bits -= 1
+            bits = (bits << 1) | ((lng_idx >> lng_bits) & 1)
+        else:
+            lat_bits -= 1
+            bits = (bits << 1) | ((lat_idx >> lat_bits) & 1)
+
+    chars = []
+    for shift in range((precision - 1) * 5, -1, -5):
+        chars.append(BASE32[(bits >> shift) & 31])
+    return ''.join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """정밀도별 셀 크기 (위도 차, 경도 차) - 도 단위"""
+    lng_bits = math.ceil(precision * 5 / 2)
+    lat_bits = math.floor(precision * 5 / 2)
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def decode_bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """셀 경계 (min_lat, min_lng, max_lat, max_lng)"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+    for ch in geohash:
+        value = _DECODE[ch]
+        for shift in range(4, -1, -1):
+            rng = lng_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (value >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return lat_range[0], lng_range[0], lat_range[1], lng_range[1]
+
+
+def decode_center(geohash: str) -> Tuple[float, float]:
+    min_lat, min_lng, max_lat, max_lng = decode_bounds(geohash)
+    return (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+
+
+def neighbors(geohash: str) -> List[str]:
+    """주변 8개 셀 (극/날짜변경선 부근 셀은 제외될 수 있음)"""
+    lat, lng = decode_center(geohash)
+    dlat, dlng = cell_size(len(geohash))
+    result = []
+    for i in (-1, 0, 1):
+        for j in (-1, 0, 1):
+            if i == 0 and j == 0:
+                continue
+            nlat, nlng = lat + i * dlat, lng + j * dlng
+            if -90 <= nlat <= 90 and -180 <= nlng <= 180:
+                result.append(encode(nlat, nlng, len(geohash)))
+    return result
+
+
+def cells_in_bbox(min_lat: float, min_lng: float, max_lat: float, max_lng: float, precision: int) -> List[str]:
+    """경계 상자와 겹치는 모든 셀 (정밀도 precision)"""
+    dlat, dlng = cell_size(precision)
+    start_lat, start_lng = decode_center(encode(max(min_lat, -90.0), max(min_lng, -180.0), precision))
+    cells = []
+    lat = start_lat
+    while lat - dlat / 2 <= max_lat and lat <= 90.0:
+        lng = start_lng
+        while lng - dlng / 2 <= max_lng and lng <= 180.0:
+            cells.append(encode(lat, lng, precision))
+            lng += dlng
+        lat += dlat
+    return cells
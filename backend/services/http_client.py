@@ -0,0 +1,206 @@
+"""
+외부 API 공용 HTTP 클라이언트
+
+Places/Geocoding/Directions/TMAP/OCR 호출이 모두 맨 requests.get/post를 쓰면 요청마다 TCP+TLS 연결을 새로 맺는다.
+이 모듈은 프로세스당 하나의 requests.Session을 두고 모든 외부 호출이 이를 통하도록 한다.
+
+- 호스트별 keep-alive 연결 풀 (HTTP_POOL_SIZE)
+- 업스트림별 동시 호출 수 제한 (HTTP_MAX_CONCURRENCY, 초과분은 대기)
+- 공통 타임아웃 (호출부가 timeout을 주지 않으면 HTTP_TIMEOUT)
+- 연결 실패/5xx 재시도 + 지수 백오프 (HTTP_RETRIES, HTTP_BACKOFF)
+  연결 실패는 요청이 서버에 닿지 않았으므로 모든 메서드를 재시도하고, 5xx는 GET만 재시도
+  (POST는 OCR/Text Search처럼 호출마다 과금되고 서버가 이미 처리했을 수 있으므로 호출부에 5xx를 그대로 돌려줌)
+  응답을 읽기 시작한 뒤의 타임아웃은 재시도하지 않음 (최악 지연이 timeout × 재시도 횟수로 늘지 않도록)
+  429는 재시도하지 않고 호출부에 그대로 돌려줌
+- 업스트림별 초당 호출 수 제한 (rate_limiter, 토큰 버킷). 차례가 올 때까지 대기하고,
+  대기가 너무 길면 RateLimitExceeded (requests.exceptions.RequestException 하위 클래스)
+  429 응답을 받으면 Retry-After 동안 해당 업스트림 호출을 늦춤
+- 업스트림별 지연 시간 히스토그램 (stats())
+
+반환값/예외는 requests와 같으므로 호출부의 status_code/raise_for_status/requests.exceptions 처리는 그대로 쓴다.
+
+사용법:
+    from . import http_client
+    response = http_client.get(url, params=params, timeout=5, upstream='google_geocode')
+"""
+import http.cookiejar
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .rate_limiter import rate_limiter
+
+DEFAULT_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+MAX_CONCURRENCY = int(os.getenv("HTTP_MAX_CONCURRENCY", "16"))
+RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.2"))
+
+# 지연 시간 히스토그램 버킷 상한 (밀리초, 마지막 버킷은 그 이상)
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# 재시도할 응답 코드 (일시적 서버 오류)
+RETRY_STATUSES = (500, 502, 503, 504)
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """업스트림 속도 제한 대기 시간(RATE_LIMIT_MAX_WAIT) 초과 - 호출하지 않음"""
+
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+
+
+class _UpstreamStats:
+    """업스트림 하나의 동시 호출 제한 + 지연 시간 통계"""
+
+    def __init__(self, max_concurrency: int):
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.lock = threading.Lock()
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.in_flight = 0
+        self.waited = 0
+        self.wait_ms = 0.0
+
+    def record(self, elapsed_ms: float, failed: bool) -> None:
+        index = len(LATENCY_BUCKETS_MS)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                index = i
+                break
+        with self.lock:
+            self.buckets[index] += 1
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            if failed:
+                self.errors += 1
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            labels = [f"le_{bound}" for bound in LATENCY_BUCKETS_MS] + [f"gt_{LATENCY_BUCKETS_MS[-1]}"]
+            return {
+                'count': self.count,
+                'errors': self.errors,
+                'avg_ms': round(self.total_ms / self.count, 1) if self.count else 0.0,
+                'max_ms': round(self.max_ms, 1),
+                'in_flight': self.in_flight,
+                'max_concurrency': self.max_concurrency,
+                'waited': self.waited,
+                'wait_ms': round(self.wait_ms, 1),
+                'histogram_ms': dict(zip(labels, self.buckets)),
+            }
+
+
+_upstreams: Dict[str, _UpstreamStats] = {}
+_upstreams_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    retry = Retry(
+        total=RETRIES,
+        connect=RETRIES,
+        read=0,
+        status=RETRIES,
+        status_forcelist=RETRY_STATUSES,
+        # 응답 코드 재시도는 GET만 (연결 실패 재시도는 메서드와 무관)
+        allowed_methods=frozenset(['GET']),
+        backoff_factor=BACKOFF,
+        raise_on_status=False,
+        # Retry-After가 붙은 429를 urllib3가 요청 스레드에서 잠들며 재시도하지 않도록 함 (rate_limiter가 처리)
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # 여러 사용자 요청이 세션을 공유하므로 쿠키는 저장하지 않음
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session() -> requests.Session:
+    """프로세스 공용 세션 (gunicorn 워커 fork 후에는 워커마다 새로 생성)"""
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+
+def _upstream(name: str) -> _UpstreamStats:
+    upstream = _upstreams.get(name)
+    if upstream is None:
+        with _upstreams_lock:
+            upstream = _upstreams.setdefault(name, _UpstreamStats(MAX_CONCURRENCY))
+    return upstream
+
+
+def request(method: str, url: str, upstream: Optional[str] = None, **kwargs) -> requests.Response:
+    """
+    공용 세션으로 HTTP 호출
+
+    Args:
+        method: 'GET', 'POST', ...
+        url: 요청 URL
+        upstream: 통계/동시 호출 제한/속도 제한 단위 이름 (기본: 호스트명)
+        **kwargs: requests.Session.request 인자 (timeout 생략 시 HTTP_TIMEOUT)
+    """
+    name = upstream or urlsplit(url).hostname or 'unknown'
+    stats = _upstream(name)
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+
+    if not rate_limiter.acquire(name):
+        raise RateLimitExceeded(f"{name}: rate limit wait exceeded")
+
+    if not stats.semaphore.acquire(blocking=False):
+        wait_start = time.perf_counter()
+        stats.semaphore.acquire()
+        with stats.lock:
+            stats.waited += 1
+            stats.wait_ms += (time.perf_counter() - wait_start) * 1000
+    with stats.lock:
+        stats.in_flight += 1
+
+    start = time.perf_counter()
+    failed = True
+    try:
+        response = get_session().request(method, url, **kwargs)
+        failed = response.status_code >= 500
+        if response.status_code == 429:
+            rate_limiter.penalize(name, response.headers.get('Retry-After'))
+        return response
+    finally:
+        stats.record((time.perf_counter() - start) * 1000, failed)
+        with stats.lock:
+            stats.in_flight -= 1
+        stats.semaphore.release()
+
+
+def get(url: str, upstream: Optional[str] = None, **kwargs) -> requests.Response:
+    return request('GET', url, upstream=upstream, **kwargs)
+
+
+def post(url: str, upstream: Optional[str] = None, **kwargs) -> requests.Response:
+    return request('POST', url, upstream=upstream, **kwargs)
+
+
+def stats() -> Dict[str, Dict]:
+    """업스트림별 호출 수/오류 수/지연 시간 히스토그램/동시 호출 대기 통계"""
+    with _upstreams_lock:
+        names = list(_upstreams)
+    return {name: _upstreams[name].snapshot() for name in sorted(names)}
@@ -0,0 +1,138 @@
+"""
+실내 감지용 주변 장소 캐시
+
+detect_indoor는 요청마다 30m 반경 searchNearby로 주변 건물(밀집도, 가장 가까운 건물명)을 확인한다.
+같은 자리에 머무는 사용자는 거의 같은 좌표로 반복 요청하므로, 좌표를 geohash 셀(정밀도 8, 약 38m × 19m)로
+묶어 셀 단위로 주변 장소를 캐시한다.
+
+- 업스트림 호출은 셀 중심 + (감지 반경 + 셀 반대각선) 반경으로 수행 → 셀 안의 어떤 좌표에서도 감지 원을 완전히 덮음
+- 조회 시 실제 좌표 기준 감지 반경 안의 장소만 (원래 순서대로) 반환
+- GPS 정확도/체류 시간에 따른 실내 판정은 캐시하지 않고 요청마다 다시 계산
+  (체류 시간이 늘어나 판정이 바뀌는 경우에도 오래된 판정이 남지 않음).
+  캐시 값(주변 장소)은 GPS 정확도와 무관하므로 키에 정확도 구간을 넣지 않는다.
+- 셀 호출이 20건(maxResultCount)을 채우면(쇼핑몰 등 밀집 지역) 넓힌 원의 장소가 실제 30m 안의 건물을 밀어냈을 수 있으므로
+  결과를 저장하지 않고 셀을 밀집으로만 표시한다 (dense()). 호출부는 이후 셀 호출 없이 사용자 좌표 + 감지 반경으로 직접 호출하고,
+  그 결과는 더 작은 셀(정밀도 9, 약 5m)에 저장해 (put_direct()) 같은 자리에 머무는 사용자의 반복 요청에 재사용한다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from . import geo, geohash
+
+# 셀 정밀도 (8: 위도 37.5° 기준 약 38m × 19m)
+INDOOR_CELL_PRECISION = 8
+
+# 밀집 셀 직접 호출 결과 정밀도 (9: 약 5m × 5m)
+DIRECT_CELL_PRECISION = 9
+
+
+class IndoorCell(NamedTuple):
+    """업스트림 호출 단위: 셀 → 호출 중심/반경"""
+    cell: str
+    lat: float
+    lng: float
+    radius: float
+
+
+class IndoorPlaceCache:
+    """geohash 셀 → 주변 장소(Places API 원본) TTL 캐시 (스레드 안전)"""
+
+    def __init__(self, radius: float = 30.0, ttl_seconds: float = 600.0, max_entries: int = 20000):
+        self.radius = radius
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # cell → (만료 시각, 장소 목록, 셀 전체를 덮는지) - 밀집 셀은 장소 없이 False, 직접 호출 결과는 정밀도 9 셀
+        self._entries: 'OrderedDict[str, Tuple[float, Tuple[Dict, ...], bool]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def cell_for(self, lat: float, lng: float) -> IndoorCell:
+        """좌표가 속한 셀과, 셀 안 모든 좌표의 감지 원을 덮는 호출 원"""
+        cell = geohash.encode(lat, lng, INDOOR_CELL_PRECISION)
+        min_lat, min_lng, max_lat, max_lng = geohash.decode_bounds(cell)
+        center_lat, center_lng = (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+        half_diagonal = geo.haversine(center_lat, center_lng, max_lat, max_lng)
+        return IndoorCell(cell, center_lat, center_lng, self.radius + half_diagonal)
+
+    def get(self, lat: float, lng: float) -> Optional[List[Dict]]:
+        """
+        (lat, lng) 기준 감지 반경 안의 캐시된 장소
+
+        Returns:
+            Places API 장소 dict 목록 (호출 응답 순서 유지), 캐시에 없으면 None
+        """
+        cell = geohash.encode(lat, lng, INDOOR_CELL_PRECISION)
+        with self._lock:
+            entry = self._live_entry(cell)
+            if entry is not None and not entry[2]:
+                # 밀집 셀: 사용자 좌표로 직접 호출한 결과만 사용
+                entry = self._live_entry(geohash.encode(lat, lng, DIRECT_CELL_PRECISION))
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            places = entry[1]
+
+        return self.within_radius(lat, lng, places)
+
+    def _live_entry(self, key: str):
+        """만료되지 않은 항목 (lock 보유 상태에서 호출)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def dense(self, lat: float, lng: float) -> bool:
+        """좌표가 속한 셀이 밀집(셀 호출이 maxResultCount를 채움)으로 기록되어 있는지"""
+        with self._lock:
+            entry = self._live_entry(geohash.encode(lat, lng, INDOOR_CELL_PRECISION))
+            return entry is not None and not entry[2]
+
+    def within_radius(self, lat: float, lng: float, places) -> List[Dict]:
+        """호출 원으로 받은 장소 중 (lat, lng) 기준 감지 반경 안의 장소 (좌표 없는 장소는 유지)"""
+        located = [
+            i for i, place in enumerate(places)
+            if place.get("location", {}).get("latitude") and place.get("location", {}).get("longitude")
+        ]
+        distances = geo.distances_from(
+            lat, lng,
+            [places[i]["location"]["latitude"] for i in located],
+            [places[i]["location"]["longitude"] for i in located]
+        ).tolist()
+        outside = {i for i, distance in zip(located, distances) if distance > self.radius}
+        return [place for i, place in enumerate(places) if i not in outside]
+
+    def put(self, cell: IndoorCell, places: List[Dict], complete: bool = True) -> None:
+        """
+        셀 호출 결과 저장
+
+        Args:
+            complete: False면 결과가 잘렸으므로 장소는 버리고 밀집 표시만 남김
+        """
+        self._store(cell.cell, tuple(places) if complete else (), complete)
+
+    def put_direct(self, lat: float, lng: float, places: List[Dict]) -> None:
+        """밀집 셀에서 사용자 좌표 + 감지 반경으로 직접 호출한 결과 저장 (정밀도 9 셀)"""
+        self._store(geohash.encode(lat, lng, DIRECT_CELL_PRECISION), tuple(places), True)
+
+    def _store(self, key: str, places: Tuple[Dict, ...], complete: bool) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, places, complete)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
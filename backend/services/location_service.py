@@ -1,8 +1,62 @@
+import base64
+import json
 import os
-import requests
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests.exceptions as req_exc
-from typing import Dict, List, Optional, Union
-import math
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from . import geo, http_client
+from .indoor_cache import IndoorPlaceCache
+from .place_tile_cache import PlaceTileCache
+from .merchant_store import MerchantStore
+from .place_cache import PlaceCache, open_now_from_periods
+from .single_flight import coalesce
+
+
+class _CategoryBatches:
+    """
+    iter_nearby_stores 결과: 카테고리별 (타입, 가맹점 목록)을 완료 순서대로 반복
+
+    반복을 시작하지 않았거나 중간에 멈춰도 close()를 부르면 아직 시작하지 않은 카테고리 호출은 취소된다.
+    이미 진행 중인 호출은 끝까지 실행되어 타일 캐시에 반영된다.
+    """
+
+    def __init__(self, cached_batches: List[Tuple[str, List[Dict]]], future_to_category: Dict):
+        self._cached_batches = cached_batches
+        self._future_to_category = future_to_category
+        self._batches = self._iterate()
+
+    def _iterate(self) -> Iterator[Tuple[str, List[Dict]]]:
+        yield from self._cached_batches
+        for future in as_completed(self._future_to_category):
+            category = self._future_to_category[future]
+            try:
+                stores = future.result().get('stores', [])
+            except Exception as e:
+                print(f"[Parallel Search Error] {category}: {e}")
+                continue
+            print(f"[Parallel Search] {category}: {len(stores)} stores")
+            yield category, stores
+
+    def __iter__(self) -> Iterator[Tuple[str, List[Dict]]]:
+        return self
+
+    def __next__(self) -> Tuple[str, List[Dict]]:
+        try:
+            return next(self._batches)
+        except StopIteration:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        cancelled = sum(future.cancel() for future in self._future_to_category)
+        if cancelled:
+            print(f"[Parallel Search] 시작 전 카테고리 호출 {cancelled}건 취소")
+        self._batches.close()
 
 
 class LocationService:
@@ -10,6 +64,36 @@ class LocationService:
     BASE_URL_PLACES_NEW = "https://places.googleapis.com/v1/places:searchNearby"
     BASE_URL_TEXT_SEARCH_NEW = "https://places.googleapis.com/v1/places:searchText"
 
+    # Nearby Search 1회 호출 최대 결과 수 (Places API 상한)
+    NEARBY_MAX_RESULTS = 20
+
+    # 실내 감지 주변 건물 검색 반경 (미터)
+    INDOOR_RADIUS = 30.0
+
+    # 주변 검색 한 페이지 최대 가맹점 수 (나머지는 next_page_token으로 이어서 조회)
+    MAX_PAGE_SIZE = 100
+
+    # 다음 페이지용으로 보관하는 병합 목록 최대 개수
+    PAGE_CURSOR_MAX_ENTRIES = 500
+
+    # 투기적 주변 검색 풀 크기 (동시에 진행 중인 투기적 검색이 이만큼이면 새 요청은 순차 실행)
+    SPECULATIVE_WORKERS = 8
+
+    # 자동완성 후보 좌표(Place Details) 병렬 조회 워커 수
+    DETAILS_FANOUT_WORKERS = 10
+
+    # 전체 카테고리 검색 공용 풀 크기 (워커 프로세스 전체의 동시 카테고리 호출 상한, 넘으면 대기열)
+    CATEGORY_SEARCH_WORKERS = 18
+
+    # 캐시/가맹점 저장소용 내부 필드 (응답에서는 제거, photo_name은 API 키 없는 사진 리소스 이름)
+    INTERNAL_STORE_FIELDS = frozenset(('photo_name', 'types'))
+
+    # 전체 카테고리 검색 시 병렬로 호출하는 Google Places 타입
+    ALL_CATEGORY_TYPES = [
+        'supermarket', 'convenience_store', 'cafe', 'restaurant',
+        'bakery', 'movie_theater', 'pharmacy', 'beauty_salon', 'gas_station'
+    ]
+
     # Category mapping to Google Places types (New API)
     CATEGORY_MAP = {
         'mart': ['supermarket', 'grocery_store'],
@@ -40,32 +124,89 @@ class LocationService:
         if self.enable_store_photos:
             print("[LocationService] Store photos enabled for home list")
 
-        # In-memory cache for photo URLs (place_id -> photo_url)
-        # Reduces API calls for repeated requests within same session
-        self._photo_cache: Dict[str, Optional[str]] = {}
-
-    def _extract_photo_url(self, place: Dict) -> Optional[str]:
-        """Extract first photo URL from place data"""
+        # 장소 상세/사진 2단계 캐시 (프로세스 내 LRU + place_cache 테이블)
+        self._place_cache = PlaceCache(
+            ttl_seconds=int(os.getenv("PLACE_CACHE_TTL", "86400")),
+            max_entries=int(os.getenv("PLACE_CACHE_SIZE", "2000"))
+        )
+
+        # Nearby Search 결과 타일 캐시 (PLACES_TILE_CACHE_TTL=0 이면 비활성화)
+        tile_cache_ttl = int(os.getenv("PLACES_TILE_CACHE_TTL", "600"))
+        self._tile_cache = PlaceTileCache(ttl_seconds=tile_cache_ttl) if tile_cache_ttl > 0 else None
+
+        # 실내 감지 주변 건물 셀 캐시 (INDOOR_CACHE_TTL=0 이면 비활성화)
+        indoor_cache_ttl = int(os.getenv("INDOOR_CACHE_TTL", "600"))
+        self._indoor_cache = (
+            IndoorPlaceCache(radius=self.INDOOR_RADIUS, ttl_seconds=indoor_cache_ttl)
+            if indoor_cache_ttl > 0 else None
+        )
+
+        # 본 적 있는 가맹점 로컬 저장소 + 공간 인덱스 (MERCHANT_CELL_TTL=0 이면 비활성화)
+        merchant_cell_ttl = int(os.getenv("MERCHANT_CELL_TTL", "86400"))
+        self._merchant_store = (
+            MerchantStore(
+                ttl_seconds=merchant_cell_ttl,
+                category_types=self.CATEGORY_MAP,
+                photo_url=self._photo_url,
+                max_merchants=int(os.getenv("MERCHANT_STORE_MAX_ENTRIES", "100000"))
+            )
+            if merchant_cell_ttl > 0 else None
+        )
+
+        # 다음 페이지용 병합 목록: 커서 id → (만료 시각, 목록) (PAGE_CURSOR_TTL=0 이면 보관하지 않음)
+        self.page_cursor_ttl = int(os.getenv("PAGE_CURSOR_TTL", "300"))
+        self._page_lists: 'OrderedDict[str, Tuple[float, Tuple[Dict, ...]]]' = OrderedDict()
+        self._page_lists_lock = threading.Lock()
+
+        # 실내 감지와 주변 검색을 동시에 시작하는 투기적 실행 (SPECULATIVE_NEARBY_SEARCH=false 이면 순차 실행)
+        self.speculative_search = os.getenv("SPECULATIVE_NEARBY_SEARCH", "true").lower() == "true"
+        self._search_executor = ThreadPoolExecutor(max_workers=self.SPECULATIVE_WORKERS, thread_name_prefix="nearby-search")
+        self._speculative_lock = threading.Lock()
+        self._speculative_inflight = 0
+
+        # 자동완성 후보 좌표 조회 병렬 풀 (요청 하나가 최대 10개, 워커 전체 동시 호출 상한)
+        self._details_executor = ThreadPoolExecutor(max_workers=self.DETAILS_FANOUT_WORKERS, thread_name_prefix="place-details")
+
+        # 전체 카테고리 검색 공용 풀 (투기적 검색이 이 풀에 제출하므로 _search_executor와 분리해 중첩 대기를 피함)
+        self._category_executor = ThreadPoolExecutor(
+            max_workers=self.CATEGORY_SEARCH_WORKERS, thread_name_prefix="category-search"
+        )
+
+    def _extract_photo_name(self, place: Dict) -> Optional[str]:
+        """Extract first photo name from place data"""
         photos = place.get("photos", [])
         if photos and len(photos) > 0:
-            photo_name = photos[0].get("name", "")
-            if photo_name:
-                return f"https://places.googleapis.com/v1/{photo_name}/media?maxHeightPx=400&maxWidthPx=400&key={self.google_api_key}"
+            return photos[0].get("name", "") or None
         return None
 
-    def calculate_distance(self, lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-        """Calculate distance between two points in meters using Haversine formula"""
-        R = 6371000  # Earth radius in meters
-
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        dlat = math.radians(lat2 - lat1)
-        dlng = math.radians(lng2 - lng1)
+    @classmethod
+    def _public_store(cls, store: Dict) -> Dict:
+        """응답용 가맹점 dict (내부 필드 제외한 복사본)"""
+        return {key: value for key, value in store.items() if key not in cls.INTERNAL_STORE_FIELDS}
 
-        a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlng/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+    def _photo_url(self, photo_name: Optional[str]) -> Optional[str]:
+        """Places photo name → 사진 URL (API 키 포함이므로 캐시에는 photo name만 저장)"""
+        if not photo_name:
+            return None
+        return f"https://places.googleapis.com/v1/{photo_name}/media?maxHeightPx=400&maxWidthPx=400&key={self.google_api_key}"
 
-        return R * c
+    def calculate_distance(self, lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+        """Calculate distance between two points in meters using Haversine formula"""
+        return geo.haversine(lat1, lng1, lat2, lng2)
+
+    @staticmethod
+    def _place_distances(lat: float, lng: float, places: List[Dict]) -> Tuple[List[Dict], List[float]]:
+        """Places API 원본 장소 중 좌표가 있는 장소와 (lat, lng)로부터의 거리 (한 번의 배열 연산)"""
+        located = [
+            place for place in places
+            if place.get("location", {}).get("latitude") and place.get("location", {}).get("longitude")
+        ]
+        distances = geo.distances_from(
+            lat, lng,
+            [place["location"]["latitude"] for place in located],
+            [place["location"]["longitude"] for place in located]
+        )
+        return located, distances.tolist()
 
     def detect_indoor(self, lat: float, lng: float, gps_accuracy: Optional[float] = None, staying_duration: Optional[int] = None) -> Dict:
         """
@@ -99,16 +240,144 @@ class LocationService:
 
         # Step 2: Check place density in 30m radius
         # If multiple places are densely packed, likely indoor (shopping mall, etc.)
+        actual_places = self._get_indoor_places(lat, lng)
+        if actual_places is None:
+            print(f"[Indoor Detection] 건물 감지 실패 - 기본값 반환")
+            return {
+                'indoor': False,
+                'building_name': None,
+                'address': ''
+            }
+
+        print(f"[Indoor Detection] 30m 반경 내 실제 건물: {len(actual_places)}개")
+
+        # Step 3: Combined signal analysis
+        # High GPS inaccuracy + dense places + long stay = indoor
+        is_gps_poor = gps_accuracy is not None and gps_accuracy > 30
+        is_dense_area = len(actual_places) >= 2
+        is_long_stay = staying_duration is not None and staying_duration >= 180
+
+        if is_gps_poor and is_dense_area and is_long_stay:
+            # Very likely indoor (shopping mall, etc.)
+            print(f"[Indoor Detection] 실내 판정: True (GPS 부정확 + 밀집 지역 + 장시간 체류)")
+            if actual_places:
+                closest = actual_places[0]
+                display_name = closest.get("displayName", {})
+                name = display_name.get("text", "") if isinstance(display_name, dict) else str(display_name)
+                return {
+                    'indoor': True,
+                    'building_name': name,
+                    'address': closest.get('formattedAddress', '')
+                }
+
+        # Step 4: Find closest place for distance-based detection
+        if actual_places:
+            # Find closest place
+            located, distances = self._place_distances(lat, lng, actual_places)
+
+            if located:
+                closest_idx = min(range(len(located)), key=distances.__getitem__)
+                distance = distances[closest_idx]
+                place = located[closest_idx]
+
+                display_name = place.get("displayName", {})
+                building_name = display_name.get("text", "") if isinstance(display_name, dict) else str(display_name)
+                address = place.get("formattedAddress", "")
+                place_types = place.get("types", [])
+
+                print(f"[Indoor Detection] 가장 가까운 장소: {building_name}")
+                print(f"[Indoor Detection] 거리: {distance:.1f}m")
+                print(f"[Indoor Detection] 주소: {address}")
+                print(f"[Indoor Detection] 타입: {place_types}")
+
+                # Distance-based threshold
+                STRICT_THRESHOLD = 10  # meters
+                RELAXED_THRESHOLD = 20  # meters (with long stay)
+
+                is_long_stay = staying_duration is not None and staying_duration >= 180
+
+                if is_long_stay and distance <= RELAXED_THRESHOLD:
+                    is_indoor = True
+                    print(f"[Indoor Detection] 건물 내부 판정: True (3분 체류 + {distance:.1f}m)")
+                elif distance <= STRICT_THRESHOLD:
+                    is_indoor = True
+                    print(f"[Indoor Detection] 건물 내부 판정: True (거리 {distance:.1f}m)")
+                else:
+                    is_indoor = False
+                    print(f"[Indoor Detection] 건물 내부 판정: False (거리 {distance:.1f}m)")
+
+                return {
+                    'indoor': is_indoor,
+                    'building_name': building_name if is_indoor else None,
+                    'address': address
+                }
+
+        return {
+            'indoor': False,
+            'building_name': None,
+            'address': ''
+        }
+
+    def _get_indoor_places(self, lat: float, lng: float) -> Optional[List[Dict]]:
+        """
+        실내 감지 반경 안의 실제 건물 (셀 캐시 → Places 호출)
+
+        Returns:
+            Places API 장소 목록 (도로/행정구역 제외), 호출 실패 시 None
+        """
+        if self._indoor_cache is None:
+            return self._buildings(self._fetch_indoor_places(lat, lng, self.INDOOR_RADIUS))
+
+        cached = self._indoor_cache.get(lat, lng)
+        if cached is not None:
+            print(f"[Indoor Detection] 셀 캐시 사용")
+            return cached
+
+        if not self._indoor_cache.dense(lat, lng):
+            # 셀 전체를 덮는 반경으로 호출해 저장한 뒤 실제 좌표 기준으로 필터링
+            cell = self._indoor_cache.cell_for(lat, lng)
+            results = self._fetch_indoor_places(cell.lat, cell.lng, cell.radius)
+            if results is None:
+                return None
+            if len(results) < self.NEARBY_MAX_RESULTS:
+                places = self._buildings(results)
+                self._indoor_cache.put(cell, places)
+                return self._indoor_cache.within_radius(lat, lng, places)
+            # 넓힌 원의 결과가 잘림 → 실제 감지 반경 안의 건물이 빠졌을 수 있으므로 저장하지 않음
+            print(f"[Indoor Detection] 밀집 셀, 감지 반경으로 다시 호출")
+            self._indoor_cache.put(cell, [], complete=False)
+
+        # 밀집 셀: 사용자 좌표 + 감지 반경으로 직접 호출 (캐시 없을 때와 같은 결과)
+        places = self._buildings(self._fetch_indoor_places(lat, lng, self.INDOOR_RADIUS))
+        if places is not None:
+            self._indoor_cache.put_direct(lat, lng, places)
+        return places
+
+    @staticmethod
+    def _buildings(results: Optional[List[Dict]]) -> Optional[List[Dict]]:
+        """Places 결과에서 도로/행정구역 등 건물이 아닌 장소 제외 (호출 실패 None은 그대로)"""
+        if results is None:
+            return None
+        # Filter out non-buildings (roads, routes, etc.)
+        non_building_types = ['route', 'street_address', 'locality', 'political', 'premise']
+        return [
+            r for r in results
+            if not all(t in non_building_types for t in r.get('types', []))
+        ]
+
+    @coalesce('indoor_places')
+    def _fetch_indoor_places(self, lat: float, lng: float, radius: float) -> Optional[List[Dict]]:
+        """실내 감지용 Nearby Search 호출 (캐시 없음, 건물 필터 전 원본 결과), 실패 시 None"""
         request_body = {
             "includedTypes": ["store", "establishment"],
-            "maxResultCount": 20,
+            "maxResultCount": self.NEARBY_MAX_RESULTS,
             "locationRestriction": {
                 "circle": {
                     "center": {
                         "latitude": lat,
                         "longitude": lng
                     },
-                    "radius": 30.0
+                    "radius": float(radius)
                 }
             },
             "languageCode": "ko"
@@ -121,8 +390,9 @@ class LocationService:
         }
 
         try:
-            response = requests.post(
+            response = http_client.post(
                 self.BASE_URL_PLACES_NEW,
+                upstream='google_places_nearby',
                 json=request_body,
                 headers=headers,
                 timeout=10
@@ -130,117 +400,123 @@ class LocationService:
 
             if response.status_code != 200:
                 print(f"[Indoor Detection] Google Places API error: {response.status_code}")
-                print(f"[Indoor Detection] 건물 감지 실패 - 기본값 반환")
-                return {
-                    'indoor': False,
-                    'building_name': None,
-                    'address': ''
-                }
+                return None
 
-            response.raise_for_status()
+            return response.json().get("places", [])
+        except Exception as e:
+            print(f"[Indoor Detection] Error: {str(e)[:100]}")
+            return None
 
-            data = response.json()
-            results = data.get("places", [])
+    def find_stores(
+        self,
+        lat: float,
+        lng: float,
+        user_lat: float,
+        user_lng: float,
+        radius: int,
+        category: Optional[str] = None,
+        pagetoken: Optional[str] = None,
+        gps_accuracy: Optional[float] = None,
+        staying_duration: Optional[int] = None,
+        page_size: Optional[int] = None
+    ) -> Dict:
+        """
+        실내/실외 감지 후 상황에 맞는 가맹점 검색
 
-            # Filter out non-buildings (roads, routes, etc.)
-            non_building_types = ['route', 'street_address', 'locality', 'political', 'premise']
-            actual_places = [
-                r for r in results
-                if not all(t in non_building_types for t in r.get('types', []))
-            ]
+        - 실내 + 건물명 확인: 건물 내 Text Search (최대 6개), 결과가 없으면 주변 검색으로 폴백
+        - 그 외: 주변 Nearby Search
 
-            print(f"[Indoor Detection] 30m 반경 내: {len(results)}개 장소 (실제 건물: {len(actual_places)}개)")
-
-            # Step 3: Combined signal analysis
-            # High GPS inaccuracy + dense places + long stay = indoor
-            is_gps_poor = gps_accuracy is not None and gps_accuracy > 30
-            is_dense_area = len(actual_places) >= 2
-            is_long_stay = staying_duration is not None and staying_duration >= 180
-
-            if is_gps_poor and is_dense_area and is_long_stay:
-                # Very likely indoor (shopping mall, etc.)
-                print(f"[Indoor Detection] 실내 판정: True (GPS 부정확 + 밀집 지역 + 장시간 체류)")
-                if actual_places:
-                    closest = actual_places[0]
-                    display_name = closest.get("displayName", {})
-                    name = display_name.get("text", "") if isinstance(display_name, dict) else str(display_name)
-                    return {
-                        'indoor': True,
-                        'building_name': name,
-                        'address': closest.get('formattedAddress', '')
-                    }
+        투기적 실행 모드에서는 주변 검색을 실내 감지와 동시에 시작하고, 건물명이 확인되면 곧바로
+        건물 내 검색을 시작한다. 어떤 결과를 쓸지는 순차 실행과 같은 판단 로직으로 고르므로
+        응답은 같고, 최악 지연은 호출 시간의 합이 아니라 (실내 감지 + 건물 검색)과 주변 검색 중 큰 값이 된다.
+        건물 내 검색 결과를 쓰면 아직 시작하지 않은 주변 검색은 취소하고, 이미 진행 중이면 결과는 버려지지만
+        타일 캐시/가맹점 저장소에는 반영된다.
+        풀의 모든 워커가 다른 요청의 투기적 검색을 처리 중이면 풀 대기열에 쌓지 않고 순차 실행으로 처리한다.
 
-            # Step 4: Find closest place for distance-based detection
-            if actual_places:
-                # Sort by distance
-                places_with_distance = []
-                for place in actual_places:
-                    location_data = place.get("location", {})
-                    place_lat = location_data.get("latitude")
-                    place_lng = location_data.get("longitude")
-
-                    if place_lat and place_lng:
-                        distance = self.calculate_distance(lat, lng, place_lat, place_lng)
-                        places_with_distance.append({
-                            'place': place,
-                            'distance': distance
-                        })
-
-                if places_with_distance:
-                    places_with_distance.sort(key=lambda x: x['distance'])
-                    closest = places_with_distance[0]
-                    distance = closest['distance']
-                    place = closest['place']
-
-                    display_name = place.get("displayName", {})
-                    building_name = display_name.get("text", "") if isinstance(display_name, dict) else str(display_name)
-                    address = place.get("formattedAddress", "")
-                    place_types = place.get("types", [])
-
-                    print(f"[Indoor Detection] 가장 가까운 장소: {building_name}")
-                    print(f"[Indoor Detection] 거리: {distance:.1f}m")
-                    print(f"[Indoor Detection] 주소: {address}")
-                    print(f"[Indoor Detection] 타입: {place_types}")
-
-                    # Distance-based threshold
-                    STRICT_THRESHOLD = 10  # meters
-                    RELAXED_THRESHOLD = 20  # meters (with long stay)
-
-                    is_long_stay = staying_duration is not None and staying_duration >= 180
-
-                    if is_long_stay and distance <= RELAXED_THRESHOLD:
-                        is_indoor = True
-                        print(f"[Indoor Detection] 건물 내부 판정: True (3분 체류 + {distance:.1f}m)")
-                    elif distance <= STRICT_THRESHOLD:
-                        is_indoor = True
-                        print(f"[Indoor Detection] 건물 내부 판정: True (거리 {distance:.1f}m)")
-                    else:
-                        is_indoor = False
-                        print(f"[Indoor Detection] 건물 내부 판정: False (거리 {distance:.1f}m)")
-
-                    return {
-                        'indoor': is_indoor,
-                        'building_name': building_name if is_indoor else None,
-                        'address': address
-                    }
+        Returns:
+            {
+                'location_info': detect_indoor 결과,
+                'stores': 가맹점 목록,
+                'next_page_token': Optional next page token
+            }
+            주변 검색 실패 시 'stores' 대신 'error', 'message'
+        """
+        nearby_future = self._start_speculative_search(lat, lng, radius, category, pagetoken, page_size)
 
-        except Exception as e:
-            print(f"[Indoor Detection] Error: {str(e)[:100]}")
-            print(f"[Indoor Detection] 건물 감지 실패 - 기본값 반환")
+        def nearby_result() -> Dict:
+            if nearby_future is not None:
+                return nearby_future.result()
+            return self.search_nearby_stores(lat, lng, radius, category, pagetoken, page_size)
+
+        location_info = self.detect_indoor(lat, lng, gps_accuracy, staying_duration)
+        print(f"[Find Stores] 위치 정보: indoor={location_info['indoor']}, building={location_info['building_name']}")
 
+        if location_info['indoor'] and location_info['building_name']:
+            print(f"[Find Stores] 건물 내부 검색: {location_info['building_name']}")
+            stores = self.search_building_stores(location_info['building_name'], user_lat, user_lng)
+
+            if len(stores) > 0:
+                if nearby_future is not None:
+                    nearby_future.cancel()
+                # Limit to 6 stores when inside building
+                print(f"[Find Stores] 건물 내부 - 최대 6개 가맹점으로 제한")
+                return {
+                    'location_info': location_info,
+                    'stores': stores[:6],
+                    'next_page_token': None
+                }
+            print(f"[Find Stores] 건물 검색 실패, 주변 검색으로 전환...")
+
+        result = nearby_result()
+        if 'error' in result:
+            return {
+                'location_info': location_info,
+                'error': result['error'],
+                'message': result['message']
+            }
         return {
-            'indoor': False,
-            'building_name': None,
-            'address': ''
+            'location_info': location_info,
+            'stores': result['stores'],
+            'next_page_token': result['next_page_token']
         }
 
+    def _start_speculative_search(
+        self,
+        lat: float,
+        lng: float,
+        radius: int,
+        category: Optional[str],
+        pagetoken: Optional[str],
+        page_size: Optional[int]
+    ):
+        """투기적 주변 검색 시작, 비활성화 또는 풀 포화(진행 중인 검색 >= SPECULATIVE_WORKERS)면 None"""
+        if not self.speculative_search:
+            return None
+        with self._speculative_lock:
+            if self._speculative_inflight >= self.SPECULATIVE_WORKERS:
+                print("[Find Stores] 투기적 검색 풀 포화, 순차 실행")
+                return None
+            self._speculative_inflight += 1
+
+        future = self._search_executor.submit(
+            self.search_nearby_stores, lat, lng, radius, category, pagetoken, page_size
+        )
+        # 완료/취소 모두 콜백이 호출되어 자리를 반납
+        future.add_done_callback(self._release_speculative_slot)
+        return future
+
+    def _release_speculative_slot(self, _future) -> None:
+        with self._speculative_lock:
+            self._speculative_inflight -= 1
+
     def search_nearby_stores(
         self,
         lat: float,
         lng: float,
         radius: int,
         category: Optional[str] = None,
-        _pagetoken: Optional[str] = None
+        pagetoken: Optional[str] = None,
+        page_size: Optional[int] = None
     ) -> Dict:
         """
         Search nearby stores using Google Nearby Search API (New) with parallel execution
@@ -253,59 +529,157 @@ class LocationService:
             lng: Longitude
             radius: Search radius in meters (required, calculated from map viewport)
             category: Optional category filter
-            _pagetoken: Reserved for future pagination implementation (currently unused)
+            pagetoken: 이전 응답의 next_page_token (같은 lat/lng/radius/category로 호출)
+            page_size: 페이지당 가맹점 수 (기본/최대 MAX_PAGE_SIZE)
 
         Returns:
             {
                 'stores': List of stores with coordinates,
-                'next_page_token': Optional next page token
+                'next_page_token': 다음 페이지가 있으면 커서, 없으면 None
             }
         """
+        query = f"{lat:.6f},{lng:.6f},{radius},{category or ''}"
+        offset, list_id = 0, None
+        if pagetoken:
+            cursor = self._decode_page_token(pagetoken, query)
+            if cursor is None:
+                print(f"[Pagination] 검색 조건이 다른 커서 무시: {pagetoken}")
+            else:
+                offset, list_id = cursor
+
+        # 이 워커가 보관 중인 병합 목록이 있으면 검색 없이 이어서 자름
+        stores = self._get_page_list(list_id) if list_id else None
+        if stores is None:
+            list_id = None
+            # When searching all categories, use parallel execution
+            if category is None:
+                result = self._search_all_categories_parallel(lat, lng, radius)
+            else:
+                # Single category search
+                if category in self.CATEGORY_MAP:
+                    included_types = self.CATEGORY_MAP[category]
+                else:
+                    included_types = [category]
+                result = self._search_single_type(lat, lng, radius, included_types)
+
+            if 'error' in result:
+                return result
+            stores = result['stores']
+        return self._paginate(stores, query, offset, list_id, page_size)
+
+    def _paginate(
+        self,
+        stores: Sequence[Dict],
+        query: str,
+        offset: int,
+        list_id: Optional[str],
+        page_size: Optional[int]
+    ) -> Dict:
+        """
+        거리순 병합 목록에서 offset부터 한 페이지를 잘라 반환
 
-        # When searching all categories, use parallel execution
-        if category is None:
-            return self._search_all_categories_parallel(lat, lng, radius)
+        남은 가맹점이 있으면 병합 목록을 커서 id로 PAGE_CURSOR_TTL초 동안 보관하고, 같은 워커가 받은 다음 페이지 요청은
+        검색을 다시 하지 않고 보관한 목록에서 자른다. 보관 목록은 워커(프로세스)마다 따로라서, 다른 워커가 받거나
+        만료된 커서는 검색을 다시 실행한다. 이때 타일 캐시/가맹점 저장소가 없거나 만료되었으면 Places API를 다시 호출하고,
+        결과가 달라졌으면 페이지 사이에 가맹점이 빠지거나 중복될 수 있다.
+        """
+        page_size = min(max(page_size or self.MAX_PAGE_SIZE, 1), self.MAX_PAGE_SIZE)
+        end = offset + page_size
+        next_page_token = None
+        if end < len(stores):
+            if list_id is None:
+                list_id = self._put_page_list(stores)
+            next_page_token = self._encode_page_token(query, end, list_id)
+        return {
+            'stores': [dict(store) for store in stores[offset:end]],
+            'next_page_token': next_page_token
+        }
 
-        # Single category search
-        if category and category in self.CATEGORY_MAP:
-            included_types = self.CATEGORY_MAP[category]
-        elif category:
-            included_types = [category]
-        else:
-            included_types = []
+    def _put_page_list(self, stores: Sequence[Dict]) -> Optional[str]:
+        """병합 목록 보관 후 커서 id 반환 (보관 비활성화면 None)"""
+        if self.page_cursor_ttl <= 0:
+            return None
+        list_id = uuid.uuid4().hex[:16]
+        with self._page_lists_lock:
+            self._page_lists[list_id] = (time.monotonic() + self.page_cursor_ttl, tuple(stores))
+            while len(self._page_lists) > self.PAGE_CURSOR_MAX_ENTRIES:
+                self._page_lists.popitem(last=False)
+        return list_id
+
+    def _get_page_list(self, list_id: str) -> Optional[Tuple[Dict, ...]]:
+        with self._page_lists_lock:
+            entry = self._page_lists.get(list_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._page_lists[list_id]
+                return None
+            self._page_lists.move_to_end(list_id)
+            return entry[1]
+
+    @staticmethod
+    def _encode_page_token(query: str, offset: int, list_id: Optional[str]) -> str:
+        payload = {'q': query, 'o': offset}
+        if list_id:
+            payload['c'] = list_id
+        encoded = json.dumps(payload, separators=(',', ':'))
+        return base64.urlsafe_b64encode(encoded.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def _decode_page_token(pagetoken: str, query: str) -> Optional[Tuple[int, Optional[str]]]:
+        """커서 → (오프셋, 보관 목록 id), 형식이 잘못됐거나 다른 검색 조건의 커서면 None"""
+        try:
+            padded = pagetoken + '=' * (-len(pagetoken) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            offset = int(payload['o'])
+            list_id = payload.get('c')
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+        if payload.get('q') != query or offset < 0 or not isinstance(list_id, (str, type(None))):
+            return None
+        return offset, list_id
+
+    def iter_nearby_stores(self, lat: float, lng: float, radius: int) -> _CategoryBatches:
+        """
+        전체 카테고리 검색 결과를 카테고리별로 완료되는 순서대로 (카테고리 타입, 가맹점 목록) 반환
+
+        캐시에 있는 카테고리가 먼저 나오고, 나머지는 업스트림 호출이 끝나는 대로 나온다.
+        호출은 이 메서드를 부르는 즉시 공용 풀에 제출되므로 반복을 시작하기 전에 다른 작업(실내 감지 등)을 해도 된다.
+        결과를 끝까지 쓰지 않는 호출자는 close()로 아직 시작하지 않은 호출을 취소해야 한다.
+        카테고리 간 중복 가맹점은 걸러지지 않는다.
+        """
+        print(f"[Parallel Search] Starting parallel search for all categories")
 
-        return self._search_single_type(lat, lng, radius, included_types)
+        # 타일 캐시에 있는 카테고리는 바로 사용하고, 없는 카테고리만 업스트림 호출
+        cached_batches = []
+        missing_categories = []
+        for cat in self.ALL_CATEGORY_TYPES:
+            cached = self._get_cached_stores(lat, lng, radius, [cat])
+            if cached is None:
+                missing_categories.append(cat)
+            else:
+                cached_batches.append((cat, cached))
+        if cached_batches:
+            print(f"[Parallel Search] Tile cache hit: {len(cached_batches)}/{len(self.ALL_CATEGORY_TYPES)} categories")
+
+        # Execute all category searches in parallel (워커 공용 풀)
+        future_to_category = {
+            self._category_executor.submit(self._search_single_type, lat, lng, radius, [cat]): cat
+            for cat in missing_categories
+        }
+        return _CategoryBatches(cached_batches, future_to_category)
 
     def _search_all_categories_parallel(self, lat: float, lng: float, radius: int) -> Dict:
         """
         Search all categories in parallel for fast response
         """
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-
-        print(f"[Parallel Search] Starting parallel search for all categories")
-
         all_stores = []
-        categories_to_search = [
-            'supermarket', 'convenience_store', 'cafe', 'restaurant',
-            'bakery', 'movie_theater', 'pharmacy', 'beauty_salon', 'gas_station'
-        ]
-
-        # Execute all category searches in parallel
-        with ThreadPoolExecutor(max_workers=9) as executor:
-            future_to_category = {
-                executor.submit(self._search_single_type, lat, lng, radius, [cat]): cat
-                for cat in categories_to_search
-            }
-
-            for future in as_completed(future_to_category):
-                category = future_to_category[future]
-                try:
-                    result = future.result()
-                    stores = result.get('stores', [])
-                    all_stores.extend(stores)
-                    print(f"[Parallel Search] {category}: {len(stores)} stores")
-                except Exception as e:
-                    print(f"[Parallel Search Error] {category}: {e}")
+        batches = self.iter_nearby_stores(lat, lng, radius)
+        try:
+            for _category, stores in batches:
+                all_stores.extend(stores)
+        finally:
+            batches.close()
 
         # Remove duplicates based on place_id
         seen = set()
@@ -316,24 +690,98 @@ class LocationService:
                 seen.add(place_id)
                 unique_stores.append(store)
 
-        # Sort by distance
-        unique_stores.sort(key=lambda x: x['distance'])
+        # Sort by distance (같은 거리는 place_id 순 - 카테고리 완료 순서가 달라도 페이지 경계가 같도록)
+        unique_stores.sort(key=lambda x: (x['distance'], x['place_id']))
 
         print(f"[Parallel Search] Total: {len(all_stores)} stores, Unique: {len(unique_stores)}")
 
-        # Limit to 100 stores max
-        final_stores = unique_stores[:100]
-
+        # 페이지 단위 자르기는 search_nearby_stores에서 (MAX_PAGE_SIZE개씩)
         return {
-            'stores': final_stores,
+            'stores': unique_stores,
             'next_page_token': None
         }
 
+    def _get_cached_stores(self, lat: float, lng: float, radius: int, included_types: List[str]) -> Optional[List[Dict]]:
+        """로컬 가맹점 인덱스(셀이 신선할 때) → 타일 캐시 순으로 조회, 둘 다 없으면 None"""
+        if self._merchant_store is not None:
+            stores = self._merchant_store.query(lat, lng, radius, included_types)
+            if stores is not None:
+                return stores
+        if self._tile_cache is None:
+            return None
+        return self._tile_cache.get(lat, lng, radius, included_types)
+
+    def record_known_merchants(self, stores: List[Dict], source: str = 'places') -> None:
+        """검색 외 경로로 알게 된 가맹점을 로컬 저장소에 추가 (셀 신선도는 바꾸지 않음)"""
+        if self._merchant_store is not None:
+            self._merchant_store.upsert(stores, source=source)
+
     def _search_single_type(self, lat: float, lng: float, radius: int, included_types: List[str]) -> Dict:
         """
         Search a single type using Nearby Search API (New)
         Note: photos are NOT fetched by default to reduce API costs.
         Set ENABLE_STORE_PHOTOS=true to include photos (for demos).
+
+        결과는 geohash 타일 단위로 캐시되며, 타일 캐시가 검색 원을 덮으면 업스트림 호출 없이 반환
+        로컬 가맹점 인덱스의 셀이 모두 신선하면 그 결과를 먼저 사용하고, 호출 결과는 인덱스에도 기록
+        """
+        cached = self._get_cached_stores(lat, lng, radius, included_types)
+        if cached is not None:
+            return {
+                'stores': [self._public_store(store) for store in cached],
+                'next_page_token': None
+            }
+
+        if self._tile_cache is None:
+            places = self._fetch_and_record_nearby(lat, lng, radius, included_types)
+        elif self._tile_cache.dense(lat, lng, radius, included_types):
+            # 밀집 타일: 잘릴 것이 확실한 타일 호출은 건너뛰고 요청 원으로 호출해 따로 저장
+            places = self._fetch_direct_nearby(lat, lng, radius, included_types)
+        else:
+            # 타일 전체를 덮는 반경으로 호출해 저장한 뒤 요청 원으로 필터링
+            tile = self._tile_cache.tile_for(lat, lng, radius)
+            places = self._fetch_and_record_nearby(tile.lat, tile.lng, tile.radius, included_types, tile)
+            if places is not None and len(places) >= self.NEARBY_MAX_RESULTS:
+                # 타일 결과가 잘림 (타일은 이미 밀집으로 표시됨) → 요청 원의 장소가 빠졌을 수 있으므로 요청 원으로 다시 호출
+                places = self._fetch_direct_nearby(lat, lng, radius, included_types)
+
+        return {
+            'stores': [self._public_store(store) for store in geo.stores_within(lat, lng, places or [], radius)],
+            'next_page_token': None
+        }
+
+    @coalesce('nearby_places')
+    def _fetch_and_record_nearby(self, lat: float, lng: float, radius: float, included_types: List[str], tile=None) -> Optional[List[Dict]]:
+        """
+        Nearby Search 호출 후 타일 캐시(tile이 있으면)와 로컬 가맹점 저장소에 기록
+
+        같은 타일/타입의 동시 캐시 미스는 호출 하나로 병합되어 업스트림 호출과 저장이 한 번만 일어남
+        """
+        places = self._fetch_nearby_places(lat, lng, radius, included_types)
+        if places is None:
+            return None
+        if tile is not None:
+            self._tile_cache.put(tile, included_types, places, complete=len(places) < self.NEARBY_MAX_RESULTS)
+        if self._merchant_store is not None:
+            self._merchant_store.record_search(
+                lat, lng, radius, included_types, places,
+                complete=len(places) < self.NEARBY_MAX_RESULTS
+            )
+        return places
+
+    def _fetch_direct_nearby(self, lat: float, lng: float, radius: float, included_types: List[str]) -> Optional[List[Dict]]:
+        """밀집 타일에서 요청 원으로 호출하고 결과를 타일 캐시의 직접 호출 항목으로 저장"""
+        places = self._fetch_and_record_nearby(lat, lng, radius, included_types)
+        if places is not None:
+            self._tile_cache.put_direct(lat, lng, radius, included_types, places)
+        return places
+
+    def _fetch_nearby_places(self, lat: float, lng: float, radius: float, included_types: List[str]) -> Optional[List[Dict]]:
+        """
+        Nearby Search API 호출 (캐시 없음)
+
+        Returns:
+            장소 목록 (distance 제외), 호출 실패 시 None
         """
         field_mask = "places.id,places.displayName,places.formattedAddress,places.location,places.types"
         if self.enable_store_photos:
@@ -350,7 +798,7 @@ class LocationService:
         try:
             request_body = {
                 "includedTypes": included_types,
-                "maxResultCount": 20,
+                "maxResultCount": self.NEARBY_MAX_RESULTS,
                 "locationRestriction": {
                     "circle": {
                         "center": {
@@ -363,8 +811,9 @@ class LocationService:
                 "languageCode": "ko"
             }
 
-            response = requests.post(
+            response = http_client.post(
                 self.BASE_URL_PLACES_NEW,
+                upstream='google_places_nearby',
                 json=request_body,
                 headers=headers,
                 timeout=10
@@ -383,15 +832,14 @@ class LocationService:
                 if not place_lat or not place_lng:
                     continue
 
-                distance = self.calculate_distance(lat, lng, place_lat, place_lng)
                 place_types_list = place.get("types", [])
                 detected_category = self._google_types_to_category(place_types_list)
 
                 display_name = place.get("displayName", {})
                 name = display_name.get("text", "") if isinstance(display_name, dict) else str(display_name)
 
-                # Extract photo URL if enabled
-                photo_url = self._extract_photo_url(place) if self.enable_store_photos else None
+                # Extract photo name if enabled (URL은 API 키를 붙여 응답에만 사용)
+                photo_name = self._extract_photo_name(place) if self.enable_store_photos else None
 
                 store = {
                     'name': name,
@@ -399,22 +847,20 @@ class LocationService:
                     'address': place.get('formattedAddress', ''),
                     'latitude': place_lat,
                     'longitude': place_lng,
-                    'distance': int(distance),
                     'place_id': place.get('id', ''),
-                    'photo_url': photo_url
+                    'photo_name': photo_name,
+                    'photo_url': self._photo_url(photo_name),
+                    'types': place_types_list
                 }
                 all_stores.append(store)
 
         except Exception as e:
             print(f"[Search Error] {included_types}: {e}")
+            return None
 
-        all_stores.sort(key=lambda x: x['distance'])
-
-        return {
-            'stores': all_stores,
-            'next_page_token': None
-        }
+        return all_stores
 
+    @coalesce('building_stores')
     def search_building_stores(self, building_name: str, user_lat: float, user_lng: float) -> Union[List[Dict], Dict]:
         """
         Search stores within a specific building using Text Search API (New)
@@ -459,8 +905,9 @@ class LocationService:
         print(f"[Building Stores New] 위치: {user_lat}, {user_lng}")
 
         try:
-            response = requests.post(
+            response = http_client.post(
                 self.BASE_URL_TEXT_SEARCH_NEW,
+                upstream='google_places_text',
                 json=request_body,
                 headers=headers,
                 timeout=10
@@ -472,17 +919,13 @@ class LocationService:
 
             print(f"[Building Stores New] 검색 결과: {len(places)}개 장소")
 
-            stores = []
-            for place in places:
-                location_data = place.get("location", {})
-                place_lat = location_data.get("latitude")
-                place_lng = location_data.get("longitude")
-
-                if not place_lat or not place_lng:
-                    continue
+            # Calculate actual distances
+            located, distances = self._place_distances(user_lat, user_lng, places)
 
-                # Calculate actual distance
-                distance = self.calculate_distance(user_lat, user_lng, place_lat, place_lng)
+            stores = []
+            for place, distance in zip(located, distances):
+                place_lat = place["location"]["latitude"]
+                place_lng = place["location"]["longitude"]
 
                 # Filter out places that are too far (> 200m)
                 if distance > 200:
@@ -496,8 +939,8 @@ class LocationService:
                 display_name = place.get("displayName", {})
                 name = display_name.get("text", "") if isinstance(display_name, dict) else str(display_name)
 
-                # Extract photo URL if enabled
-                photo_url = self._extract_photo_url(place) if self.enable_store_photos else None
+                # Extract photo name if enabled (URL은 API 키를 붙여 응답에만 사용)
+                photo_name = self._extract_photo_name(place) if self.enable_store_photos else None
 
                 store = {
                     'name': name,
@@ -508,7 +951,8 @@ class LocationService:
                     'distance': int(distance),
                     'place_id': place.get('id', ''),
                     'building': building_name,
-                    'photo_url': photo_url
+                    'photo_name': photo_name,
+                    'photo_url': self._photo_url(photo_name)
                 }
                 stores.append(store)
                 print(f"[Building Stores New] - {name} ({distance:.1f}m)")
@@ -517,8 +961,9 @@ class LocationService:
             stores.sort(key=lambda x: x['distance'])
 
             print(f"[Building Stores New] 최종 결과: {len(stores)}개 가맹점")
+            self.record_known_merchants(stores)
 
-            return stores
+            return [self._public_store(store) for store in stores]
 
         except (req_exc.Timeout, req_exc.ConnectionError) as e:
             print(f"[Network Error] Building Stores API New 요청 실패 (재시도 가능): {e}")
@@ -599,10 +1044,14 @@ class LocationService:
         """Map single Google Place type to our category (deprecated, use _google_types_to_category)"""
         return self._google_types_to_category([google_type])
 
+    @coalesce('place_details')
     def get_place_details(self, place_id: str) -> Optional[Dict]:
         """
         Get detailed information about a place using Google Places Details API (New)
 
+        장소 캐시(프로세스 내 LRU → place_cache 테이블)에 있으면 API를 호출하지 않으며,
+        이때 opening_hours.open_now는 저장된 영업시간(periods)으로 현재 시각 기준 다시 계산한다.
+
         Args:
             place_id: Google Place ID
 
@@ -623,17 +1072,23 @@ class LocationService:
                 'types': List[str]
             }
         """
+        cached = self._place_cache.get(place_id, 'details')
+        if cached is not None:
+            print(f"[Place Cache Hit] details {place_id}")
+            return self._build_place_details(place_id, cached, live=False)
+
         BASE_URL_PLACE_DETAILS = "https://places.googleapis.com/v1/places"
 
         headers = {
             "Content-Type": "application/json",
             "X-Goog-Api-Key": self.google_api_key,
-            "X-Goog-FieldMask": "id,displayName,formattedAddress,nationalPhoneNumber,websiteUri,rating,userRatingCount,regularOpeningHours,photos,priceLevel,types"
+            "X-Goog-FieldMask": "id,displayName,formattedAddress,nationalPhoneNumber,websiteUri,rating,userRatingCount,regularOpeningHours,photos,priceLevel,types,utcOffsetMinutes"
         }
 
         try:
-            response = requests.get(
+            response = http_client.get(
                 f"{BASE_URL_PLACE_DETAILS}/{place_id}",
+                upstream='google_places_details',
                 headers=headers,
                 timeout=10
             )
@@ -641,22 +1096,11 @@ class LocationService:
 
             data = response.json()
 
-            # Extract photo URLs
-            photos = []
-            for photo in data.get("photos", [])[:5]:  # Max 5 photos
-                photo_name = photo.get("name", "")
-                if photo_name:
-                    photo_url = f"https://places.googleapis.com/v1/{photo_name}/media?maxHeightPx=400&maxWidthPx=400&key={self.google_api_key}"
-                    photos.append(photo_url)
-
-            # Extract opening hours
-            opening_hours = None
-            regular_hours = data.get("regularOpeningHours", {})
-            if regular_hours:
-                opening_hours = {
-                    'open_now': regular_hours.get("openNow", False),
-                    'weekday_text': regular_hours.get("weekdayDescriptions", [])
-                }
+            # Extract photo names (Max 5 photos)
+            photo_names = [
+                photo.get("name", "") for photo in data.get("photos", [])[:5]
+                if photo.get("name", "")
+            ]
 
             # Map price level
             price_level_map = {
@@ -671,28 +1115,69 @@ class LocationService:
             display_name = data.get("displayName", {})
             name = display_name.get("text", "") if isinstance(display_name, dict) else str(display_name)
 
-            return {
-                'place_id': place_id,
+            regular_hours = data.get("regularOpeningHours", {})
+            payload = {
                 'name': name,
                 'address': data.get('formattedAddress', ''),
                 'phone': data.get('nationalPhoneNumber', ''),
                 'website': data.get('websiteUri', ''),
                 'rating': data.get('rating'),
                 'user_ratings_total': data.get('userRatingCount'),
-                'opening_hours': opening_hours,
-                'photos': photos,
+                'opening_hours': {
+                    'open_now': regular_hours.get("openNow", False),
+                    'weekday_text': regular_hours.get("weekdayDescriptions", []),
+                    'periods': regular_hours.get("periods", []),
+                    'utc_offset_minutes': data.get("utcOffsetMinutes"),
+                } if regular_hours else None,
+                'photo_names': photo_names,
                 'price_level': price_level,
                 'types': data.get('types', [])
             }
+            self._place_cache.put(place_id, 'details', payload)
+            if photo_names:
+                self._place_cache.put(place_id, 'photo', {'photo_name': photo_names[0]})
+
+            return self._build_place_details(place_id, payload, live=True)
 
         except Exception as e:
             print(f"[Place Details Error] {place_id}: {e}")
             return None
 
+    def _build_place_details(self, place_id: str, payload: Dict, live: bool) -> Dict:
+        """캐시 형식(payload) → get_place_details 응답 (사진 URL 생성, 캐시 값이면 open_now 재계산)"""
+        opening_hours = None
+        hours = payload.get('opening_hours')
+        if hours:
+            open_now = hours.get('open_now', False)
+            if not live:
+                computed = open_now_from_periods(hours.get('periods'), hours.get('utc_offset_minutes'))
+                if computed is not None:
+                    open_now = computed
+            opening_hours = {
+                'open_now': open_now,
+                'weekday_text': hours.get('weekday_text', [])
+            }
+
+        return {
+            'place_id': place_id,
+            'name': payload.get('name', ''),
+            'address': payload.get('address', ''),
+            'phone': payload.get('phone', ''),
+            'website': payload.get('website', ''),
+            'rating': payload.get('rating'),
+            'user_ratings_total': payload.get('user_ratings_total'),
+            'opening_hours': opening_hours,
+            'photos': [self._photo_url(name) for name in payload.get('photo_names', [])],
+            'price_level': payload.get('price_level'),
+            'types': payload.get('types', [])
+        }
+
+    @coalesce('place_photo')
     def get_place_photo_url(self, place_id: str) -> Optional[str]:
         """
         Get only the first photo URL for a place (cost-effective).
-        Uses in-memory cache to avoid repeated API calls.
+        Uses the two-level place cache (in-process LRU → place_cache table) to avoid repeated API calls,
+        including photos already fetched as part of place details.
         Used for final course places only.
 
         Args:
@@ -702,10 +1187,10 @@ class LocationService:
             Photo URL string or None
         """
         # Check cache first
-        if place_id in self._photo_cache:
-            cached = self._photo_cache[place_id]
+        cached = self._place_cache.get(place_id, 'photo')
+        if cached is not None:
             print(f"[Photo Cache Hit] {place_id}")
-            return cached
+            return self._photo_url(cached.get('photo_name'))
 
         BASE_URL_PLACE_DETAILS = "https://places.googleapis.com/v1/places"
 
@@ -716,8 +1201,9 @@ class LocationService:
         }
 
         try:
-            response = requests.get(
+            response = http_client.get(
                 f"{BASE_URL_PLACE_DETAILS}/{place_id}",
+                upstream='google_places_details',
                 headers=headers,
                 timeout=5
             )
@@ -726,18 +1212,84 @@ class LocationService:
             data = response.json()
             photos = data.get("photos", [])
 
-            photo_url = None
+            photo_name = None
             if photos and len(photos) > 0:
-                photo_name = photos[0].get("name", "")
-                if photo_name:
-                    photo_url = f"https://places.googleapis.com/v1/{photo_name}/media?maxHeightPx=400&maxWidthPx=400&key={self.google_api_key}"
+                photo_name = photos[0].get("name", "") or None
 
             # Cache the result (even if None, to avoid repeated failed lookups)
-            self._photo_cache[place_id] = photo_url
-            return photo_url
+            self._place_cache.put(place_id, 'photo', {'photo_name': photo_name})
+            return self._photo_url(photo_name)
 
         except Exception as e:
             print(f"[Photo Fetch Error] {place_id}: {e}")
-            # Cache None on error to avoid repeated failed requests
-            self._photo_cache[place_id] = None
+            # Cache None briefly (this process only) to avoid repeated failed requests
+            self._place_cache.put(place_id, 'photo', {'photo_name': None}, ttl_seconds=300, persist=False)
             return None
+
+    @coalesce('place_location')
+    def get_place_location(self, place_id: str) -> Optional[Dict]:
+        """
+        Get coordinates and basic info for an autocomplete prediction (Place Details, legacy API).
+        Uses the two-level place cache so repeated predictions (same keyword typed by many users)
+        resolve without an API call.
+
+        Args:
+            place_id: Google Place ID
+
+        Returns:
+            {
+                'name': Optional[str],
+                'address': Optional[str],
+                'latitude': float,
+                'longitude': float,
+                'types': List[str]
+            }
+            or None if the place has no geometry or the request failed
+        """
+        cached = self._place_cache.get(place_id, 'location')
+        if cached is not None:
+            return cached or None
+
+        params = {
+            'place_id': place_id,
+            'fields': 'geometry,name,formatted_address,types',
+            'key': self.google_api_key,
+            'language': 'ko',
+        }
+
+        try:
+            response = http_client.get(
+                'https://maps.googleapis.com/maps/api/place/details/json',
+                upstream='google_places_details_legacy',
+                params=params,
+                timeout=5
+            )
+            response.raise_for_status()
+            place = response.json().get('result', {})
+        except Exception as e:
+            print(f"[Place Location Error] {place_id}: {e}")
+            return None
+
+        if not place.get('geometry'):
+            # 좌표 없는 장소는 이 프로세스에서만 잠시 기억
+            self._place_cache.put(place_id, 'location', {}, ttl_seconds=300, persist=False)
+            return None
+
+        location = {
+            'name': place.get('name'),
+            'address': place.get('formatted_address'),
+            'latitude': place['geometry']['location']['lat'],
+            'longitude': place['geometry']['location']['lng'],
+            'types': place.get('types', []),
+        }
+        self._place_cache.put(place_id, 'location', location)
+        return location
+
+    def get_place_locations(self, place_ids: List[str]) -> List[Optional[Dict]]:
+        """
+        get_place_location for several place IDs concurrently (bounded pool, input order kept).
+        Latency is roughly one Place Details round trip instead of one per prediction.
+        """
+        if len(place_ids) <= 1:
+            return [self.get_place_location(place_id) for place_id in place_ids]
+        return list(self._details_executor.map(self.get_place_location, place_ids))
@@ -0,0 +1,575 @@
+"""
+로컬 가맹점 저장소 + geohash 셀 공간 인덱스
+
+Places 응답과 관리자 백엔드에 등록된 가맹점(Merchant)을 known_merchant 테이블에 누적하고,
+메모리에는 geohash 셀(정밀도 6, 약 1km × 600m) → 가맹점 버킷으로 보관한다.
+
+- 반경 검색은 검색 원과 겹치는 셀들이 요청한 Google 타입에 대해 모두 신선(TTL 이내)하면
+  Google 호출 없이 로컬 인덱스에서 바로 응답
+- 오래된 셀이 있으면 None → 호출 측이 Places를 호출한 뒤 record_search로 결과를 기록
+- 신선도는 호출 원 안에 완전히 들어가는 셀 단위로 기록 (정밀도 5/6/7 중 가장 큰 셀, 상위 셀이 신선하면 하위 셀도 신선)
+- 응답이 maxResultCount로 잘린 검색은 셀 전체를 본 것이 아니므로 가맹점만 저장하고 셀은 신선 처리하지 않음
+- 잘리지 않은 검색은 신선 처리한 셀 안에서 응답에 없는 가맹점의 해당 타입을 지움
+  (남은 타입이 없으면 가맹점 삭제 → 폐업/이전한 가맹점이 남지 않음, 관리자 등록 가맹점은 유지)
+- 가맹점 타입은 호출의 includedTypes 중 응답의 types에 실제로 있는 것만 기록
+  → 한 번의 호출이 maxResultCount(20)를 채우는 밀집 지역은 셀이 신선해지지 않아 로컬 인덱스로 응답하지 못하고,
+    이런 지역은 타일 캐시(PlaceTileCache)의 밀집 표시와 요청 원 호출에 맡긴다.
+    로컬 인덱스가 답하는 곳은 작은 반경 타일 호출로 전체를 본 한산한 지역이다.
+- 셀 신선도는 merchant_cell_refresh 테이블에 저장되어 재시작/다른 워커에서도 공유됨
+  (메모리에서 오래된 셀은 DB를 CELL_RECHECK_SECONDS 간격으로 다시 확인)
+- DB 저장은 요청 스레드가 아닌 쓰기 스레드에서 모아서 INSERT ... ON CONFLICT로 처리
+  (같은 place_id를 여러 스레드/워커가 동시에 저장해도 충돌 없이 갱신)
+- 사진은 photo 리소스 이름만 저장하고 URL(API 키 포함)은 조회 시 photo_url 함수로 생성
+- 메모리 인덱스는 max_merchants를 넘으면 가장 오래 쓰지 않은 버킷부터 버리고 그 영역의 메모리 신선도도 지운다
+  (다음 조회 때 DB에서 다시 로드)
+"""
+import atexit
+import math
+import queue
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from . import geo, geohash
+from .database import KnownMerchant, MerchantCellRefresh, get_db
+
+# 메모리 가맹점 버킷 정밀도 (6: 위도 37.5° 기준 약 970m × 610m)
+BUCKET_PRECISION = 6
+
+# 신선도 기록 셀 정밀도 (큰 셀부터)
+FRESHNESS_PRECISIONS = (5, 6, 7)
+
+# 한 번의 반경 검색에서 확인할 최대 셀 수 (넘으면 로컬 인덱스로 응답하지 않음)
+MAX_QUERY_CELLS = 2000
+
+# 한 번의 기록에서 정밀도별로 나열할 최대 셀 수 (넘는 정밀도는 건너뜀)
+MAX_RECORD_CELLS = 2000
+
+# 메모리상 오래된 셀을 DB에서 다시 확인하는 최소 간격 (초)
+CELL_RECHECK_SECONDS = 60.0
+
+# 한 번의 DB 쓰기에 모으는 최대 기록 수 / 한 INSERT 문에 넣는 최대 행 수
+WRITE_BATCH = 50
+INSERT_CHUNK = 200
+
+# 메모리 인덱스에 올리는 최대 가맹점 수 (넘으면 오래 쓰지 않은 버킷부터 제거)
+MAX_MEMORY_MERCHANTS = 100000
+
+# 저장하는 가맹점 필드 (응답에는 photo_name으로 만든 photo_url이 추가됨)
+STORE_FIELDS = ('name', 'category', 'address', 'latitude', 'longitude', 'place_id', 'photo_name')
+
+
+class _KnownPlace(NamedTuple):
+    cell: str
+    store: Dict
+    search_types: frozenset
+    source: str = 'places'
+
+
+def _circle_bbox(lat: float, lng: float, radius: float) -> Tuple[float, float, float, float]:
+    dlat = radius / 111320.0
+    dlng = radius / (111320.0 * max(math.cos(math.radians(lat)), 1e-6))
+    return lat - dlat, lng - dlng, lat + dlat, lng + dlng
+
+
+def _cell_count(bbox: Tuple[float, float, float, float], precision: int) -> int:
+    """경계 상자와 겹치는 셀 수 추정 (셀 나열 전에 크기 확인용)"""
+    dlat, dlng = geohash.cell_size(precision)
+    min_lat, min_lng, max_lat, max_lng = bbox
+    return (int((max_lat - min_lat) / dlat) + 2) * (int((max_lng - min_lng) / dlng) + 2)
+
+
+def _intersects(cell: str, lat: float, lng: float, radius: float) -> bool:
+    """셀 사각형과 원이 겹치는지 (셀 안에서 원 중심에 가장 가까운 점까지의 거리)"""
+    min_lat, min_lng, max_lat, max_lng = geohash.decode_bounds(cell)
+    nearest_lat = min(max(lat, min_lat), max_lat)
+    nearest_lng = min(max(lng, min_lng), max_lng)
+    return geo.haversine(lat, lng, nearest_lat, nearest_lng) <= radius
+
+
+def _to_epoch(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class MerchantStore:
+    """
+    사용법:
+        store = MerchantStore(ttl_seconds=86400, category_types=LocationService.CATEGORY_MAP)
+        stores = store.query(lat, lng, 500, ['cafe'])
+        if stores is None:
+            places = ...  # Places 호출
+            store.record_search(lat, lng, 500, ['cafe'], places, complete=len(places) < 20)
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 86400.0,
+        category_types: Optional[Mapping[str, Sequence[str]]] = None,
+        session_factory: Callable = get_db,
+        photo_url: Callable[[Optional[str]], Optional[str]] = lambda photo_name: None,
+        max_merchants: int = MAX_MEMORY_MERCHANTS
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_merchants = max_merchants
+        self.category_types = dict(category_types or {})
+        self._session_factory = session_factory
+        self._photo_url = photo_url
+        self._writes: queue.Queue = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._buckets: 'OrderedDict[str, Dict[str, _KnownPlace]]' = OrderedDict()
+        self._places: Dict[str, _KnownPlace] = {}
+        self._refreshed: Dict[Tuple[str, str], float] = {}
+        self._refreshed_types: set = set()
+        self._checked_at: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def query(self, lat: float, lng: float, radius: float, included_types: Sequence[str]) -> Optional[List[Dict]]:
+        """
+        검색 원 안의 가맹점 (요청 중심 기준 distance 포함, 거리순)
+
+        Returns:
+            가맹점 dict 복사본 목록, 검색 원과 겹치는 셀 중 하나라도 오래되었으면 None
+        """
+        if not included_types:
+            return None
+        bbox = _circle_bbox(lat, lng, radius)
+        if _cell_count(bbox, FRESHNESS_PRECISIONS[0]) > MAX_QUERY_CELLS:
+            return None
+
+        stale = self._stale_cells(lat, lng, radius, included_types)
+        if stale and self._load_from_db(stale, bbox):
+            # 다른 워커/이전 프로세스가 갱신했을 수 있으므로 DB 확인 후 다시 판단
+            stale = self._stale_cells(lat, lng, radius, included_types)
+        if stale is None or stale:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        wanted = frozenset(included_types)
+        candidates = []
+        with self._lock:
+            self.hits += 1
+            for cell in geohash.cells_in_bbox(*bbox, BUCKET_PRECISION):
+                bucket = self._buckets.get(cell)
+                if bucket is None:
+                    continue
+                self._buckets.move_to_end(cell)
+                for place in bucket.values():
+                    if place.search_types & wanted:
+                        candidates.append(place.store)
+        stores = geo.stores_within(lat, lng, candidates, radius)
+        for store in stores:
+            store['photo_url'] = self._photo_url(store['photo_name'])
+        return stores
+
+    def _is_fresh(self, cell: str, included_types: Sequence[str], threshold: float) -> bool:
+        """셀 자신 또는 상위 셀이 모든 타입에 대해 threshold 이후에 갱신되었는지 (lock 보유 상태에서 호출)"""
+        prefixes = [cell[:p] for p in FRESHNESS_PRECISIONS if p <= len(cell)]
+        return all(
+            any(self._refreshed.get((prefix, place_type), 0.0) >= threshold for prefix in prefixes)
+            for place_type in included_types
+        )
+
+    def _stale_cells(self, lat: float, lng: float, radius: float, included_types: Sequence[str]) -> Optional[List[str]]:
+        """
+        검색 원과 겹치는 오래된 셀
+
+        가장 큰 셀부터 확인해 신선하지 않은 셀만 하위 셀로 내려가므로, 작은 호출 원으로 채운 영역도
+        큰 반경 검색에 사용할 수 있다. 확인할 셀이 MAX_QUERY_CELLS를 넘으면 None.
+        """
+        threshold = time.time() - self.ttl_seconds
+        finest = FRESHNESS_PRECISIONS[-1]
+        pending = geohash.cells_in_bbox(*_circle_bbox(lat, lng, radius), FRESHNESS_PRECISIONS[0])
+        stale = []
+        visited = 0
+        with self._lock:
+            while pending:
+                cell = pending.pop()
+                visited += 1
+                if visited > MAX_QUERY_CELLS:
+                    return None
+                if not _intersects(cell, lat, lng, radius) or self._is_fresh(cell, included_types, threshold):
+                    continue
+                if len(cell) >= finest:
+                    stale.append(cell)
+                else:
+                    pending.extend(cell + ch for ch in geohash.BASE32)
+        return stale
+
+    def _load_from_db(self, cells: List[str], bbox: Tuple[float, float, float, float]) -> bool:
+        """
+        메모리에서 오래된 셀의 신선도 기록을 DB에서 다시 읽고, 갱신된 기록이 있으면 해당 영역 가맹점도 로드
+
+        같은 셀은 CELL_RECHECK_SECONDS 간격으로만 확인한다.
+
+        Returns:
+            메모리 신선도가 갱신되었는지
+        """
+        now = time.monotonic()
+        with self._lock:
+            if len(self._checked_at) > self.max_merchants:
+                # 확인 간격이 지난 기록은 의미가 없으므로 정리
+                self._checked_at = {
+                    cell: checked for cell, checked in self._checked_at.items()
+                    if now - checked < CELL_RECHECK_SECONDS
+                }
+            cells = [
+                cell for cell in cells
+                if now - self._checked_at.get(cell, -CELL_RECHECK_SECONDS) >= CELL_RECHECK_SECONDS
+            ]
+            for cell in cells:
+                self._checked_at[cell] = now
+        if not cells:
+            return False
+
+        candidates = {cell[:p] for cell in cells for p in FRESHNESS_PRECISIONS if p <= len(cell)}
+        min_lat, min_lng, max_lat, max_lng = bbox
+        updated = False
+        db = self._session_factory()
+        try:
+            refreshes = db.query(MerchantCellRefresh).filter(MerchantCellRefresh.cell.in_(candidates)).all()
+            with self._lock:
+                for refresh in refreshes:
+                    key = (refresh.cell, refresh.place_type)
+                    refreshed_at = _to_epoch(refresh.refreshed_at)
+                    if refreshed_at > self._refreshed.get(key, 0.0):
+                        self._refreshed[key] = refreshed_at
+                        self._refreshed_types.add(refresh.place_type)
+                        updated = True
+            if not updated:
+                return False
+
+            rows = db.query(KnownMerchant).filter(
+                KnownMerchant.latitude.between(min_lat, max_lat),
+                KnownMerchant.longitude.between(min_lng, max_lng)
+            ).all()
+            with self._lock:
+                for row in rows:
+                    store = {name: getattr(row, name) for name in STORE_FIELDS}
+                    search_types = frozenset(filter(None, (row.search_types or '').split(',')))
+                    cell = geohash.encode(row.latitude, row.longitude, BUCKET_PRECISION)
+                    self._index(_KnownPlace(cell, store, search_types, row.source or 'places'))
+                self._evict()
+        except Exception as e:
+            print(f"[MerchantStore] DB 로드 실패: {e}")
+        finally:
+            db.close()
+        return updated
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+    def record_search(
+        self,
+        lat: float,
+        lng: float,
+        radius: float,
+        included_types: Sequence[str],
+        stores: List[Dict],
+        complete: bool
+    ) -> None:
+        """
+        Places Nearby Search 결과 기록
+
+        Args:
+            lat, lng, radius: 실제 Places 호출 원
+            included_types: 호출에 사용한 includedTypes
+            stores: 응답 가맹점 목록 (types가 있으면 includedTypes 중 실제 타입만 기록)
+            complete: 응답이 잘리지 않았는지 (True면 호출 원 안에 완전히 들어가는 셀을 신선 처리하고,
+                      그 셀 안에서 응답에 없는 가맹점의 해당 타입을 지움)
+        """
+        refreshed_cells = self._covered_cells(lat, lng, radius) if complete else []
+        self._upsert(stores, included_types, 'places', refreshed_cells)
+
+    @staticmethod
+    def _covered_cells(lat: float, lng: float, radius: float) -> List[str]:
+        """원 안에 완전히 들어가는 셀 (상위 셀에 포함된 하위 셀은 제외)"""
+        bbox = _circle_bbox(lat, lng, radius)
+        covered: List[str] = []
+        for precision in FRESHNESS_PRECISIONS:
+            if _cell_count(bbox, precision) > MAX_RECORD_CELLS:
+                continue
+            parents = set(covered)
+            cells = [
+                cell for cell in geohash.cells_in_bbox(*bbox, precision)
+                if not any(cell[:p] in parents for p in FRESHNESS_PRECISIONS if p < precision)
+            ]
+            if not cells:
+                continue
+            # 셀 네 꼭짓점이 모두 원 안이면 셀 전체가 원 안
+            bounds = np.array([geohash.decode_bounds(cell) for cell in cells])
+            corner_lats = bounds[:, [0, 0, 2, 2]].ravel()
+            corner_lngs = bounds[:, [1, 3, 1, 3]].ravel()
+            inside = (geo.distances_from(lat, lng, corner_lats, corner_lngs) <= radius).reshape(-1, 4).all(axis=1)
+            covered.extend(cell for cell, ok in zip(cells, inside.tolist()) if ok)
+        return covered
+
+    def upsert(self, stores: Iterable[Dict], source: str = 'places', search_types: Sequence[str] = ()) -> None:
+        """
+        셀 신선도와 무관하게 가맹점만 저장 (건물 내 검색 결과, 관리자 등록 가맹점 등)
+
+        search_types가 없으면 가맹점 카테고리에 해당하는 Google 타입(category_types)을 사용
+        """
+        self._upsert(stores, search_types, source, [])
+
+    def _upsert(self, stores: Iterable[Dict], search_types: Sequence[str], source: str, refreshed_cells: List[str]) -> None:
+        places = []
+        for store in stores:
+            if not store.get('place_id') or store.get('latitude') is None or store.get('longitude') is None:
+                continue
+            clean = {name: store.get(name) for name in STORE_FIELDS}
+            clean['latitude'] = float(clean['latitude'])
+            clean['longitude'] = float(clean['longitude'])
+            types = set(search_types) or set(self.category_types.get(clean['category'], ()))
+            if store.get('types'):
+                # includedTypes 여러 개로 호출한 경우 가맹점에 실제로 있는 타입만 (없으면 호출 타입 전체)
+                types = (types & set(store['types'])) or types
+            cell = geohash.encode(clean['latitude'], clean['longitude'], BUCKET_PRECISION)
+            places.append(_KnownPlace(cell, clean, frozenset(types), source))
+
+        now = time.time()
+        with self._lock:
+            merged = [self._index(place) for place in places]
+            pruned, removed = self._prune(refreshed_cells, search_types, {place.store['place_id'] for place in places})
+            for cell in refreshed_cells:
+                for place_type in search_types:
+                    self._refreshed[(cell, place_type)] = now
+            if refreshed_cells:
+                self._refreshed_types.update(search_types)
+            self._evict()
+
+        if merged or pruned or removed or refreshed_cells:
+            refreshes = [(cell, place_type) for cell in refreshed_cells for place_type in search_types]
+            self._enqueue_write(merged + pruned, source, refreshes, datetime.utcfromtimestamp(now), removed)
+
+    def _prune(
+        self,
+        refreshed_cells: List[str],
+        search_types: Sequence[str],
+        seen_ids: set
+    ) -> Tuple[List[_KnownPlace], List[str]]:
+        """
+        잘리지 않은 검색이 신선 처리한 셀 안에서 응답에 없는 가맹점의 검색 타입 제거 (lock 보유 상태에서 호출)
+
+        Returns:
+            (타입이 줄어든 가맹점, 남은 타입이 없어 삭제한 place_id)
+        """
+        if not refreshed_cells or not search_types:
+            return [], []
+        covered = set(refreshed_cells)
+        finest = FRESHNESS_PRECISIONS[-1]
+        precisions = sorted({len(cell) for cell in covered})
+        buckets = set()
+        for cell in covered:
+            if len(cell) < BUCKET_PRECISION:
+                buckets.update(cell + ch for ch in geohash.BASE32)
+            else:
+                buckets.add(cell[:BUCKET_PRECISION])
+
+        wanted = frozenset(search_types)
+        pruned, removed = [], []
+        for bucket_id in buckets:
+            for place_id, place in list(self._buckets.get(bucket_id, {}).items()):
+                if place_id in seen_ids or place.source == 'admin' or not place.search_types & wanted:
+                    continue
+                code = geohash.encode(place.store['latitude'], place.store['longitude'], finest)
+                if not any(code[:p] in covered for p in precisions):
+                    continue
+                remaining = place.search_types - wanted
+                if remaining:
+                    place = place._replace(search_types=remaining)
+                    self._buckets[bucket_id][place_id] = place
+                    self._places[place_id] = place
+                    pruned.append(place)
+                else:
+                    del self._buckets[bucket_id][place_id]
+                    del self._places[place_id]
+                    removed.append(place_id)
+        return pruned, removed
+
+    def _index(self, place: _KnownPlace) -> _KnownPlace:
+        """메모리 인덱스에 반영 (lock 보유 상태에서 호출). 기존 기록과 합친 결과 반환"""
+        place_id = place.store['place_id']
+        previous = self._places.get(place_id)
+        if previous is not None:
+            store = place.store
+            if not store['photo_name'] and previous.store['photo_name']:
+                store = {**store, 'photo_name': previous.store['photo_name']}
+            place = place._replace(
+                store=store,
+                search_types=place.search_types | previous.search_types,
+                source='admin' if 'admin' in (place.source, previous.source) else place.source
+            )
+            if previous.cell != place.cell:
+                self._buckets.get(previous.cell, {}).pop(place_id, None)
+        bucket = self._buckets.get(place.cell)
+        if bucket is None:
+            bucket = self._buckets[place.cell] = {}
+        else:
+            self._buckets.move_to_end(place.cell)
+        bucket[place_id] = place
+        self._places[place_id] = place
+        return place
+
+    def _evict(self) -> None:
+        """
+        max_merchants를 넘으면 가장 오래 쓰지 않은 버킷부터 제거 (lock 보유 상태에서 호출)
+
+        버킷과 겹치는 셀의 메모리 신선도도 지워, 다음 조회가 불완전한 메모리 대신 DB를 다시 읽게 한다.
+        """
+        while len(self._places) > self.max_merchants and self._buckets:
+            bucket_id, bucket = self._buckets.popitem(last=False)
+            for place_id in bucket:
+                self._places.pop(place_id, None)
+            related = [bucket_id[:p] for p in FRESHNESS_PRECISIONS if p <= BUCKET_PRECISION]
+            related.extend(bucket_id + ch for ch in geohash.BASE32)
+            for cell in related:
+                for place_type in self._refreshed_types:
+                    self._refreshed.pop((cell, place_type), None)
+            self.evictions += 1
+
+    # ------------------------------------------------------------------
+    # DB 쓰기 (쓰기 스레드)
+    # ------------------------------------------------------------------
+    def _enqueue_write(
+        self,
+        places: List[_KnownPlace],
+        source: str,
+        refreshes: List[Tuple[str, str]],
+        refreshed_at: datetime,
+        removed: List[str] = ()
+    ) -> None:
+        """DB 저장 예약 (메모리 인덱스는 이미 반영됨, 요청 스레드는 기다리지 않음)"""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name='merchant-store-writer', daemon=True)
+                self._writer.start()
+                atexit.register(self.flush)
+        self._writes.put((places, source, refreshes, refreshed_at, list(removed)))
+
+    def _write_loop(self) -> None:
+        while True:
+            jobs = [self._writes.get()]
+            while len(jobs) < WRITE_BATCH:
+                try:
+                    jobs.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._persist(jobs)
+            finally:
+                for _ in jobs:
+                    self._writes.task_done()
+
+    def flush(self) -> None:
+        """예약된 DB 저장이 끝날 때까지 대기 (종료 시 호출)"""
+        if self._writer is not None:
+            self._writes.join()
+
+    def _persist(self, jobs: List[Tuple[List[_KnownPlace], str, List[Tuple[str, str]], datetime, List[str]]]) -> None:
+        """
+        모인 기록을 가맹점 / 셀 신선도 테이블에 upsert, 사라진 가맹점 삭제
+
+        같은 place_id는 마지막 기록(메모리 인덱스에서 이전 기록과 합쳐진 값)만 저장한다.
+        관리자 등록 가맹점의 source는 Places 기록으로 덮어쓰지 않고, 삭제하지도 않는다.
+        """
+        merchants: Dict[str, Dict] = {}
+        refreshes: Dict[Tuple[str, str], datetime] = {}
+        removed = set()
+        for places, source, job_refreshes, refreshed_at, job_removed in jobs:
+            for place_id in job_removed:
+                merchants.pop(place_id, None)
+                removed.add(place_id)
+            for place in places:
+                removed.discard(place.store['place_id'])
+                store = place.store
+                previous = merchants.get(store['place_id'])
+                merchants[store['place_id']] = {
+                    'place_id': store['place_id'],
+                    'name': store['name'] or '',
+                    'category': store['category'],
+                    'address': store['address'],
+                    'latitude': store['latitude'],
+                    'longitude': store['longitude'],
+                    'photo_name': store['photo_name'],
+                    'search_types': ','.join(sorted(place.search_types)),
+                    'source': 'admin' if 'admin' in (source, place.source) or (previous and previous['source'] == 'admin') else source,
+                    'updated_at': refreshed_at,
+                }
+            for key in job_refreshes:
+                refreshes[key] = max(refreshed_at, refreshes.get(key, refreshed_at))
+
+        db = self._session_factory()
+        try:
+            insert = sqlite_insert if db.get_bind().dialect.name == 'sqlite' else postgresql_insert
+            merchant_rows = list(merchants.values())
+            for i in range(0, len(merchant_rows), INSERT_CHUNK):
+                stmt = insert(KnownMerchant).values(merchant_rows[i:i + INSERT_CHUNK])
+                excluded = stmt.excluded
+                db.execute(stmt.on_conflict_do_update(
+                    index_elements=[KnownMerchant.place_id],
+                    set_={
+                        'name': excluded.name,
+                        'category': excluded.category,
+                        'address': excluded.address,
+                        'latitude': excluded.latitude,
+                        'longitude': excluded.longitude,
+                        'photo_name': func.coalesce(excluded.photo_name, KnownMerchant.photo_name),
+                        'search_types': excluded.search_types,
+                        'source': func.coalesce(
+                            func.nullif(KnownMerchant.source, 'places'), excluded.source
+                        ),
+                        'updated_at': excluded.updated_at,
+                    }
+                ))
+
+            removed_ids = list(removed)
+            for i in range(0, len(removed_ids), INSERT_CHUNK):
+                db.execute(delete(KnownMerchant).where(
+                    KnownMerchant.place_id.in_(removed_ids[i:i + INSERT_CHUNK]),
+                    KnownMerchant.source != 'admin'
+                ))
+
+            refresh_rows = [
+                {'cell': cell, 'place_type': place_type, 'refreshed_at': refreshed_at}
+                for (cell, place_type), refreshed_at in refreshes.items()
+            ]
+            for i in range(0, len(refresh_rows), INSERT_CHUNK):
+                stmt = insert(MerchantCellRefresh).values(refresh_rows[i:i + INSERT_CHUNK])
+                db.execute(stmt.on_conflict_do_update(
+                    index_elements=[MerchantCellRefresh.cell, MerchantCellRefresh.place_type],
+                    set_={'refreshed_at': stmt.excluded.refreshed_at}
+                ))
+
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[MerchantStore] 가맹점 저장 실패: {e}")
+        finally:
+            db.close()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'merchants': len(self._places),
+                'buckets': len(self._buckets),
+                'fresh_cells': len(self._refreshed),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'pending_writes': self._writes.qsize(),
+            }
@@ -1,11 +1,12 @@
 import os
-import requests
 import uuid
 import time
 import base64
 import re
 from typing import Dict, Any, Optional
 
+from . import http_client
+
 
 class NaverOCRService:
     def __init__(self):
@@ -79,8 +80,9 @@ class NaverOCRService:
             "Content-Type": "application/json"
         }
 
-        response = requests.post(
+        response = http_client.post(
             self.invoke_url,
+            upstream='ncp_ocr',
             headers=headers,
             json=request_data,
             timeout=30
@@ -0,0 +1,189 @@
+"""
+장소 상세/사진 2단계 캐시
+
+1차: 프로세스 내 LRU (크기 상한 + TTL)
+2차: place_cache 테이블 (두 gunicorn 워커와 재시작 간 공유)
+
+가맹점을 누가 한 번이라도 열어봤다면 상세(전화/웹사이트/평점/영업시간)와 사진은 Places API 호출 없이 응답한다.
+API 키가 DB에 남지 않도록 사진은 URL이 아닌 photo name으로 저장하고 조회 시 URL을 만든다.
+영업시간은 regularOpeningHours.periods를 함께 저장해 open_now를 조회 시점 기준으로 다시 계산한다.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .database import PlaceCacheEntry, get_db
+
+# 한국 표준시 (utcOffsetMinutes가 없을 때)
+DEFAULT_UTC_OFFSET_MINUTES = 540
+
+_MINUTES_PER_WEEK = 7 * 24 * 60
+
+
+def _week_minute(point: Dict) -> int:
+    """Places periods의 {day(0=일요일), hour, minute} → 주 단위 분"""
+    return point.get('day', 0) * 1440 + point.get('hour', 0) * 60 + point.get('minute', 0)
+
+
+def open_now_from_periods(
+    periods: List[Dict],
+    utc_offset_minutes: Optional[int] = None,
+    now: Optional[datetime] = None
+) -> Optional[bool]:
+    """
+    regularOpeningHours.periods로 현재 영업 여부 계산
+
+    Args:
+        periods: [{'open': {'day', 'hour', 'minute'}, 'close': {...}}, ...] (close 없으면 24시간 영업)
+        utc_offset_minutes: 장소 현지 시간 UTC 오프셋 (기본 KST)
+        now: 기준 시각 (UTC naive, 기본 현재)
+
+    Returns:
+        영업 중 여부, periods가 없으면 None
+    """
+    if not periods:
+        return None
+    now = now or datetime.utcnow()
+    offset = DEFAULT_UTC_OFFSET_MINUTES if utc_offset_minutes is None else utc_offset_minutes
+    local = now + timedelta(minutes=offset)
+    current = ((local.weekday() + 1) % 7) * 1440 + local.hour * 60 + local.minute
+
+    for period in periods:
+        open_point = period.get('open')
+        if not open_point:
+            continue
+        close_point = period.get('close')
+        if not close_point:
+            return True
+        start = _week_minute(open_point)
+        end = _week_minute(close_point)
+        if end <= start:
+            end += _MINUTES_PER_WEEK
+        if start <= current < end or start <= current + _MINUTES_PER_WEEK < end:
+            return True
+    return False
+
+
+class PlaceCache:
+    """
+    (place_id, kind) → JSON 직렬화 가능한 dict 2단계 캐시 (스레드 안전)
+
+    사용법:
+        cache = PlaceCache(ttl_seconds=86400, max_entries=2000)
+        data = cache.get(place_id, 'details')
+        if data is None:
+            data = ...  # Places API 호출
+            cache.put(place_id, 'details', data)
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 86400.0,
+        max_entries: int = 2000,
+        session_factory: Callable = get_db
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        # (place_id, kind) → (만료 시각, 값)
+        self._entries: 'OrderedDict[Tuple[str, str], Tuple[float, Dict]]' = OrderedDict()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def get(self, place_id: str, kind: str) -> Optional[Dict]:
+        """1차 → 2차 순으로 조회 (2차 적중 시 1차에 남은 TTL만큼 올림), 없거나 만료되면 None"""
+        key = (place_id, kind)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+        value, remaining = self._load(place_id, kind)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.db_hits += 1
+            self._remember(key, value, remaining)
+        return value
+
+    def put(self, place_id: str, kind: str, value: Dict, ttl_seconds: Optional[float] = None, persist: bool = True) -> None:
+        """
+        캐시 저장
+
+        Args:
+            ttl_seconds: 이 항목만의 TTL (기본 self.ttl_seconds)
+            persist: False면 1차(프로세스 내)에만 저장 - 일시적 오류 결과 등
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._remember((place_id, kind), value, ttl)
+        if persist:
+            self._store(place_id, kind, value)
+
+    def _remember(self, key: Tuple[str, str], value: Dict, ttl: float) -> None:
+        """1차 캐시에 저장 (lock 보유 상태에서 호출)"""
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, place_id: str, kind: str) -> Tuple[Optional[Dict], float]:
+        """2차 저장소 조회 → (값, 남은 TTL 초)"""
+        db = self._session_factory()
+        try:
+            row = db.query(PlaceCacheEntry).filter(
+                PlaceCacheEntry.place_id == place_id,
+                PlaceCacheEntry.kind == kind
+            ).first()
+            if row is None:
+                return None, 0.0
+            remaining = self.ttl_seconds - (datetime.utcnow() - row.cached_at).total_seconds()
+            if remaining <= 0:
+                return None, 0.0
+            return json.loads(row.data), remaining
+        except Exception as e:
+            print(f"[PlaceCache] 조회 실패 ({place_id}, {kind}): {e}")
+            return None, 0.0
+        finally:
+            db.close()
+
+    def _store(self, place_id: str, kind: str, value: Dict) -> None:
+        db = self._session_factory()
+        try:
+            db.merge(PlaceCacheEntry(
+                place_id=place_id,
+                kind=kind,
+                data=json.dumps(value, ensure_ascii=False),
+                cached_at=datetime.utcnow()
+            ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[PlaceCache] 저장 실패 ({place_id}, {kind}): {e}")
+        finally:
+            db.close()
+
+    def clear(self) -> None:
+        """1차 캐시만 비움 (2차 저장소는 TTL로 만료)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'memory_hits': self.memory_hits,
+                'db_hits': self.db_hits,
+                'misses': self.misses,
+            }
@@ -0,0 +1,183 @@
+"""
+Google Places Nearby Search 결과 타일 캐시
+
+지도를 움직일 때마다 searchNearby를 호출하지 않도록, 검색 중심을 geohash 타일로,
+반경을 구간(bucket)으로 양자화해 타일 단위로 결과를 저장한다.
+
+- 업스트림 호출은 타일 중심 + (반경 구간 + 타일 반대각선) 반경으로 수행 → 같은 타일 안의 어떤 중심에서도
+  반경 구간 이하의 검색 원을 완전히 덮음
+- 조회 시 같은 반경 구간의 중심 타일 + 주변 8개 타일 중 검색 원을 완전히 덮는 항목을 찾아
+  실제 중심/반경으로 원 필터링 후 반환 (더 큰 구간의 결과는 쓰지 않음 - 20건 안에 좁은 원의 장소가 빠져 있을 수 있음)
+- 카테고리(includedTypes)별로 따로 저장하므로 전체 카테고리 검색은 캐시에 없는 카테고리만 호출
+
+Places 응답은 호출당 최대 20건(인기순)이므로, 타일 호출 결과가 20건을 채웠으면 타일 안의 장소를 다 받았다고
+볼 수 없다. 이런 타일은 결과 없이 '밀집(incomplete)'으로만 기록해 타일 조회에 쓰지 않고 (dense()),
+호출부는 이후 그 타일 안의 검색을 타일 호출 없이 요청 중심/반경으로 직접 호출한다.
+직접 호출 결과는 (요청 중심의 세밀한 geohash 셀, 반경 구간) 키로 따로 저장하고 (put_direct()),
+같은 셀 안에서 호출 원(+ 셀 반대각선 여유) 안에 들어가는 검색에 재사용한다.
+직접 호출 결과도 20건으로 잘렸을 수 있으므로, 셀 안에서 조금 움직인 검색에는 원 가장자리 장소가 빠질 수 있다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from . import geo, geohash
+
+# (반경 구간 상한 m, geohash 정밀도) - 타일 반대각선이 반경 구간보다 충분히 작도록 선택
+RADIUS_BUCKETS = (
+    (100, 8),
+    (250, 8),
+    (500, 7),
+    (1000, 7),
+    (2000, 6),
+    (5000, 6),
+    (10000, 5),
+    (50000, 4),
+)
+
+# Places searchNearby 최대 반경
+MAX_PLACES_RADIUS = 50000.0
+
+# 밀집 타일 직접 호출 결과 키의 최대 geohash 정밀도 (8: 약 38m × 19m)
+MAX_DIRECT_PRECISION = 8
+
+
+class PlaceTile(NamedTuple):
+    """업스트림 호출 단위: 타일 + 반경 구간 → 호출 중심/반경"""
+    cell: str
+    bucket: int
+    lat: float
+    lng: float
+    radius: float
+
+
+class _TileEntry(NamedTuple):
+    expires_at: float
+    tile: PlaceTile
+    stores: Tuple[Dict, ...]
+    # False: 호출이 maxResultCount를 채워 타일을 다 덮었다고 볼 수 없음 (stores 비움, 조회에 사용 안 함)
+    complete: bool = True
+
+
+def _bucket_for(radius: float) -> Tuple[int, int]:
+    for bucket, precision in RADIUS_BUCKETS:
+        if radius <= bucket:
+            return bucket, precision
+    return RADIUS_BUCKETS[-1]
+
+
+class PlaceTileCache:
+    """(geohash 타일, 반경 구간, includedTypes) → 장소 목록 TTL 캐시 (스레드 안전)"""
+
+    def __init__(self, ttl_seconds: float = 600.0, max_entries: int = 5000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[tuple, _TileEntry]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def tile_for(lat: float, lng: float, radius: float) -> PlaceTile:
+        """검색 원을 덮는 업스트림 호출 타일"""
+        bucket, precision = _bucket_for(radius)
+        cell = geohash.encode(lat, lng, precision)
+        min_lat, min_lng, max_lat, max_lng = geohash.decode_bounds(cell)
+        center_lat, center_lng = (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+        half_diagonal = geo.haversine(center_lat, center_lng, max_lat, max_lng)
+        return PlaceTile(cell, bucket, center_lat, center_lng, min(bucket + half_diagonal, MAX_PLACES_RADIUS))
+
+    @staticmethod
+    def _direct_key(lat: float, lng: float, radius: float, types_key: tuple) -> tuple:
+        """밀집 타일 직접 호출 결과 키 (타일보다 한 단계 세밀한 셀)"""
+        bucket, precision = _bucket_for(radius)
+        cell = geohash.encode(lat, lng, min(precision + 1, MAX_DIRECT_PRECISION))
+        return ('direct', cell, bucket, types_key)
+
+    def _candidate_keys(self, lat: float, lng: float, radius: float, types_key: tuple):
+        """같은 반경 구간의 중심 타일과 주변 8개 타일, 요청 중심의 직접 호출 결과"""
+        bucket, precision = _bucket_for(radius)
+        cell = geohash.encode(lat, lng, precision)
+        yield (cell, bucket, types_key)
+        for cand_cell in geohash.neighbors(cell):
+            yield (cand_cell, bucket, types_key)
+        yield self._direct_key(lat, lng, radius, types_key)
+
+    def get(self, lat: float, lng: float, radius: float, types: Sequence[str]) -> Optional[List[Dict]]:
+        """
+        검색 원(lat, lng, radius)을 완전히 덮는 캐시 항목의 장소 중 원 안에 있는 장소
+
+        Returns:
+            장소 dict 복사본 목록 (distance는 요청 중심 기준으로 재계산), 캐시에 없으면 None
+        """
+        types_key = tuple(sorted(types))
+        now = time.monotonic()
+        entry = None
+        with self._lock:
+            for key in self._candidate_keys(lat, lng, radius, types_key):
+                cand = self._entries.get(key)
+                if cand is None:
+                    continue
+                if cand.expires_at <= now:
+                    del self._entries[key]
+                    continue
+                if cand.complete and geo.haversine(lat, lng, cand.tile.lat, cand.tile.lng) + radius <= cand.tile.radius:
+                    self._entries.move_to_end(key)
+                    entry = cand
+                    break
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return geo.stores_within(lat, lng, entry.stores, radius)
+
+    def dense(self, lat: float, lng: float, radius: float, types: Sequence[str]) -> bool:
+        """요청 중심의 타일이 밀집(타일 호출이 maxResultCount를 채움)으로 기록되어 있는지"""
+        bucket, precision = _bucket_for(radius)
+        key = (geohash.encode(lat, lng, precision), bucket, tuple(sorted(types)))
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not entry.complete and entry.expires_at > time.monotonic()
+
+    def put(self, tile: PlaceTile, types: Sequence[str], stores: List[Dict], complete: bool = True) -> None:
+        """
+        타일 호출 결과 저장
+
+        Args:
+            complete: False면 결과가 잘렸으므로 장소는 버리고 밀집 표시만 남김
+        """
+        key = (tile.cell, tile.bucket, tuple(sorted(types)))
+        stored = tuple(dict(store) for store in stores) if complete else ()
+        entry = _TileEntry(time.monotonic() + self.ttl_seconds, tile, stored, complete)
+        self._store(key, entry)
+
+    def put_direct(self, lat: float, lng: float, radius: float, types: Sequence[str], stores: List[Dict]) -> None:
+        """
+        밀집 타일에서 요청 원으로 직접 호출한 결과 저장
+
+        같은 세밀한 셀 + 반경 구간의 검색 중 호출 원(+ 셀 반대각선 여유) 안에 들어가는 검색에 재사용된다.
+        """
+        key = self._direct_key(lat, lng, radius, tuple(sorted(types)))
+        cell = key[1]
+        min_lat, min_lng, max_lat, max_lng = geohash.decode_bounds(cell)
+        slack = geo.haversine(min_lat, min_lng, max_lat, max_lng) / 2
+        tile = PlaceTile(cell, key[2], lat, lng, radius + slack)
+        entry = _TileEntry(time.monotonic() + self.ttl_seconds, tile, tuple(dict(store) for store in stores))
+        self._store(key, entry)
+
+    def _store(self, key: tuple, entry: _TileEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
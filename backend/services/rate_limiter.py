@@ -0,0 +1,155 @@
+"""
+업스트림별 호출 속도 제한 (토큰 버킷)
+
+TMAP/Google Directions는 초당 호출 수를 넘기면 429를 돌려준다. 예전에는 429를 받은 뒤
+요청 스레드에서 지수 백오프로 잠들었다가 다시 호출했기 때문에, 코스 구간 병렬 계산처럼 호출이 몰리면
+429 → 대기 → 재호출이 반복됐다.
+이 모듈은 업스트림마다 토큰 버킷을 두고 호출 전에 차례를 받아, 애초에 한도를 넘지 않도록 호출 간격을 맞춘다.
+
+- 버킷: 초당 rate개 토큰 보충, 최대 burst개까지 적립. 호출마다 토큰 1개 소비
+- 토큰이 없으면 다음 토큰이 생길 때까지 대기 (먼저 온 호출이 먼저 차례를 예약하므로 순서 보장)
+  대기는 time.sleep이라 eventlet 워커(monkey patch)에서는 다른 요청을 막지 않고 양보함
+- 예상 대기가 RATE_LIMIT_MAX_WAIT초를 넘으면 기다리지 않고 거절 (http_client.RateLimitExceeded)
+- 그래도 429를 받으면 penalize()로 Retry-After(기본 1초) 동안 버킷을 비워 이후 호출이 함께 물러남
+- 한도는 워커 프로세스 단위 (gunicorn 워커 2개면 실제 한도는 2배)
+
+설정 (초당 호출 수, 0이면 제한 없음):
+    RATE_LIMIT_TMAP_TRANSIT, RATE_LIMIT_TMAP_PEDESTRIAN, RATE_LIMIT_TMAP_DRIVING, RATE_LIMIT_GOOGLE_DIRECTIONS
+
+사용법 (http_client.request가 upstream 이름으로 자동 적용):
+    from .rate_limiter import rate_limiter
+    if not rate_limiter.acquire('tmap_transit'): ...
+"""
+import math
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+# 업스트림별 기본 한도 (초당 호출 수)
+DEFAULT_RATES = {
+    'tmap_transit': 2.0,
+    'tmap_pedestrian': 5.0,
+    'tmap_driving': 5.0,
+    'google_directions': 20.0,
+}
+
+# 차례를 기다리는 최대 시간 (초) - 넘으면 거절
+MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "5"))
+
+# 429 응답에 Retry-After가 없을 때 물러나는 시간 (초)
+DEFAULT_PENALTY = 1.0
+
+
+class TokenBucket:
+    """토큰 버킷 하나 (스레드 안전)"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst or max(1, math.ceil(rate))
+        self._lock = threading.Lock()
+        # 음수면 이미 예약된 대기 호출 수만큼 빚진 상태
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self.acquired = 0
+        self.waited = 0
+        self.wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.rejected = 0
+        self.throttled = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, max_wait: float = MAX_WAIT) -> bool:
+        """
+        토큰 1개 소비 (없으면 차례가 올 때까지 대기)
+
+        Returns:
+            True: 호출 가능, False: 예상 대기가 max_wait 초과로 거절
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+            if wait > max_wait:
+                self.rejected += 1
+                return False
+            # 대기 전에 토큰을 예약해 뒤에 온 호출이 앞지르지 않도록 함
+            self._tokens -= 1
+            self.acquired += 1
+            if wait > 0:
+                self.waited += 1
+                self.wait_ms += wait * 1000
+                self.max_wait_ms = max(self.max_wait_ms, wait * 1000)
+
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    def penalize(self, delay: float) -> None:
+        """429 응답 후 delay초 동안 새 토큰이 없도록 버킷을 비움"""
+        with self._lock:
+            self._refill(time.monotonic())
+            # 다음 토큰이 delay초 뒤에 생기도록 (이미 대기 중인 호출이 있으면 그 뒤로)
+            self._tokens = min(self._tokens, 1.0) - delay * self.rate
+            self.throttled += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'rate_per_sec': self.rate,
+                'burst': self.burst,
+                'tokens': round(self._tokens, 2),
+                # 지금 호출하면 기다려야 하는 시간 (0보다 크면 포화 상태)
+                'backlog_ms': round(max(0.0, 1 - self._tokens) / self.rate * 1000, 1),
+                'acquired': self.acquired,
+                'waited': self.waited,
+                'wait_ms': round(self.wait_ms, 1),
+                'max_wait_ms': round(self.max_wait_ms, 1),
+                'rejected': self.rejected,
+                'throttled_429': self.throttled,
+            }
+
+
+class RateLimiter:
+    """업스트림 이름별 토큰 버킷 모음 (한도가 설정된 업스트림만 제한)"""
+
+    def __init__(self, rates: Dict[str, float]):
+        self._buckets = {name: TokenBucket(rate) for name, rate in rates.items() if rate > 0}
+
+    def acquire(self, upstream: str, max_wait: float = MAX_WAIT) -> bool:
+        bucket = self._buckets.get(upstream)
+        return bucket is None or bucket.acquire(max_wait)
+
+    def penalize(self, upstream: str, retry_after: Optional[str] = None) -> None:
+        """
+        429 응답 반영
+
+        Args:
+            retry_after: Retry-After 헤더 값 (초 단위만 해석, 없거나 날짜 형식이면 DEFAULT_PENALTY)
+        """
+        bucket = self._buckets.get(upstream)
+        if bucket is None:
+            return
+        try:
+            delay = min(float(retry_after), MAX_WAIT) if retry_after else DEFAULT_PENALTY
+        except ValueError:
+            delay = DEFAULT_PENALTY
+        bucket.penalize(delay)
+
+    def stats(self) -> Dict[str, Dict]:
+        return {name: bucket.snapshot() for name, bucket in sorted(self._buckets.items())}
+
+
+def _configured_rates() -> Dict[str, float]:
+    return {
+        name: float(os.getenv(f"RATE_LIMIT_{name.upper()}", str(rate)))
+        for name, rate in DEFAULT_RATES.items()
+    }
+
+
+# 프로세스 공용 인스턴스
+rate_limiter = RateLimiter(_configured_rates())
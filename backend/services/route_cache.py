@@ -1,11 +1,24 @@
 """
 경로 캐시 서비스
 API 비용 절감을 위해 경로 정보를 DB에 캐싱
+
+1차: 프로세스 내 LRU (ROUTE_MEMORY_CACHE_SIZE, ROUTE_MEMORY_CACHE_TTL초)
+2차: route_cache 테이블 (CACHE_EXPIRY_DAYS일, 워커/재시작 간 공유)
+DirectionsService는 get_route로 읽기 통과(read-through) 조회한다.
+
+캐시 조회는 SELECT만 수행한다. 적중 횟수는 메모리에 모았다가 유지보수 스레드가 주기적으로 일괄 UPDATE하고,
+만료 행 삭제도 같은 스레드가 일괄 DELETE로 처리한다 (start_maintenance).
 """
+import atexit
+import copy
 import json
+import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
-from sqlalchemy import select
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import bindparam, delete, func, select
 
 from .database import get_db, RouteCache
 
@@ -19,6 +32,29 @@ class RouteCacheService:
     # 캐시 만료 시간 (일)
     CACHE_EXPIRY_DAYS = 30
 
+    # 1차(메모리) 캐시 크기 / TTL (초, 0이면 메모리 캐시 비활성화)
+    MEMORY_CACHE_SIZE = int(os.getenv("ROUTE_MEMORY_CACHE_SIZE", "5000"))
+    MEMORY_CACHE_TTL = int(os.getenv("ROUTE_MEMORY_CACHE_TTL", "3600"))
+
+    # cache_key → (만료 시각, 경로 데이터)
+    _memory: 'OrderedDict[str, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+    _memory_lock = threading.Lock()
+    _memory_hits = 0
+    _db_hits = 0
+    _misses = 0
+
+    # 적중 횟수 DB 반영 주기 / 만료 캐시 정리 주기 (초)
+    HIT_FLUSH_INTERVAL = float(os.getenv("ROUTE_CACHE_HIT_FLUSH_INTERVAL", "30"))
+    EXPIRY_SWEEP_INTERVAL = float(os.getenv("ROUTE_CACHE_SWEEP_INTERVAL", "3600"))
+
+    # 만료 캐시 DELETE 한 번에 지우는 최대 행 수
+    EXPIRY_DELETE_BATCH = 5000
+
+    # cache_key → [누적 적중 횟수, 마지막 적중 시각] (아직 DB에 반영하지 않은 분)
+    _pending_hits: Dict[str, List] = {}
+    _pending_lock = threading.Lock()
+    _maintenance_thread: Optional[threading.Thread] = None
+
     @classmethod
     def _generate_cache_key(
         cls,
@@ -36,6 +72,80 @@ class RouteCacheService:
 
         return f"{o_lat}_{o_lng}_{d_lat}_{d_lng}_{mode}"
 
+    @classmethod
+    def get_route(
+        cls,
+        origin: Dict[str, float],
+        destination: Dict[str, float],
+        mode: str,
+        fetch: Callable[[], Optional[Dict[str, Any]]],
+        cacheable: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        읽기 통과 경로 조회: 메모리 LRU → route_cache 테이블 → fetch() 호출 후 두 단계에 저장
+
+        Args:
+            origin: {"latitude": float, "longitude": float}
+            destination: {"latitude": float, "longitude": float}
+            mode: 캐시 모드 ("walking", "driving", "transit", "google_walking", ...)
+            fetch: 캐시에 없을 때 호출할 함수 (실패 시 None)
+            cacheable: 결과 저장 여부 판단 (기본: None이 아니면 저장)
+
+        Returns:
+            경로 데이터 (호출부가 수정해도 캐시에 영향 없는 사본) 또는 fetch() 결과
+        """
+        cache_key = cls._generate_cache_key(
+            origin['latitude'], origin['longitude'],
+            destination['latitude'], destination['longitude'],
+            mode
+        )
+
+        cached = cls._memory_get(cache_key)
+        if cached is not None:
+            cls._memory_hits += 1
+            cls._record_hit(cache_key)
+            return copy.deepcopy(cached)
+
+        cached = cls.get_cached_route(origin, destination, mode)
+        if cached is not None:
+            cls._db_hits += 1
+            cls._memory_put(cache_key, copy.deepcopy(cached))
+            return cached
+
+        cls._misses += 1
+        result = fetch()
+        if result is None or (cacheable is not None and not cacheable(result)):
+            return result
+
+        cls.save_route_to_cache(origin, destination, mode, result)
+        cls._memory_put(cache_key, copy.deepcopy(result))
+        return result
+
+    @classmethod
+    def _memory_get(cls, cache_key: str) -> Optional[Dict[str, Any]]:
+        if cls.MEMORY_CACHE_TTL <= 0:
+            return None
+        now = time.monotonic()
+        with cls._memory_lock:
+            entry = cls._memory.get(cache_key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del cls._memory[cache_key]
+                return None
+            cls._memory.move_to_end(cache_key)
+            return entry[1]
+
+    @classmethod
+    def _memory_put(cls, cache_key: str, data: Dict[str, Any]) -> None:
+        if cls.MEMORY_CACHE_TTL <= 0:
+            return
+        with cls._memory_lock:
+            cls._memory[cache_key] = (time.monotonic() + cls.MEMORY_CACHE_TTL, data)
+            cls._memory.move_to_end(cache_key)
+            while len(cls._memory) > cls.MEMORY_CACHE_SIZE:
+                cls._memory.popitem(last=False)
+
     @classmethod
     def get_cached_route(
         cls,
@@ -60,31 +170,26 @@ class RouteCacheService:
             mode
         )
 
+        # 만료된 행은 조회하지 않음 (삭제는 유지보수 스레드의 clear_expired_cache)
+        expiry_date = datetime.utcnow() - timedelta(days=cls.CACHE_EXPIRY_DAYS)
+
         db = get_db()
         try:
-            cache_entry = db.scalars(
-                select(RouteCache).where(RouteCache.cache_key == cache_key)
+            response_data = db.scalars(
+                select(RouteCache.response_data).where(
+                    RouteCache.cache_key == cache_key,
+                    RouteCache.created_at >= expiry_date
+                )
             ).first()
 
-            if not cache_entry:
+            if response_data is None:
                 return None
 
-            # 만료 확인
-            expiry_date = cache_entry.created_at + timedelta(days=cls.CACHE_EXPIRY_DAYS)
-            if datetime.utcnow() > expiry_date:
-                # 만료된 캐시 삭제
-                db.delete(cache_entry)
-                db.commit()
-                print(f"[RouteCache] Expired cache removed: {cache_key}")
-                return None
-
-            # 캐시 적중 횟수 업데이트
-            cache_entry.hit_count += 1
-            cache_entry.last_hit_at = datetime.utcnow()
-            db.commit()
+            # 캐시 적중 횟수는 메모리에 모았다가 flush_hit_counts에서 일괄 반영
+            cls._record_hit(cache_key)
 
-            print(f"[RouteCache] Cache HIT: {cache_key} (hits: {cache_entry.hit_count})")
-            return json.loads(cache_entry.response_data)
+            print(f"[RouteCache] Cache HIT: {cache_key}")
+            return json.loads(response_data)
 
         except Exception as e:
             print(f"[RouteCache] Error reading cache: {e}")
@@ -92,6 +197,98 @@ class RouteCacheService:
         finally:
             db.close()
 
+    @classmethod
+    def _record_hit(cls, cache_key: str) -> None:
+        if cls.HIT_FLUSH_INTERVAL <= 0:
+            return
+        now = datetime.utcnow()
+        with cls._pending_lock:
+            pending = cls._pending_hits.get(cache_key)
+            if pending is None:
+                cls._pending_hits[cache_key] = [1, now]
+            else:
+                pending[0] += 1
+                pending[1] = now
+
+    @classmethod
+    def flush_hit_counts(cls) -> int:
+        """
+        메모리에 모은 적중 횟수를 한 번의 일괄 UPDATE(executemany)로 반영
+
+        Returns:
+            반영한 캐시 키 수 (실패 시 0, 모은 횟수는 다음 주기에 다시 시도)
+        """
+        with cls._pending_lock:
+            pending, cls._pending_hits = cls._pending_hits, {}
+        if not pending:
+            return 0
+
+        table = RouteCache.__table__
+        stmt = table.update().where(
+            table.c.cache_key == bindparam('b_cache_key')
+        ).values(
+            hit_count=func.coalesce(table.c.hit_count, 0) + bindparam('b_hits'),
+            last_hit_at=bindparam('b_last_hit_at')
+        )
+
+        db = get_db()
+        try:
+            db.execute(stmt, [
+                {'b_cache_key': cache_key, 'b_hits': hits, 'b_last_hit_at': last_hit_at}
+                for cache_key, (hits, last_hit_at) in pending.items()
+            ])
+            db.commit()
+            return len(pending)
+
+        except Exception as e:
+            db.rollback()
+            print(f"[RouteCache] Error flushing hit counts: {e}")
+            # 실패분은 새로 모인 횟수와 합쳐 다음 주기에 다시 시도
+            with cls._pending_lock:
+                for cache_key, (hits, last_hit_at) in pending.items():
+                    current = cls._pending_hits.get(cache_key)
+                    if current is None:
+                        cls._pending_hits[cache_key] = [hits, last_hit_at]
+                    else:
+                        current[0] += hits
+            return 0
+        finally:
+            db.close()
+
+    @classmethod
+    def start_maintenance(cls, flush_interval: float = None, sweep_interval: float = None) -> None:
+        """
+        데몬 스레드에서 적중 횟수 반영(flush_interval초마다)과 만료 캐시 정리(sweep_interval초마다) 수행
+
+        두 작업은 각자 주기로 실행되며 0 이하인 작업만 꺼진다 (둘 다 꺼지면 스레드를 만들지 않음).
+        gunicorn 워커마다 한 번씩 호출되며, 종료 시 남은 적중 횟수를 반영한다.
+        """
+        if cls._maintenance_thread is not None:
+            return
+        flush_interval = cls.HIT_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        sweep_interval = cls.EXPIRY_SWEEP_INTERVAL if sweep_interval is None else sweep_interval
+        tasks = [
+            (interval, task)
+            for interval, task in ((flush_interval, cls.flush_hit_counts), (sweep_interval, cls.clear_expired_cache))
+            if interval > 0
+        ]
+        if not tasks:
+            return
+
+        def maintain():
+            next_runs = [time.monotonic() + interval for interval, _ in tasks]
+            while True:
+                time.sleep(max(0.0, min(next_runs) - time.monotonic()))
+                for i, (interval, task) in enumerate(tasks):
+                    if next_runs[i] <= time.monotonic():
+                        next_runs[i] = time.monotonic() + interval
+                        task()
+
+        cls._maintenance_thread = threading.Thread(target=maintain, name='route-cache-maintenance', daemon=True)
+        cls._maintenance_thread.start()
+        if flush_interval > 0:
+            atexit.register(cls.flush_hit_counts)
+
     @classmethod
     def save_route_to_cache(
         cls,
@@ -162,26 +359,39 @@ class RouteCacheService:
 
     @classmethod
     def get_cache_stats(cls) -> Dict[str, Any]:
-        """캐시 통계 조회"""
+        """캐시 통계 조회 (모드별 건수/적중 횟수를 GROUP BY 한 번으로 집계)"""
         db = get_db()
         try:
-            from sqlalchemy import func
-
-            total_entries = db.query(func.count(RouteCache.id)).scalar() or 0
-            total_hits = db.query(func.sum(RouteCache.hit_count)).scalar() or 0
+            rows = db.execute(
+                select(
+                    RouteCache.mode,
+                    func.count(RouteCache.id),
+                    func.coalesce(func.sum(RouteCache.hit_count), 0)
+                ).group_by(RouteCache.mode)
+            ).all()
 
-            # 모드별 통계
-            mode_stats = {}
-            for mode in ['walking', 'driving', 'transit']:
-                count = db.query(func.count(RouteCache.id)).filter(
-                    RouteCache.mode == mode
-                ).scalar() or 0
+            # 모드별 통계 (기본 모드는 0건이어도 표시)
+            mode_stats = {mode: 0 for mode in ['walking', 'driving', 'transit']}
+            total_entries = 0
+            total_hits = 0
+            for mode, count, hits in rows:
                 mode_stats[mode] = count
+                total_entries += count
+                total_hits += hits
+
+            with cls._memory_lock:
+                memory_entries = len(cls._memory)
 
             return {
                 'total_entries': total_entries,
                 'total_hits': total_hits,
-                'by_mode': mode_stats
+                'by_mode': mode_stats,
+                'memory': {
+                    'entries': memory_entries,
+                    'memory_hits': cls._memory_hits,
+                    'db_hits': cls._db_hits,
+                    'misses': cls._misses
+                }
             }
 
         except Exception as e:
@@ -191,31 +401,47 @@ class RouteCacheService:
             db.close()
 
     @classmethod
-    def clear_expired_cache(cls) -> int:
-        """만료된 캐시 정리"""
-        db = get_db()
-        try:
-            expiry_date = datetime.utcnow() - timedelta(days=cls.CACHE_EXPIRY_DAYS)
+    def clear_expired_cache(cls, batch_size: int = None) -> int:
+        """
+        만료된 캐시 정리
 
-            expired = db.query(RouteCache).filter(
-                RouteCache.created_at < expiry_date
-            ).all()
+        행을 읽어 오지 않고 DELETE ... WHERE mode = :mode AND created_at < :cutoff를
+        batch_size행씩 나눠 실행한다 ((mode, created_at) 인덱스 사용, 배치마다 커밋해 잠금 시간을 짧게 유지).
 
-            deleted_count = len(expired)
-            for entry in expired:
-                db.delete(entry)
+        Returns:
+            삭제한 행 수
+        """
+        batch_size = batch_size or cls.EXPIRY_DELETE_BATCH
+        expiry_date = datetime.utcnow() - timedelta(days=cls.CACHE_EXPIRY_DAYS)
+        deleted_count = 0
+
+        db = get_db()
+        try:
+            modes = db.scalars(select(RouteCache.mode).distinct()).all()
+            for mode in modes:
+                while True:
+                    expired_ids = select(RouteCache.id).where(
+                        RouteCache.mode == mode,
+                        RouteCache.created_at < expiry_date
+                    ).limit(batch_size)
+                    result = db.execute(
+                        delete(RouteCache).where(RouteCache.id.in_(expired_ids)),
+                        execution_options={'synchronize_session': False}
+                    )
+                    db.commit()
+                    deleted_count += result.rowcount
+                    if result.rowcount < batch_size:
+                        break
 
-            db.commit()
             print(f"[RouteCache] Cleared {deleted_count} expired entries")
             return deleted_count
 
         except Exception as e:
             db.rollback()
             print(f"[RouteCache] Error clearing cache: {e}")
-            return 0
+            return deleted_count
         finally:
             db.close()
 
-
 # 싱글톤 인스턴스
 route_cache = RouteCacheService()
@@ -0,0 +1,146 @@
+"""
+동일 업스트림 호출 병합 (single-flight)
+
+같은 자리에서 여러 사용자가 동시에 주변 가맹점을 찾거나, 코스 생성이 같은 카테고리 검색/경로를 반복하면
+캐시가 채워지기 전까지는 같은 외부 API 호출이 동시에 여러 번 나간다.
+같은 키의 호출이 이미 진행 중이면 새로 호출하지 않고 그 결과를 기다려 함께 쓴다.
+
+- 키: 메서드 이름 + 정규화한 인자 (실수는 소수점 6자리 ≈ 0.1m, dict/list는 정렬된 튜플)
+- 먼저 들어온 호출(리더)만 실제로 실행하고, 나머지는 리더가 끝날 때까지 대기 후 결과의 깊은 복사본을 받음
+  (호출부가 결과를 수정해도 서로 영향 없음). 리더가 예외를 던지면 대기자도 같은 예외를 받음
+- 진행 중인 호출만 병합하며 결과를 저장하지 않음 (캐시는 각 서비스의 캐시가 담당)
+- threading.Lock/Event만 사용하므로 ThreadPoolExecutor 스레드와 eventlet 그린 스레드(monkey patch) 모두에서 동작
+
+사용법:
+    from .single_flight import coalesce
+
+    class GeocodingService:
+        @coalesce('geocode')
+        def get_coordinates(self, address): ...
+"""
+import copy
+import functools
+import inspect
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+# 좌표 등 실수 인자 정규화 자릿수 (소수점 6자리 ≈ 0.1m)
+FLOAT_PRECISION = 6
+
+
+class _Call:
+    """진행 중인 호출 하나"""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """키별 진행 중 호출 병합 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        # 이름별 (실제 실행 수, 병합된 호출 수)
+        self._counts: Dict[str, list] = {}
+
+    def do(self, key: Tuple, fn: Callable, *args, **kwargs) -> Any:
+        """
+        key가 같은 호출이 진행 중이면 그 결과를 기다려 반환, 아니면 fn(*args, **kwargs) 실행
+
+        Args:
+            key: (이름, ...) 해시 가능한 튜플 - 첫 요소는 통계 이름
+        """
+        with self._lock:
+            counts = self._counts.setdefault(key[0], [0, 0])
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                counts[0] += 1
+                leader = True
+            else:
+                call.waiters += 1
+                counts[1] += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+            raise
+
+        with self._lock:
+            self._calls.pop(key, None)
+            waiters = call.waiters
+        if waiters:
+            # 리더 호출부가 결과를 수정하기 전에 대기자용 사본을 떠 둠
+            call.result = copy.deepcopy(result)
+        call.done.set()
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                name: {'executed': executed, 'coalesced': coalesced, 'in_flight': sum(1 for k in self._calls if k[0] == name)}
+                for name, (executed, coalesced) in sorted(self._counts.items())
+            }
+
+
+# 프로세스 공용 인스턴스
+single_flight = SingleFlight()
+
+
+def normalize(value: Any) -> Hashable:
+    """호출 인자 → 해시 가능한 정규화 키"""
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, float):
+        return round(value, FLOAT_PRECISION)
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), normalize(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(normalize(v) for v in value))
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def coalesce(name: str) -> Callable:
+    """
+    메서드 호출을 single_flight로 병합하는 데코레이터
+
+    같은 인스턴스 + 같은 인자(기본값 적용 후 정규화)의 동시 호출이 하나의 실행을 공유한다.
+    """
+    def decorator(method: Callable) -> Callable:
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = tuple(
+                (param, normalize(value)) for param, value in bound.arguments.items() if param != 'self'
+            )
+            return single_flight.do((name, id(self), arguments), method, self, *args, **kwargs)
+
+        return wrapper
+    return decorator
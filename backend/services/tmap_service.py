@@ -14,6 +14,8 @@ from typing import Dict, List, Any, Optional
 from dotenv import load_dotenv
 from pathlib import Path
 
+from . import http_client
+
 # Load environment variables from backend/.env
 backend_dir = Path(__file__).parent.parent
 env_path = backend_dir / '.env'
@@ -96,8 +98,9 @@ class TmapService:
             return None
 
         try:
-            response = requests.post(
+            response = http_client.post(
                 self.ROUTES_URL,
+                upstream='tmap_driving',
                 headers={
                     'appKey': self.api_key,
                     'Content-Type': 'application/json'
@@ -231,15 +234,14 @@ class TmapService:
             print("[TMAP Transit] Error: TMAP_API_KEY not set")
             return {"error": "TMAP_API_KEY not configured", "itineraries": []}
 
-        import time
-
+        # 호출 간격/429 후 대기는 http_client의 업스트림 속도 제한(rate_limiter)이 맡으므로 여기서는 잠들지 않음
         max_retries = 3
-        retry_delay = 1  # seconds
 
         for attempt in range(max_retries):
             try:
-                response = requests.post(
+                response = http_client.post(
                     self.TRANSIT_URL,
+                    upstream='tmap_transit',
                     headers={
                         'appKey': self.api_key,
                         'Content-Type': 'application/json'
@@ -256,11 +258,9 @@ class TmapService:
                 )
 
                 if response.status_code == 429:
-                    # Rate limit - wait and retry
+                    # Rate limit - 다음 호출은 rate_limiter가 Retry-After만큼 늦춰 차례를 줌
                     if attempt < max_retries - 1:
-                        wait_time = retry_delay * (2 ** attempt)  # Exponential backoff
-                        print(f"[TMAP Transit] Rate limit (429), retrying in {wait_time}s... (attempt {attempt + 1}/{max_retries})")
-                        time.sleep(wait_time)
+                        print(f"[TMAP Transit] Rate limit (429), retrying after limiter backoff... (attempt {attempt + 1}/{max_retries})")
                         continue
                     else:
                         print(f"[TMAP Transit] Rate limit (429) - max retries exceeded")
@@ -274,11 +274,13 @@ class TmapService:
             except requests.exceptions.Timeout:
                 if attempt < max_retries - 1:
                     print(f"[TMAP Transit] Timeout, retrying... (attempt {attempt + 1}/{max_retries})")
-                    time.sleep(retry_delay)
                     continue
                 else:
                     print(f"[TMAP Transit] Timeout - max retries exceeded")
                     return {"error": "Request timeout", "itineraries": []}
+            except http_client.RateLimitExceeded:
+                print(f"[TMAP Transit] Rate limit wait exceeded - skipping call")
+                return {"error": "Rate limit exceeded", "itineraries": []}
             except requests.exceptions.RequestException as e:
                 print(f"[TMAP Transit] Request exception: {e}")
                 return {"error": f"Network error: {str(e)}", "itineraries": []}
@@ -437,8 +439,9 @@ class TmapService:
             return None
 
         try:
-            response = requests.post(
+            response = http_client.post(
                 self.WALK_URL,
+                upstream='tmap_pedestrian',
                 headers={
                     'appKey': self.api_key,
                     'Content-Type': 'application/json'
@@ -0,0 +1,62 @@
+"""
+캐시/공간 인덱스/최적화 단위 테스트 공통 fixture
+
+외부 API는 호출하지 않는다. DB가 필요한 테스트는 임시 sqlite 파일을 사용한다
+(services.database가 import 시점에 DATABASE_URL을 읽으므로 import 전에 설정).
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+_DB_DIR = tempfile.mkdtemp(prefix='cardealo-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+
+from services.database import Base, engine, get_db  # noqa: E402
+
+
+@pytest.fixture
+def db_session_factory():
+    """빈 테이블로 초기화한 임시 DB의 세션 팩토리 (get_db와 같은 사용법)"""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    return get_db
+
+
+@pytest.fixture
+def location_service(monkeypatch):
+    """
+    외부 API 키만 가짜로 채운 LocationService
+
+    가맹점 저장소는 꺼 두므로 테스트는 _fetch_nearby_places 등을 바꿔 끼워 업스트림 호출을 흉내 낸다.
+    """
+    monkeypatch.setenv('NCP_CLIENT_ID', 'test')
+    monkeypatch.setenv('NCP_CLIENT_SECRET', 'test')
+    monkeypatch.setenv('GOOGLE_MAPS_API_KEY', 'test-key')
+    monkeypatch.setenv('MERCHANT_CELL_TTL', '0')
+    from services.location_service import LocationService
+    return LocationService()
+
+
+def _make_places(lat: float, lng: float, count: int, prefix: str = 'p', category: str = 'cafe') -> list:
+    return [
+        {
+            'name': f'{prefix}{i}',
+            'category': category,
+            'address': '',
+            'latitude': lat + i * 1e-5,
+            'longitude': lng,
+            'place_id': f'{prefix}{i}',
+            'photo_url': None,
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(scope='session')
+def make_places():
+    """(lat, lng, count) → (lat, lng)에서 북쪽으로 약 1.1m 간격으로 늘어선 가짜 Places 결과"""
+    return _make_places
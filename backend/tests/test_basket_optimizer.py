@@ -0,0 +1,106 @@
+"""BasketOptimizer 정확 탐색을 작은 입력의 완전 탐색과 비교, 탐욕 배정은 상한 이내"""
+import itertools
+import json
+import random
+
+import numpy as np
+import pytest
+
+from services.basket_optimizer import BasketOptimizer, PlannedPurchase
+from services.benefit_engine import BenefitEngine, CardState
+
+
+def _rule(card, category, discount_type, value, limits=None, max_discount=''):
+    return {
+        'card_name': card, 'category': category, 'places': '[]', 'discount_type': discount_type,
+        'discount_value': str(value), 'max_discount': str(max_discount), 'pre_month_config': 'null',
+        'limit_config': json.dumps(limits or {}),
+    }
+
+
+# 일 1회 / 월 N회 / 월 할인 한도가 결제 사이에 서로 간섭하도록 구성
+RULES = [
+    _rule('A', 'cafe', 'percent', 20, {'daily_limit': 1}),
+    _rule('A', 'convenience', 'percent', 50, {'daily_limit': 1}),
+    _rule('B', 'cafe', 'percent', 10),
+    _rule('B', 'restaurant', 'amount', 3000, {'monthly_limit': 2, 'min_amount': 15000}),
+    _rule('C', 'restaurant', 'percent', 15, {'monthly_limit': 4000}),
+    _rule('C', 'convenience', 'percent', 10, {'monthly_limit': 4000}),
+]
+CARDS = ('A', 'B', 'C')
+CATEGORIES = ('cafe', 'convenience', 'restaurant')
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return BenefitEngine(RULES)
+
+
+def _brute_force(engine, purchases, states):
+    """모든 배정(카드 또는 미사용)을 결제 순서대로 적용해 최대 총 할인액 계산"""
+    best = 0
+    for assignment in itertools.product((None,) + CARDS, repeat=len(purchases)):
+        cur_states, consumed, total = dict(states), np.zeros(len(engine.rules)), 0
+        for purchase, card in zip(purchases, assignment):
+            if card is None:
+                continue
+            rules = [i for i in engine.candidate_rules(purchase.merchant_name, purchase.category).tolist()
+                     if engine.rules[i]['card'] == card]
+            discounts = engine.evaluate(purchase.amount, cur_states, consumed)
+            rule = max(rules, key=lambda i: discounts[i], default=None)
+            discount = int(discounts[rule]) if rule is not None else 0
+            state = cur_states[card]
+            cur_states[card] = state._replace(
+                daily_count=state.daily_count + 1,
+                monthly_count=state.monthly_count + 1,
+                used_amount=state.used_amount + purchase.amount - discount,
+            )
+            if rule is not None:
+                consumed[rule] += discount
+            total += discount
+        best = max(best, total)
+    return best
+
+
+def _random_purchases(seed):
+    rng = random.Random(seed)
+    return [
+        PlannedPurchase(None, rng.choice(CATEGORIES), rng.choice((4000, 9000, 16000, 30000)))
+        for _ in range(rng.randint(2, 5))
+    ]
+
+
+def test_exact_beats_picking_each_place_independently(engine):
+    # 카페에서 A(일 1회)를 쓰면 편의점 50% 할인이 사라짐 → 카페는 B가 최적
+    purchases = [PlannedPurchase('카페', 'cafe', 10000), PlannedPurchase('편의점', 'convenience', 4000)]
+    states = {card: CardState() for card in CARDS}
+
+    plan = BasketOptimizer(engine).optimize(purchases, states)
+
+    assert plan['method'] == 'exact'
+    assert [a['card'] for a in plan['assignments']] == ['B', 'A']
+    assert plan['total_discount'] == 3000 == _brute_force(engine, purchases, states)
+    assert plan['upper_bound'] == 4000
+
+
+@pytest.mark.parametrize('seed', range(12))
+def test_exact_matches_brute_force(engine, seed):
+    purchases = _random_purchases(seed)
+    states = {'A': CardState(), 'B': CardState(monthly_count=seed % 3), 'C': CardState(used_amount=1000)}
+
+    plan = BasketOptimizer(engine).optimize(purchases, states)
+
+    assert plan['method'] == 'exact'
+    assert plan['total_discount'] == _brute_force(engine, purchases, states)
+    assert plan['total_discount'] <= plan['upper_bound']
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_greedy_stays_within_optimum(engine, seed):
+    purchases = _random_purchases(seed)
+    states = {card: CardState() for card in CARDS}
+
+    plan = BasketOptimizer(engine, exact_search_limit=1).optimize(purchases, states)
+
+    assert plan['method'] == 'greedy'
+    assert plan['total_discount'] <= _brute_force(engine, purchases, states) <= plan['upper_bound']
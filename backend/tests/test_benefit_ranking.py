@@ -0,0 +1,84 @@
+"""카드 상태가 있을 때 예상 할인액(원) 기준 top_card 순위, 관리자 QR 할인의 티어/한도 반영"""
+import csv
+import json
+
+import pytest
+from cardealo_benefits.benefit_rules import BenefitRuleSet, CardUsage
+
+from services.benefit_engine import CardState
+from services.benefit_lookup_service import BenefitLookupService
+
+# 정적 score는 A가 높지만, A는 월 1천원 한도라 실제 할인액은 B가 더 큼
+RULES = [
+    {
+        'card_name': 'A', 'category': 'cafe', 'places': '[]', 'discount_type': 'percent',
+        'discount_value': '10', 'max_discount': '', 'pre_month_config': 'null',
+        'limit_config': json.dumps({'monthly_limit': 1000}),
+    },
+    {
+        'card_name': 'B', 'category': 'cafe', 'places': '[]', 'discount_type': 'amount',
+        'discount_value': '2000', 'max_discount': '', 'pre_month_config': 'null',
+        'limit_config': json.dumps({'daily_limit': 1}),
+    },
+    {
+        'card_name': 'T', 'category': 'mart', 'places': '[]', 'discount_type': 'percent',
+        'discount_value': '5', 'max_discount': '3000',
+        'pre_month_config': json.dumps({'required': True, 'tiers': [
+            {'threshold': 300000, 'discount_value': 5, 'max_discount': 5000},
+            {'threshold': 700000, 'discount_value': 10, 'max_discount': 10000},
+        ]}),
+        'limit_config': json.dumps({'per_transaction_limit': 20000, 'min_amount': 10000, 'monthly_limit': 3}),
+    },
+]
+BENEFITS_DB = {'cafe': {'default': [{'card': 'A', 'score': 90}, {'card': 'B', 'score': 50}]}}
+
+
+@pytest.fixture
+def benefit_service(tmp_path):
+    db_path = tmp_path / 'benefits_db.json'
+    db_path.write_text(json.dumps(BENEFITS_DB), encoding='utf-8')
+    csv_path = tmp_path / 'card_benefits.csv'
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(RULES[0]))
+        writer.writeheader()
+        writer.writerows(RULES)
+    return BenefitLookupService(
+        db_path=str(db_path), snapshot_path=str(tmp_path / 'missing.msgpack'), card_benefits_path=str(csv_path)
+    )
+
+
+def test_without_card_states_ranks_by_score(benefit_service):
+    top = benefit_service.get_top_card_for_merchant('스타벅스', 'cafe', ['A', 'B'])
+    assert top['card'] == 'A'
+    assert 'expected_discount' not in top
+
+
+def test_card_states_rank_by_expected_discount(benefit_service):
+    states = {'A': CardState(), 'B': CardState()}
+    top = benefit_service.get_top_card_for_merchant('스타벅스', 'cafe', ['A', 'B'], card_states=states)
+    assert (top['card'], top['expected_discount']) == ('B', 2000)
+
+    batch = benefit_service.get_top_cards_batch([('스타벅스', 'cafe'), ('이디야', 'cafe')], ['A', 'B'], None, states)
+    assert [top['card'] for top in batch] == ['B', 'B']
+
+    ranked = benefit_service.get_recommendations('스타벅스', 'cafe', ['A', 'B'], card_states=states)
+    assert [(r['rank'], r['card'], r['expected_discount']) for r in ranked] == [(1, 'B', 2000), (2, 'A', 600)]
+
+
+def test_exhausted_card_falls_back_to_next_best(benefit_service):
+    states = {'A': CardState(), 'B': CardState(daily_count=1)}
+    top = benefit_service.get_top_card_for_merchant('스타벅스', 'cafe', ['A', 'B'], card_states=states)
+    assert (top['card'], top['expected_discount']) == ('A', 600)
+
+
+def test_admin_calculate_applies_tiers_and_limits():
+    rules = BenefitRuleSet(RULES)
+    # 전월실적 모름 → 최저 티어, 건당 이용금액 2만원까지만 할인 대상, 건당 최대 3천원
+    assert rules.calculate('T', 'mart', '이마트', 50000)['discount_amount'] == 1000
+    assert rules.calculate('T', 'mart', '이마트', 50000, previous_month_performance=800000)['discount_amount'] == 2000
+    # 필수 전월실적 미달, 최소 결제금액 미달, 월 횟수 소진
+    assert rules.calculate('T', 'mart', '이마트', 50000, previous_month_performance=100000)['discount_amount'] == 0
+    assert rules.calculate('T', 'mart', '이마트', 9000)['discount_amount'] == 0
+    assert rules.calculate('T', 'mart', '이마트', 50000, CardUsage(monthly_count=3))['discount_amount'] == 0
+    # 월 1천원 할인 한도에서 이번 달 받은 할인액 차감
+    assert rules.calculate('A', 'cafe', None, 6000, CardUsage(discounted_amount=700))['discount_amount'] == 300
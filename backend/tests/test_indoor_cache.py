@@ -0,0 +1,79 @@
+"""IndoorPlaceCache / LocationService._get_indoor_places 셀 캐시 동작"""
+from services import geo
+from services.indoor_cache import IndoorPlaceCache
+
+MALL = (37.5113, 127.0595)
+
+
+def _place(name, lat, lng, types=('store',)):
+    return {
+        'id': name,
+        'displayName': {'text': name},
+        'location': {'latitude': lat, 'longitude': lng},
+        'types': list(types),
+        'formattedAddress': '',
+    }
+
+
+def test_cell_call_covers_detection_radius():
+    cache = IndoorPlaceCache(radius=30.0)
+    cell = cache.cell_for(*MALL)
+    assert cell.radius > 30.0
+    # 셀 안의 사용자 좌표에서 감지 원이 호출 원 안에 들어감
+    assert geo.haversine(*MALL, cell.lat, cell.lng) + 30.0 <= cell.radius
+
+
+def test_get_filters_to_detection_radius_and_keeps_order():
+    cache = IndoorPlaceCache(radius=30.0)
+    cell = cache.cell_for(*MALL)
+    near = _place('near', MALL[0] + 0.0001, MALL[1])      # 약 11m
+    far = _place('far', MALL[0] + 0.0004, MALL[1])        # 약 44m
+    unlocated = {'id': 'x', 'displayName': {'text': 'x'}, 'types': ['store']}
+    cache.put(cell, [far, near, unlocated])
+
+    places = cache.get(*MALL)
+    assert [p['id'] for p in places] == ['near', 'x']
+    assert cache.stats()['hits'] == 1
+
+
+def test_dense_cell_is_not_served_without_direct_entry():
+    cache = IndoorPlaceCache(radius=30.0)
+    cache.put(cache.cell_for(*MALL), [], complete=False)
+    assert cache.dense(*MALL)
+    assert cache.get(*MALL) is None
+
+    cache.put_direct(*MALL, [_place('a', *MALL)])
+    assert [p['id'] for p in cache.get(*MALL)] == ['a']
+
+
+def test_dense_cell_falls_back_to_detection_radius(location_service):
+    calls = []
+    crowd = [_place(f'far{i}', MALL[0] + 0.0003, MALL[1]) for i in range(20)]
+    inside = [_place('inside', MALL[0] + 0.00005, MALL[1]), _place('road', *MALL, types=('route',))]
+
+    def fake_fetch(lat, lng, radius):
+        calls.append(radius)
+        return crowd if radius > location_service.INDOOR_RADIUS else inside
+
+    location_service._fetch_indoor_places = fake_fetch
+
+    places = location_service._get_indoor_places(*MALL)
+    assert [p['id'] for p in places] == ['inside']
+    assert len(calls) == 2 and calls[1] == location_service.INDOOR_RADIUS
+
+    # 같은 자리 반복 요청은 직접 호출 결과를 재사용
+    assert [p['id'] for p in location_service._get_indoor_places(*MALL)] == ['inside']
+    assert len(calls) == 2
+
+
+def test_sparse_cell_cached_for_whole_cell(location_service):
+    calls = []
+
+    def fake_fetch(lat, lng, radius):
+        calls.append(radius)
+        return [_place('cafe', *MALL)]
+
+    location_service._fetch_indoor_places = fake_fetch
+    for _ in range(3):
+        assert [p['id'] for p in location_service._get_indoor_places(*MALL)] == ['cafe']
+    assert len(calls) == 1 and calls[0] > location_service.INDOOR_RADIUS
@@ -0,0 +1,98 @@
+"""MerchantStore 갱신 시 사라진 가맹점 제거, 타입 기록, 메모리 상한"""
+import pytest
+
+from services.database import KnownMerchant
+from services.merchant_store import MerchantStore
+
+CENTER = (37.5856, 127.0292)
+
+
+def _store(place_id, lat, lng, types=('cafe',), category='cafe'):
+    return {
+        'name': place_id,
+        'category': category,
+        'address': '',
+        'latitude': lat,
+        'longitude': lng,
+        'place_id': place_id,
+        'photo_name': None,
+        'types': list(types),
+    }
+
+
+@pytest.fixture
+def merchant_store(db_session_factory):
+    store = MerchantStore(ttl_seconds=3600, session_factory=db_session_factory)
+    yield store
+    store.flush()
+
+
+def _ids(stores):
+    return sorted(store['place_id'] for store in stores)
+
+
+def _db_ids(session_factory):
+    db = session_factory()
+    try:
+        return sorted(row.place_id for row in db.query(KnownMerchant).all())
+    finally:
+        db.close()
+
+
+def test_complete_refresh_removes_absent_merchants(merchant_store, db_session_factory):
+    lat, lng = CENTER
+    a, b = _store('a', lat, lng), _store('b', lat + 0.0003, lng)
+    merchant_store.record_search(lat, lng, 300, ['cafe'], [a, b], complete=True)
+    assert _ids(merchant_store.query(lat, lng, 100, ['cafe'])) == ['a', 'b']
+
+    # b가 폐업해 다음 전체 검색에 없음
+    merchant_store.record_search(lat, lng, 300, ['cafe'], [a], complete=True)
+    merchant_store.flush()
+
+    assert _ids(merchant_store.query(lat, lng, 100, ['cafe'])) == ['a']
+    assert _db_ids(db_session_factory) == ['a']
+
+
+def test_truncated_search_keeps_unseen_merchants(merchant_store):
+    lat, lng = CENTER
+    a, b = _store('a', lat, lng), _store('b', lat + 0.0003, lng)
+    merchant_store.record_search(lat, lng, 300, ['cafe'], [a, b], complete=True)
+    merchant_store.record_search(lat, lng, 300, ['cafe'], [a], complete=False)
+
+    assert _ids(merchant_store.query(lat, lng, 100, ['cafe'])) == ['a', 'b']
+
+
+def test_refresh_only_removes_searched_type_and_keeps_admin(merchant_store):
+    lat, lng = CENTER
+    both = _store('both', lat, lng, types=('cafe', 'bakery'))
+    merchant_store.record_search(lat, lng, 300, ['cafe'], [both], complete=True)
+    merchant_store.record_search(lat, lng, 300, ['bakery'], [both], complete=True)
+    merchant_store.upsert([_store('admin', lat + 0.0002, lng)], source='admin', search_types=['cafe'])
+
+    merchant_store.record_search(lat, lng, 300, ['cafe'], [], complete=True)
+
+    assert _ids(merchant_store.query(lat, lng, 100, ['cafe'])) == ['admin']
+    assert _ids(merchant_store.query(lat, lng, 100, ['bakery'])) == ['both']
+
+
+def test_types_come_from_the_place_not_the_whole_call(merchant_store):
+    lat, lng = CENTER
+    grocery = _store('grocery', lat, lng, types=('grocery_store', 'store'), category='mart')
+    merchant_store.record_search(lat, lng, 300, ['supermarket', 'grocery_store'], [grocery], complete=True)
+
+    assert merchant_store.query(lat, lng, 100, ['supermarket']) == []
+    assert _ids(merchant_store.query(lat, lng, 100, ['grocery_store'])) == ['grocery']
+
+
+def test_memory_bound_evicts_buckets_and_reloads_from_db(db_session_factory):
+    merchant_store = MerchantStore(ttl_seconds=3600, session_factory=db_session_factory, max_merchants=2)
+    areas = [(CENTER[0] + i * 0.05, CENTER[1]) for i in range(3)]   # 약 5.5km 간격 (서로 다른 버킷)
+    for i, (lat, lng) in enumerate(areas):
+        merchant_store.record_search(lat, lng, 300, ['cafe'], [_store(f's{i}', lat, lng)], complete=True)
+    merchant_store.flush()
+
+    stats = merchant_store.stats()
+    assert stats['merchants'] <= 2 and stats['evictions'] >= 1
+
+    # 버려진 첫 영역은 DB의 신선도 기록과 가맹점으로 다시 응답
+    assert _ids(merchant_store.query(*areas[0], 100, ['cafe'])) == ['s0']
@@ -0,0 +1,98 @@
+"""주변 검색 커서(보관 목록, 만료, 변조)와 전체 카테고리 검색 취소"""
+import base64
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+LAT, LNG, RADIUS = 37.5856, 127.0292, 500
+
+
+@pytest.fixture
+def counted_search(location_service, make_places):
+    """단일 카테고리 검색을 가짜 결과 250건으로 바꾸고 호출 횟수를 센다"""
+    calls = []
+
+    def search(lat, lng, radius, included_types):
+        calls.append(tuple(included_types))
+        return {'stores': make_places(lat, lng, 250)}
+
+    location_service._search_single_type = search
+    return calls
+
+
+def _page(service, pagetoken=None):
+    return service.search_nearby_stores(LAT, LNG, RADIUS, 'cafe', pagetoken, 100)
+
+
+def test_next_page_is_served_from_kept_list(location_service, counted_search):
+    first = _page(location_service)
+    second = _page(location_service, first['next_page_token'])
+    third = _page(location_service, second['next_page_token'])
+
+    assert counted_search == [('cafe',)]
+    assert [s['place_id'] for s in second['stores']][:2] == ['p100', 'p101']
+    assert len(third['stores']) == 50 and third['next_page_token'] is None
+
+
+def test_expired_cursor_searches_again(location_service, counted_search):
+    first = _page(location_service)
+    list_id = next(iter(location_service._page_lists))
+    _expires, stores = location_service._page_lists[list_id]
+    location_service._page_lists[list_id] = (0.0, stores)
+
+    second = _page(location_service, first['next_page_token'])
+
+    assert len(counted_search) == 2
+    assert list_id not in location_service._page_lists
+    # 다시 검색해도 같은 오프셋부터 이어짐
+    assert second['stores'][0]['place_id'] == 'p100'
+
+
+@pytest.mark.parametrize('token', [
+    'not-base64!!',
+    base64.urlsafe_b64encode(b'[1, 2]').decode(),
+    base64.urlsafe_b64encode(json.dumps({'q': 'other', 'o': 100}).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps({'q': f"{LAT:.6f},{LNG:.6f},{RADIUS},cafe", 'o': -5}).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps({'q': f"{LAT:.6f},{LNG:.6f},{RADIUS},cafe", 'o': 100, 'c': 7}).encode()).decode(),
+])
+def test_tampered_cursor_restarts_from_first_page(location_service, counted_search, token):
+    page = _page(location_service, token)
+
+    assert counted_search == [('cafe',)]
+    assert page['stores'][0]['place_id'] == 'p0'
+
+
+def test_unknown_list_id_searches_again(location_service, counted_search):
+    token = location_service._encode_page_token(f"{LAT:.6f},{LNG:.6f},{RADIUS},cafe", 100, 'deadbeef')
+    page = _page(location_service, token)
+
+    assert counted_search == [('cafe',)]
+    assert page['stores'][0]['place_id'] == 'p100'
+
+
+def test_closing_batches_cancels_queued_category_calls(location_service):
+    running = threading.Event()
+    release = threading.Event()
+    started = []
+
+    def search(lat, lng, radius, included_types):
+        started.append(included_types[0])
+        running.set()
+        release.wait(5)
+        return {'stores': []}
+
+    location_service._search_single_type = search
+    location_service._get_cached_stores = lambda *args: None
+    location_service._category_executor = ThreadPoolExecutor(max_workers=1)
+
+    batches = location_service.iter_nearby_stores(LAT, LNG, RADIUS)
+    assert running.wait(5)
+    # 반복을 시작하지 않고 닫음 (실내 조기 반환/연결 끊김)
+    batches.close()
+    release.set()
+    location_service._category_executor.shutdown(wait=True)
+
+    assert len(started) == 1
+    assert list(batches) == []
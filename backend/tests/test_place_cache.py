@@ -0,0 +1,90 @@
+"""PlaceCache 1차/2차 조회, LRU 상한, 만료, 영업시간 재계산"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.database import PlaceCacheEntry
+from services.place_cache import PlaceCache, open_now_from_periods
+
+DETAILS = {'phone': '02-123-4567', 'rating': 4.5}
+
+
+@pytest.fixture
+def place_cache(db_session_factory):
+    return PlaceCache(ttl_seconds=3600, max_entries=2, session_factory=db_session_factory)
+
+
+def test_memory_then_db_tier(place_cache, db_session_factory):
+    assert place_cache.get('p1', 'details') is None
+    place_cache.put('p1', 'details', DETAILS)
+    assert place_cache.get('p1', 'details') == DETAILS
+
+    # 다른 워커/재시작: 1차는 비어 있고 2차 테이블에서 응답
+    other = PlaceCache(ttl_seconds=3600, session_factory=db_session_factory)
+    assert other.get('p1', 'details') == DETAILS
+    assert other.get('p1', 'details') == DETAILS
+
+    assert place_cache.stats() == {'entries': 1, 'memory_hits': 1, 'db_hits': 0, 'misses': 1}
+    assert other.stats() == {'entries': 1, 'memory_hits': 1, 'db_hits': 1, 'misses': 0}
+    # 같은 place_id라도 kind가 다르면 별도 항목
+    assert other.get('p1', 'photo') is None
+
+
+def test_lru_bound_evicts_oldest_from_memory_only(place_cache):
+    for place_id in ('p1', 'p2'):
+        place_cache.put(place_id, 'details', {'id': place_id})
+    place_cache.get('p1', 'details')   # p1을 최근 사용으로
+    place_cache.put('p3', 'details', {'id': 'p3'})
+
+    assert set(place_cache._entries) == {('p1', 'details'), ('p3', 'details')}
+    # 1차에서 밀려난 p2는 2차에서 다시 올라옴
+    assert place_cache.get('p2', 'details') == {'id': 'p2'}
+    assert place_cache.stats()['db_hits'] == 1
+
+
+def test_expired_db_row_is_a_miss(place_cache, db_session_factory):
+    place_cache.put('p1', 'details', DETAILS)
+    place_cache.clear()
+    db = db_session_factory()
+    try:
+        db.query(PlaceCacheEntry).update({'cached_at': datetime.utcnow() - timedelta(seconds=3601)})
+        db.commit()
+    finally:
+        db.close()
+
+    assert place_cache.get('p1', 'details') is None
+
+
+def test_non_persisted_entry_stays_in_process(place_cache, db_session_factory):
+    place_cache.put('p1', 'details', {'error': 'timeout'}, ttl_seconds=60, persist=False)
+
+    assert place_cache.get('p1', 'details') == {'error': 'timeout'}
+    assert PlaceCache(session_factory=db_session_factory).get('p1', 'details') is None
+
+
+def _period(open_day, open_hour, close_day=None, close_hour=None):
+    period = {'open': {'day': open_day, 'hour': open_hour, 'minute': 0}}
+    if close_day is not None:
+        period['close'] = {'day': close_day, 'hour': close_hour, 'minute': 0}
+    return period
+
+
+# 2026-10-19는 월요일 (Places day: 0=일요일, 1=월요일), 시각은 UTC (KST = UTC+9)
+@pytest.mark.parametrize('periods, now, expected', [
+    ([_period(1, 9, 1, 18)], datetime(2026, 10, 19, 1, 0), True),        # 월 10:00 KST
+    ([_period(1, 9, 1, 18)], datetime(2026, 10, 19, 10, 0), False),      # 월 19:00 KST
+    ([_period(6, 22, 0, 2)], datetime(2026, 10, 17, 15, 30), True),      # 주 경계(토 → 일)를 넘는 심야 영업, 일 00:30 KST
+    ([_period(6, 22, 1, 2)], datetime(2026, 10, 18, 15, 30), True),      # 토 22:00~월 02:00, 월 00:30 KST
+    ([_period(0, 0)], datetime(2026, 10, 19, 1, 0), True),               # close 없음 = 24시간
+    ([], datetime(2026, 10, 19, 1, 0), None),
+])
+def test_open_now_from_periods(periods, now, expected):
+    assert open_now_from_periods(periods, now=now) is expected
+
+
+def test_open_now_uses_place_utc_offset():
+    # 월 09:00~18:00, UTC 01:00 → KST 10:00(영업) / UTC+0 01:00(영업 전)
+    periods = [_period(1, 9, 1, 18)]
+    now = datetime(2026, 10, 19, 1, 0)
+    assert open_now_from_periods(periods, utc_offset_minutes=540, now=now) is True
+    assert open_now_from_periods(periods, utc_offset_minutes=0, now=now) is False
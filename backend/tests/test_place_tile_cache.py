@@ -0,0 +1,111 @@
+"""PlaceTileCache / LocationService._search_single_type 타일 캐시 동작"""
+from services import geohash
+from services.place_tile_cache import PlaceTileCache
+
+ANAM = (37.5855, 127.0290)
+
+
+def test_tile_hit_within_same_bucket(make_places):
+    cache = PlaceTileCache(ttl_seconds=60)
+    tile = cache.tile_for(*ANAM, 500)
+    cache.put(tile, ['cafe'], make_places(tile.lat, tile.lng, 5))
+
+    stores = cache.get(ANAM[0] + 0.0002, ANAM[1], 450, ['cafe'])
+    assert stores is not None
+    assert [s['distance'] for s in stores] == sorted(s['distance'] for s in stores)
+    assert cache.stats()['hits'] == 1
+
+
+def test_tile_not_served_to_other_bucket_or_types(make_places):
+    cache = PlaceTileCache(ttl_seconds=60)
+    tile = cache.tile_for(*ANAM, 500)
+    cache.put(tile, ['cafe'], make_places(tile.lat, tile.lng, 5))
+
+    assert cache.get(*ANAM, 200, ['cafe']) is None
+    assert cache.get(*ANAM, 500, ['restaurant']) is None
+
+
+def test_tile_expires(make_places):
+    cache = PlaceTileCache(ttl_seconds=0)
+    tile = cache.tile_for(*ANAM, 500)
+    cache.put(tile, ['cafe'], make_places(tile.lat, tile.lng, 5))
+    assert cache.get(*ANAM, 500, ['cafe']) is None
+
+
+def test_truncated_tile_marked_dense_and_not_served(make_places):
+    cache = PlaceTileCache(ttl_seconds=60)
+    tile = cache.tile_for(*ANAM, 500)
+    cache.put(tile, ['cafe'], make_places(tile.lat, tile.lng, 20), complete=False)
+
+    assert cache.get(*ANAM, 500, ['cafe']) is None
+    assert cache.dense(*ANAM, 500, ['cafe'])
+
+
+def test_direct_entry_served_inside_call_circle_only(make_places):
+    cache = PlaceTileCache(ttl_seconds=60)
+    cache.put_direct(*ANAM, 400, ['cafe'], make_places(*ANAM, 20))
+
+    assert len(cache.get(*ANAM, 400, ['cafe'])) == 20
+    # 같은 반경 구간이라도 호출 원보다 훨씬 큰 검색 원은 덮지 못함
+    assert cache.get(*ANAM, 500, ['cafe']) is None
+
+
+def _count_calls(location_service, make_places, count):
+    calls = []
+
+    def fake_fetch(lat, lng, radius, included_types):
+        calls.append(radius)
+        return make_places(lat, lng, count)
+
+    location_service._fetch_nearby_places = fake_fetch
+    return calls
+
+
+def test_sparse_area_repeat_search_uses_tile(location_service, make_places):
+    calls = _count_calls(location_service, make_places, 5)
+    for _ in range(3):
+        result = location_service._search_single_type(*ANAM, 500, ['cafe'])
+    assert len(result['stores']) == 5
+    assert len(calls) == 1
+
+
+def test_dense_area_repeat_search_calls_upstream_once_more_only(location_service, make_places):
+    calls = _count_calls(location_service, make_places, location_service.NEARBY_MAX_RESULTS)
+
+    counts = []
+    for _ in range(3):
+        result = location_service._search_single_type(*ANAM, 500, ['cafe'])
+        counts.append(len(calls))
+
+    # 첫 요청: 타일 호출(잘림) + 요청 원 호출, 이후 반복은 저장된 요청 원 결과 사용
+    assert counts == [2, 2, 2]
+    assert calls[1] == 500
+    assert len(result['stores']) == location_service.NEARBY_MAX_RESULTS
+
+
+def test_dense_tile_skips_tile_call_for_new_center(location_service, make_places):
+    calls = _count_calls(location_service, make_places, location_service.NEARBY_MAX_RESULTS)
+    location_service._search_single_type(*ANAM, 500, ['cafe'])
+
+    # 같은 타일(정밀도 7) 안에서 첫 요청과 다른 직접 호출 셀(정밀도 8)의 중심
+    tile = location_service._tile_cache.tile_for(*ANAM, 500)
+    first_cell = geohash.encode(*ANAM, 8)
+    other_cell = next(tile.cell + ch for ch in geohash.BASE32 if tile.cell + ch != first_cell)
+    min_lat, min_lng, max_lat, max_lng = geohash.decode_bounds(other_cell)
+    location_service._search_single_type((min_lat + max_lat) / 2, (min_lng + max_lng) / 2, 500, ['cafe'])
+
+    # 밀집 타일이므로 타일 반경 호출 없이 요청 원으로 한 번만 호출
+    assert calls[2:] == [500]
+
+
+def test_internal_fields_not_in_results(location_service, make_places):
+    def fake_fetch(lat, lng, radius, included_types):
+        return [
+            {**place, 'photo_name': 'places/x/photos/y', 'types': ['cafe']}
+            for place in make_places(lat, lng, 3)
+        ]
+
+    location_service._fetch_nearby_places = fake_fetch
+    for _ in range(2):   # 업스트림 결과, 타일 캐시 결과
+        stores = location_service._search_single_type(*ANAM, 500, ['cafe'])['stores']
+        assert stores and all('photo_name' not in s and 'types' not in s for s in stores)
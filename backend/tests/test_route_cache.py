@@ -0,0 +1,103 @@
+"""RouteCacheService 메모리/DB 2단계 조회, 적중 횟수 일괄 반영, 만료 정리"""
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.database import RouteCache
+from services.route_cache import RouteCacheService
+
+ORIGIN = {'latitude': 37.58561, 'longitude': 127.02921}
+DEST = {'latitude': 37.58912, 'longitude': 127.03233}
+
+
+@pytest.fixture
+def route_cache(db_session_factory, monkeypatch):
+    """빈 DB + 빈 메모리 계층 (클래스 상태를 테스트마다 새로 만듦)"""
+    monkeypatch.setattr(RouteCacheService, '_memory', OrderedDict())
+    monkeypatch.setattr(RouteCacheService, '_pending_hits', {})
+    monkeypatch.setattr(RouteCacheService, 'MEMORY_CACHE_TTL', 3600)
+    monkeypatch.setattr(RouteCacheService, 'HIT_FLUSH_INTERVAL', 30.0)
+    for counter in ('_memory_hits', '_db_hits', '_misses'):
+        monkeypatch.setattr(RouteCacheService, counter, 0)
+    return RouteCacheService
+
+
+def _fetcher(result):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return result
+
+    fetch.calls = calls
+    return fetch
+
+
+def _row(session_factory):
+    db = session_factory()
+    try:
+        return db.query(RouteCache).one_or_none()
+    finally:
+        db.close()
+
+
+def test_miss_then_memory_hit(route_cache, db_session_factory):
+    fetch = _fetcher({'distance': 420, 'legs': [1]})
+
+    first = route_cache.get_route(ORIGIN, DEST, 'walking', fetch)
+    first['legs'].append(2)   # 호출부 수정이 캐시에 영향 없어야 함
+    second = route_cache.get_route(ORIGIN, DEST, 'walking', fetch)
+
+    assert len(fetch.calls) == 1
+    assert second == {'distance': 420, 'legs': [1]}
+    assert _row(db_session_factory) is not None
+    assert (route_cache._memory_hits, route_cache._db_hits, route_cache._misses) == (1, 0, 1)
+
+
+def test_db_tier_serves_other_workers_and_fills_memory(route_cache):
+    route_cache.get_route(ORIGIN, DEST, 'walking', _fetcher({'distance': 420}))
+    route_cache._memory.clear()   # 다른 워커/재시작: 메모리 계층 없음
+
+    fetch = _fetcher(None)
+    assert route_cache.get_route(ORIGIN, DEST, 'walking', fetch) == {'distance': 420}
+    assert route_cache.get_route(ORIGIN, DEST, 'walking', fetch) == {'distance': 420}
+
+    assert fetch.calls == []
+    assert (route_cache._memory_hits, route_cache._db_hits) == (1, 1)
+
+
+def test_uncacheable_result_is_not_stored(route_cache, db_session_factory):
+    fetch = _fetcher({'status': 'ZERO_RESULTS'})
+    for _ in range(2):
+        route_cache.get_route(ORIGIN, DEST, 'walking', fetch, cacheable=lambda r: r.get('status') == 'OK')
+
+    assert len(fetch.calls) == 2
+    assert _row(db_session_factory) is None
+
+
+def test_hits_are_flushed_in_one_batch(route_cache, db_session_factory):
+    route_cache.get_route(ORIGIN, DEST, 'walking', _fetcher({'distance': 420}))
+    for _ in range(3):
+        route_cache.get_route(ORIGIN, DEST, 'walking', _fetcher(None))
+    # 조회 경로는 SELECT만 하므로 아직 반영 전
+    assert _row(db_session_factory).hit_count in (0, None)
+
+    assert route_cache.flush_hit_counts() == 1
+    row = _row(db_session_factory)
+    assert row.hit_count == 3 and row.last_hit_at is not None
+    assert route_cache.flush_hit_counts() == 0
+
+
+def test_expired_rows_are_not_served_and_swept(route_cache, db_session_factory):
+    route_cache.save_route_to_cache(ORIGIN, DEST, 'walking', {'distance': 420})
+    db = db_session_factory()
+    try:
+        db.query(RouteCache).update({'created_at': datetime.utcnow() - timedelta(days=route_cache.CACHE_EXPIRY_DAYS + 1)})
+        db.commit()
+    finally:
+        db.close()
+
+    assert route_cache.get_cached_route(ORIGIN, DEST, 'walking') is None
+    assert route_cache.clear_expired_cache(batch_size=1) == 1
+    assert _row(db_session_factory) is None
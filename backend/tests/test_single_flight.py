@@ -0,0 +1,98 @@
+"""SingleFlight 병합, 결과 사본, 예외 전달"""
+import threading
+import time
+
+import pytest
+
+from services.single_flight import SingleFlight, normalize
+
+WAITERS = 4
+
+
+def _run_concurrently(flight, key, fn):
+    """리더가 fn 안에서 대기하는 동안 WAITERS개의 호출을 더 붙인 뒤 모든 결과/예외 반환"""
+    outcomes = []
+    lock = threading.Lock()
+
+    def call():
+        try:
+            value = flight.do(key, fn)
+        except Exception as e:
+            value = e
+        with lock:
+            outcomes.append(value)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    fn.started.wait(5)
+    followers = [threading.Thread(target=call) for _ in range(WAITERS)]
+    for thread in followers:
+        thread.start()
+    # 대기자가 모두 붙을 때까지 기다린 뒤 리더를 풀어 줌
+    deadline = time.monotonic() + 5
+    while flight.stats()['test']['coalesced'] < WAITERS and time.monotonic() < deadline:
+        time.sleep(0.001)
+    fn.release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+    return outcomes
+
+
+def _blocking(result=None, error=None):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        fn.started.set()
+        fn.release.wait(5)
+        if error is not None:
+            raise error
+        return result
+
+    fn.started = threading.Event()
+    fn.release = threading.Event()
+    fn.calls = calls
+    return fn
+
+
+def test_concurrent_calls_execute_once_and_get_copies():
+    flight = SingleFlight()
+    fn = _blocking(result={'stores': [1, 2]})
+
+    outcomes = _run_concurrently(flight, ('test', 1), fn)
+
+    assert len(fn.calls) == 1
+    assert outcomes == [{'stores': [1, 2]}] * (WAITERS + 1)
+    outcomes[0]['stores'].append(3)
+    assert all(outcome['stores'] == [1, 2] for outcome in outcomes[1:])
+    assert flight.stats()['test'] == {'executed': 1, 'coalesced': WAITERS, 'in_flight': 0}
+
+
+def test_leader_error_propagates_to_waiters_and_releases_key():
+    flight = SingleFlight()
+    error = TimeoutError('upstream timeout')
+    fn = _blocking(error=error)
+
+    outcomes = _run_concurrently(flight, ('test', 1), fn)
+
+    assert len(fn.calls) == 1
+    assert len(outcomes) == WAITERS + 1 and all(outcome is error for outcome in outcomes)
+    # 실패한 호출은 남지 않으므로 다음 호출은 새로 실행
+    assert flight.do(('test', 1), lambda: 'retry') == 'retry'
+    assert flight.stats()['test']['executed'] == 2
+
+
+def test_different_keys_are_not_coalesced():
+    flight = SingleFlight()
+    assert flight.do(('test', 1), lambda: 'a') == 'a'
+    assert flight.do(('test', 2), lambda: 'b') == 'b'
+    assert flight.stats()['test']['coalesced'] == 0
+
+
+@pytest.mark.parametrize('a, b', [
+    (37.58560001, 37.5856),
+    ({'b': [1, 2], 'a': 1.0}, {'a': 1.0, 'b': (1, 2)}),
+    (frozenset({'cafe', 'bakery'}), {'bakery', 'cafe'}),
+])
+def test_normalize_equates_equivalent_arguments(a, b):
+    assert normalize(a) == normalize(b)
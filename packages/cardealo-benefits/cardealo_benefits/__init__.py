@@ -0,0 +1,8 @@
+"""
+두 백엔드(backend, admin-backend)가 함께 쓰는 혜택 규칙 해석 패키지 (표준 라이브러리만 사용)
+
+- benefit_rules: CardBenefit 규칙 파싱 + (카드, 카테고리, 가맹점명) → 적용 규칙 결정 + 기본 할인 계산
+- merchant_matcher: 가맹점명 정규화 + 브랜드 매칭 (Aho-Corasick)
+
+각 백엔드의 requirements.txt가 이 디렉터리를 설치한다 (`-e ../packages/cardealo-benefits`).
+"""
@@ -0,0 +1,274 @@
+"""
+카드 혜택 규칙 공통 모듈 (파싱 + 가맹점 규칙 결정 + 기본 할인 계산)
+
+CardBenefit 행(card_benefits.csv / card_benefit 테이블 / admin card_benefits 테이블)을
+프로세스당 한 번만 파싱해 BenefitRuleSet으로 보관하고,
+(카드, 카테고리, 가맹점명) → 적용 규칙 결정 결과를 LRU로 캐시한다.
+사용자 백엔드의 BenefitEngine과 관리자 백엔드의 QR 결제 할인 계산이 이 모듈 하나를 함께 사용한다.
+"""
+import csv
+import json
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .merchant_matcher import MerchantMatcher, normalize_merchant_name
+
+# (카드, 카테고리, 가맹점명) 결정 결과 캐시 크기
+RESOLVE_CACHE_SIZE = 4096
+
+# limit_config의 monthly_limit 값이 이보다 작으면 '월 N회', 크거나 같으면 '월 N원 한도'로 해석
+# (원본 데이터에서 두 의미가 같은 키로 섞여 있음: {"monthly_limit": 5} vs {"monthly_limit": 10000})
+COUNT_LIMIT_THRESHOLD = 1000
+
+
+def field(row, name: str) -> Any:
+    """dict(CSV 행) / ORM 객체(CardBenefit) 모두에서 필드 읽기"""
+    if isinstance(row, Mapping):
+        return row.get(name)
+    return getattr(row, name, None)
+
+
+def parse_json(value) -> Any:
+    """JSON 컬럼 파싱 ('null', 빈 값, 깨진 JSON은 None)"""
+    if value is None or isinstance(value, (dict, list)):
+        return value
+    if not value or value.lower() == 'null':
+        return None
+    try:
+        return json.loads(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_number(value, default: float) -> float:
+    try:
+        return float(value) if value is not None and value != '' and value != 'null' else default
+    except (TypeError, ValueError):
+        return default
+
+
+class CardUsage(NamedTuple):
+    """카드의 이번 결제 전 사용 현황 (일/월 혜택 횟수, 이번 달 이용금액, 이번 달 받은 할인액)"""
+    daily_count: int = 0
+    monthly_count: int = 0
+    used_amount: int = 0
+    discounted_amount: int = 0
+
+
+class BenefitRule:
+    """CardBenefit 행 1건을 파싱한 불변 규칙"""
+
+    __slots__ = (
+        'card', 'category', 'places', 'brands', 'discount_type', 'discount_value', 'max_discount',
+        'pre_month_config', 'limit_config',
+        'places_display', 'discount_display', 'limit_display', 'max_discount_display',
+    )
+
+    def __init__(self, row):
+        places = parse_json(field(row, 'places')) or []
+        values = {
+            'card': field(row, 'card_name'),
+            'category': field(row, 'category'),
+            'places': tuple(places),
+            'brands': frozenset(normalize_merchant_name(place) for place in places) - {''},
+            'discount_type': field(row, 'discount_type'),
+            'discount_value': to_number(field(row, 'discount_value'), 0),
+            'max_discount': to_number(field(row, 'max_discount'), 0),
+            'pre_month_config': parse_json(field(row, 'pre_month_config')) or {},
+            'limit_config': parse_json(field(row, 'limit_config')) or {},
+            'places_display': field(row, 'places_display'),
+            'discount_display': field(row, 'discount_display'),
+            'limit_display': field(row, 'limit_display'),
+            'max_discount_display': field(row, 'max_discount_display'),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"BenefitRule is immutable (tried to set '{name}')")
+
+    def __repr__(self) -> str:
+        return f"<BenefitRule {self.card} - {self.category} {self.discount_type}>"
+
+    def tier(self, previous_month_performance: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        전월실적으로 충족한 가장 높은 티어 (티어가 없거나 최저 티어도 미달이면 None)
+
+        전월실적을 모르면(None) 최저 티어를 충족한 것으로 본다 (사용자 백엔드 BenefitEngine과 같은 기준)
+        """
+        tiers = sorted(
+            self.pre_month_config.get('tiers') or [],
+            key=lambda t: to_number(t.get('threshold'), 0)
+        )
+        if not tiers:
+            return None
+        if previous_month_performance is None:
+            return tiers[0]
+        met = [t for t in tiers if to_number(t.get('threshold'), 0) <= previous_month_performance]
+        return met[-1] if met else None
+
+    def discount(
+        self,
+        payment_amount: int,
+        usage: Optional[CardUsage] = None,
+        previous_month_performance: Optional[int] = None
+    ) -> int:
+        """
+        전월실적 티어와 한도를 반영한 할인액 (QR 결제 할인 계산용)
+
+        percent: 할인 대상 금액 × 할인율, amount: 정액, point: 적립이므로 0
+        할인 대상 금액은 건당/일/월 이용금액 한도와 최소 결제금액을 반영하고,
+        할인액은 건당 max_discount와 월 할인 한도(티어 max_discount, 월 N원 한도)에서 이번 달 받은 할인액을 뺀 값으로 제한.
+        일/월 횟수 한도를 다 썼거나 필수 전월실적에 미달하면 0
+        """
+        usage = usage or CardUsage()
+        limits = self.limit_config
+        value = self.discount_value
+        monthly_cap = float('inf')
+
+        monthly_limit = to_number(limits.get('monthly_limit'), float('inf'))
+        monthly_count_limit = float('inf')
+        if monthly_limit < COUNT_LIMIT_THRESHOLD:
+            monthly_count_limit = monthly_limit
+        else:
+            monthly_cap = monthly_limit
+        if usage.daily_count >= to_number(limits.get('daily_limit'), float('inf')):
+            return 0
+        if usage.monthly_count >= monthly_count_limit:
+            return 0
+
+        if self.pre_month_config.get('tiers'):
+            tier = self.tier(previous_month_performance)
+            if tier is None:
+                if self.pre_month_config.get('required'):
+                    return 0
+            else:
+                value = to_number(tier.get('discount_value'), value)
+                monthly_cap = min(monthly_cap, to_number(tier.get('max_discount'), float('inf')))
+
+        if payment_amount < to_number(limits.get('min_amount'), 0):
+            return 0
+        base = min(
+            payment_amount,
+            to_number(limits.get('per_transaction_limit'), float('inf')),
+            to_number(limits.get('daily_limit_amount'), float('inf')),
+            max(to_number(limits.get('monthly_transaction_limit'), float('inf')) - usage.used_amount, 0),
+        )
+
+        discount_type = self.discount_type or 'percent'
+        if discount_type == 'percent':
+            discount_amount = base * (value / 100)
+        elif discount_type == 'amount':
+            discount_amount = value if base > 0 else 0
+        else:
+            discount_amount = 0
+
+        if self.max_discount:
+            discount_amount = min(discount_amount, self.max_discount)
+        discount_amount = min(discount_amount, max(monthly_cap - usage.discounted_amount, 0))
+        return int(discount_amount)
+
+    def benefit_text(self) -> str:
+        text = self.discount_display or f"{self.card} 혜택"
+        if self.max_discount_display:
+            text += f" ({self.max_discount_display})"
+        return text
+
+
+class BenefitRuleSet:
+    """
+    파싱된 규칙 전체 + 카테고리별 브랜드 매처 + 규칙 결정 LRU
+
+    사용법:
+        rules = BenefitRuleSet.from_csv(card_benefits_path)
+        rules.calculate('신한카드 Mr.Life', 'convenience', 'GS25 고대점', 8000)
+    """
+
+    def __init__(self, rows: Iterable[Any], cache_size: int = RESOLVE_CACHE_SIZE):
+        self.rules: Tuple[BenefitRule, ...] = tuple(
+            row if isinstance(row, BenefitRule) else BenefitRule(row) for row in rows
+        )
+        grouped: Dict[Tuple[str, str], List[BenefitRule]] = {}
+        self.matchers: Dict[str, MerchantMatcher] = {}
+        for rule in self.rules:
+            grouped.setdefault((rule.card, rule.category), []).append(rule)
+            matcher = self.matchers.setdefault(rule.category, MerchantMatcher())
+            for place in rule.places:
+                matcher.add(place, normalize_merchant_name(place))
+        for matcher in self.matchers.values():
+            matcher.build()
+        self.by_card_category: Dict[Tuple[str, str], Tuple[BenefitRule, ...]] = {
+            key: tuple(rules) for key, rules in grouped.items()
+        }
+
+        # 인스턴스별 LRU (규칙 세트가 교체되면 캐시도 함께 버려짐)
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    @classmethod
+    def from_csv(cls, path: str) -> 'BenefitRuleSet':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(csv.DictReader(f))
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def merchant_brands(self, merchant_name: Optional[str], category: str) -> frozenset:
+        """가맹점명에 포함된 정규화 브랜드 ("GS25 고대점" → {"gs25"})"""
+        matcher = self.matchers.get(category)
+        if not merchant_name or matcher is None:
+            return frozenset()
+        return frozenset(matcher.find_all(merchant_name))
+
+    def _resolve(self, card_name: str, category: str, merchant_name: Optional[str]) -> Optional[BenefitRule]:
+        """
+        카드 + 카테고리 + 가맹점명 → 적용할 규칙 1건
+
+        1. places 브랜드가 가맹점명에 포함된 규칙
+        2. 가맹점 제한 없는 규칙
+        3. 카테고리의 첫 번째 규칙
+        """
+        rules = self.by_card_category.get((card_name, category))
+        if not rules:
+            return None
+
+        brands = self.merchant_brands(merchant_name, category)
+        if brands:
+            for rule in rules:
+                if rule.brands & brands:
+                    return rule
+
+        return next((rule for rule in rules if not rule.places), rules[0])
+
+    def calculate(
+        self,
+        card_name: str,
+        category: str,
+        merchant_name: Optional[str],
+        payment_amount: int,
+        usage: Optional[CardUsage] = None,
+        previous_month_performance: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        결제 할인 계산 (DB 조회 없음)
+
+        Args:
+            usage: 카드의 이번 결제 전 사용 현황 (없으면 사용 이력 없음으로 계산)
+            previous_month_performance: 전월실적 (모르면 None → 최저 티어)
+
+        Returns:
+            {"discount_amount", "discount_type", "benefit_text"}
+        """
+        rule = self.resolve(card_name, category, merchant_name)
+        if rule is None:
+            return {
+                "discount_amount": 0,
+                "discount_type": "none",
+                "benefit_text": "적용 가능한 혜택이 없습니다"
+            }
+
+        return {
+            "discount_amount": rule.discount(payment_amount, usage, previous_month_performance),
+            "discount_type": rule.discount_type or "percent",
+            "benefit_text": rule.benefit_text()
+        }
@@ -0,0 +1,164 @@
+"""
+가맹점명 정규화 + 브랜드 매칭 (Aho-Corasick)
+
+Google displayName("홈플러스 안암점", "GS25 고대점")이나 관리자 가맹점명을
+혜택 DB의 브랜드 키("홈플러스", "GS25")로 변환한다.
+모든 브랜드를 하나의 오토마톤으로 컴파일하므로 매칭 비용은 브랜드 수와 무관하게
+가맹점명 길이에만 비례한다.
+
+정규화는 공백을 지우므로 원래 토큰 경계를 따로 기록해 둔다. 영문/숫자로 시작(끝)하는 브랜드는
+토큰 경계나 영문↔한글 경계에서 시작(끝)해야 매칭된다 ("Circus", "CUBE 카페" ≠ "CU", "CU 안암점" = "CU").
+한글 브랜드는 붙여 쓴 이름("홈플러스안암점")도 흔하므로 경계를 보지 않는다.
+"""
+import unicodedata
+from collections import deque
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# 이보다 짧은 브랜드는 오탐이 많아 매칭에서 제외 (예: "S", "K")
+MIN_PATTERN_LENGTH = 2
+
+
+def _is_latin(ch: str) -> bool:
+    """영문/숫자 (경계 판정용)"""
+    return ch.isascii()
+
+
+def normalize_merchant_name(name: Optional[str]) -> str:
+    """
+    가맹점명 정규화
+
+    - 전각/반각 통일 (NFKC), 영문 소문자화
+    - 공백, 괄호, 구두점 제거 (한글/영문/숫자만 유지)
+
+    예: "GS25 고대점" → "gs25고대점", "(주)이마트" → "주이마트"
+    """
+    if not name:
+        return ''
+    normalized = unicodedata.normalize('NFKC', name).lower()
+    return ''.join(ch for ch in normalized if ch.isalnum())
+
+
+def _tokenize(name: Optional[str]) -> Tuple[str, FrozenSet[int]]:
+    """normalize_merchant_name 결과 + 원래 공백/구두점 뒤에서 시작하는 위치 집합"""
+    if not name:
+        return '', frozenset()
+    chars = []
+    starts = set()
+    separated = False
+    for ch in unicodedata.normalize('NFKC', name).lower():
+        if ch.isalnum():
+            if separated and chars:
+                starts.add(len(chars))
+            chars.append(ch)
+            separated = False
+        else:
+            separated = True
+    return ''.join(chars), frozenset(starts)
+
+
+class MerchantMatcher:
+    """
+    브랜드명 Aho-Corasick 오토마톤
+
+    사용법:
+        matcher = MerchantMatcher(['홈플러스', 'GS25', '이마트24'])
+        matcher.match('GS25 고대점')  # → 'GS25'
+    """
+
+    __slots__ = ('_goto', '_fail', '_own', '_out', '_built')
+
+    def __init__(self, brands: Iterable[Any] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 노드에서 끝나는 패턴: (정규화된 패턴 길이, 값, 시작 경계 필요, 끝 경계 필요)
+        self._own: List[List[Tuple[int, Any, bool, bool]]] = [[]]
+        # 실패 링크를 따라 모은 전체 출력 (build 시 계산)
+        self._out: List[List[Tuple[int, Any, bool, bool]]] = [[]]
+        self._built = False
+
+        for brand in brands:
+            self.add(brand)
+        self.build()
+
+    def add(self, pattern: str, value: Any = None) -> None:
+        """브랜드 패턴 추가 (value 생략 시 원본 패턴 반환)"""
+        key = normalize_merchant_name(pattern)
+        if len(key) < MIN_PATTERN_LENGTH:
+            return
+
+        node = 0
+        for ch in key:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append([])
+            node = nxt
+
+        value = pattern if value is None else value
+        if all(existing != value for _, existing, _, _ in self._own[node]):
+            self._own[node].append((len(key), value, _is_latin(key[0]), _is_latin(key[-1])))
+        self._built = False
+
+    def build(self) -> None:
+        """실패 링크 계산 (BFS)"""
+        self._out = [list(own) for own in self._own]
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+        self._built = True
+
+    def _scan(self, name: str):
+        """(끝 위치, 패턴 길이, 값) 생성 - 정규화된 이름을 한 번만 순회"""
+        if not self._built:
+            self.build()
+
+        text, starts = _tokenize(name)
+
+        def boundary(i: int) -> bool:
+            return i == 0 or i == len(text) or i in starts or _is_latin(text[i - 1]) != _is_latin(text[i])
+
+        node = 0
+        for pos, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, value, check_start, check_end in self._out[node]:
+                if check_start and not boundary(pos + 1 - length):
+                    continue
+                if check_end and not boundary(pos + 1):
+                    continue
+                yield pos, length, value
+
+    def find_all(self, name: str) -> List[Any]:
+        """이름에 포함된 모든 브랜드 (긴 패턴 우선, 중복 제거)"""
+        hits = sorted(self._scan(name), key=lambda hit: (-hit[1], hit[0] - hit[1]))
+        seen = []
+        for _, _, value in hits:
+            if value not in seen:
+                seen.append(value)
+        return seen
+
+    def match(self, name: str) -> Optional[Any]:
+        """가장 긴 브랜드 1개 (길이가 같으면 앞쪽에 나온 브랜드)"""
+        best = None
+        best_key = None
+        for pos, length, value in self._scan(name):
+            key = (length, -(pos - length))
+            if best_key is None or key > best_key:
+                best, best_key = value, key
+        return best